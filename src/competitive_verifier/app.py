@@ -1,17 +1,19 @@
+import importlib
 import importlib.metadata
+import sys
 from argparse import ArgumentParser as BaseParser
 from logging import getLogger
-from typing import Annotated, Any, Literal, get_args
-
-from pydantic import Field, TypeAdapter
+from typing import TYPE_CHECKING, Any, Literal, NamedTuple, TypeAlias, cast
 
 from competitive_verifier.arg import BaseArguments
-from competitive_verifier.documents import Docs
-from competitive_verifier.download import Download
-from competitive_verifier.inout import Check, MergeInput, MergeResult
-from competitive_verifier.migrate import Migration
-from competitive_verifier.oj import OjResolve
-from competitive_verifier.verify import Verify
+
+if TYPE_CHECKING:
+    from competitive_verifier.documents import Docs
+    from competitive_verifier.download import Download
+    from competitive_verifier.inout import Check, MergeInput, MergeResult
+    from competitive_verifier.migrate import Migration
+    from competitive_verifier.oj import OjResolve
+    from competitive_verifier.verify import Verify
 
 logger = getLogger(__name__)
 
@@ -37,36 +39,92 @@ class NoSubcommand(BaseArguments):
         )
 
 
-Arguments = Annotated[
-    NoSubcommand
-    | Verify
-    | Docs
-    | Download
-    | MergeInput
-    | MergeResult
-    | Check
-    | OjResolve
-    | Migration,
-    Field(discriminator="subcommand"),
-]
-ARG_TYPES: tuple[type[BaseArguments], ...] = get_args(Arguments.__origin__)  # pyright: ignore[reportUnknownMemberType, reportAttributeAccessIssue]
+class _Subcommand(NamedTuple):
+    module: str
+    class_name: str
+    help: str
+
+    def load(self) -> type[BaseArguments]:
+        return getattr(importlib.import_module(self.module), self.class_name)
+
+
+# Subcommand modules are imported only when the subcommand is chosen,
+# so that e.g. `check` doesn't import the dependencies of `verify`.
+# `help` must be same to the description of the `subcommand` field.
+_SUBCOMMANDS: dict[str, _Subcommand] = {
+    "verify": _Subcommand("competitive_verifier.verify", "Verify", "Verify library"),
+    "docs": _Subcommand("competitive_verifier.documents", "Docs", "Create documents"),
+    "download": _Subcommand(
+        "competitive_verifier.download", "Download", "Download problems"
+    ),
+    "merge-input": _Subcommand(
+        "competitive_verifier.inout", "MergeInput", "Merge verify_files.json`"
+    ),
+    "merge-result": _Subcommand(
+        "competitive_verifier.inout", "MergeResult", "Merge result of `verify`"
+    ),
+    "check": _Subcommand(
+        "competitive_verifier.inout", "Check", "Check result of `verify`"
+    ),
+    "oj-resolve": _Subcommand(
+        "competitive_verifier.oj",
+        "OjResolve",
+        "Create verify_files json using `oj-verify`",
+    ),
+    "migrate": _Subcommand(
+        "competitive_verifier.migrate",
+        "Migration",
+        "Migrate from verification-helper(`oj-verify`) project",
+    ),
+}
+
+Arguments: TypeAlias = "NoSubcommand | Verify | Docs | Download | MergeInput | MergeResult | Check | OjResolve | Migration"
+
+
+def __getattr__(name: str) -> Any:  # noqa: ANN401
+    for s in _SUBCOMMANDS.values():
+        if s.class_name == name:
+            return s.load()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _find_subcommand(args: list[str]) -> str | None:
+    # The main parser has only flags, so the first positional is the subcommand.
+    return next((a for a in args if not a.startswith("-")), None)
 
 
 class ArgumentParser(BaseParser):
+    _subcommand_parsers: dict[str, BaseParser]
+    _loaded: dict[str, type[BaseArguments]]
+
     def __init__(self, **kwargs: dict[str, Any]) -> None:
         super().__init__(**kwargs)  # pyright: ignore[reportArgumentType]
+        NoSubcommand.add_parser(self)
         subparsers = self.add_subparsers(dest="subcommand", parser_class=BaseParser)
 
-        for s in ARG_TYPES:
-            s.add_parser(
-                self
-                if (sub := s.get_subcommand_info()) is None
-                else subparsers.add_parser(**sub)
-            )
+        self._subcommand_parsers = {
+            name: subparsers.add_parser(name=name, help=s.help)
+            for name, s in _SUBCOMMANDS.items()
+        }
+        self._loaded = {}
+
+    def _load_subcommand(self, name: str) -> type[BaseArguments]:
+        if (cls := self._loaded.get(name)) is None:
+            cls = self._loaded[name] = _SUBCOMMANDS[name].load()
+            cls.add_parser(self._subcommand_parsers[name])
+        return cls
 
     def parse(self, args: list[str] | None = None) -> Arguments:
-        type_adapter = TypeAdapter[Arguments](Arguments)
-        return type_adapter.validate_python(self.parse_args(args).__dict__)
+        if args is None:
+            args = sys.argv[1:]
+
+        subcommand = _find_subcommand(args)
+        cls = (
+            self._load_subcommand(subcommand)
+            if subcommand in _SUBCOMMANDS
+            else NoSubcommand
+        )
+        return cast("Arguments", cls.model_validate(self.parse_args(args).__dict__))
 
 
 def main(args: list[str] | None = None) -> int | None:
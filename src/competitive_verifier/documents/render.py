@@ -243,6 +243,8 @@ class SourceCodeStat(BaseModel):
             verifications.files.keys(), _VerificationStatusFlag.NOTHING
         )
         verification_results_dict: dict[pathlib.Path, list[VerificationResult]] = {}
+        # The files in a cycle share the dependencies.
+        commit_times: dict[int, datetime.datetime] = {}
 
         for p, r in result.files.items():
             if p not in included_files:
@@ -276,9 +278,12 @@ class SourceCodeStat(BaseModel):
                 for dep in depends_on:
                     statuses[dep] |= group_status
 
-                timestamp = git.get_commit_time(
-                    verifications.transitive_depends_on[path]
-                )
+                bits = verifications.transitive_depends_on_bits(path)
+                timestamp = commit_times.get(bits)
+                if timestamp is None:
+                    timestamp = commit_times[bits] = git.get_commit_time(
+                        verifications.paths_of_bits(bits)
+                    )
                 file_input = verifications.files[path]
                 is_verification = file_input.is_verification()
 
@@ -1,7 +1,9 @@
 from argparse import ArgumentParser
 from collections.abc import Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
 from itertools import chain
 from logging import getLogger
+from types import TracebackType
 from typing import Literal
 
 from pydantic import Field
@@ -59,6 +61,64 @@ def download_files(
     return result
 
 
+class DownloadPrefetcher:
+    """Download problems in background threads before they are required.
+
+    Each problem is downloaded at most once.
+    A failure is reported by ``download`` of the file which requires the problem.
+    """
+
+    _executor: ThreadPoolExecutor
+    _futures: dict[str, Future[bool]]
+
+    def __init__(self, *, max_workers: int) -> None:
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="download",
+        )
+        self._futures = {}
+
+    def __enter__(self) -> "DownloadPrefetcher":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def prefetch(
+        self,
+        url_or_file: UrlOrVerificationFile | Iterable[UrlOrVerificationFile],
+    ) -> None:
+        """Start downloading problems in background."""
+        for url in sorted(parse_urls(url_or_file)):
+            if url not in self._futures:
+                self._futures[url] = self._executor.submit(
+                    oj.download, url, group_log=False
+                )
+
+    def download(
+        self,
+        url_or_file: UrlOrVerificationFile | Iterable[UrlOrVerificationFile],
+        *,
+        check: bool = False,
+    ) -> bool:
+        """Wait for problems to be downloaded. Same as ``download_files``."""
+        self.prefetch(url_or_file)
+        failed = [
+            url
+            for url in sorted(parse_urls(url_or_file))
+            if not self._futures[url].result()
+        ]
+
+        if check and failed:
+            raise RuntimeError(f"Failed to download: {' '.join(failed)}")
+        return not failed
+
+
 class Download(OptionalVerifyFilesJsonArguments, VerboseArguments):
     subcommand: Literal["download"] = Field(
         default="download",
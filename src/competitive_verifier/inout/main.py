@@ -2,7 +2,6 @@ import pathlib
 from argparse import ArgumentParser
 from collections import Counter
 from collections.abc import Iterable
-from functools import reduce
 from logging import getLogger
 from typing import Literal, TypeVar
 
@@ -25,7 +24,16 @@ T = TypeVar("T", VerificationInput, VerifyCommandResult)
 
 
 def merge(results: Iterable[T]) -> T:
-    return reduce(lambda a, b: a.merge(b), results)
+    """Merge the results in order.
+
+    ``results`` is consumed one by one, so a lazy iterable keeps only one of them loaded
+    besides the merged files.
+    """
+    it = iter(results)
+    first = next(it, None)
+    if first is None:
+        raise TypeError("merge() of empty iterable")
+    return first.merge_all(it)
 
 
 class MergeInput(VerboseArguments):
@@ -6,7 +6,13 @@ from .file import (
 )
 from .path import ForcePosixPath, RelativeDirectoryPath, SortedPathList, SortedPathSet
 from .problem import Problem, TestCaseData, TestCaseFile, TestCaseProvider
-from .result import FileResult, TestcaseResult, VerificationResult, VerifyCommandResult
+from .result import (
+    FileResult,
+    TestcaseResult,
+    TestcaseResults,
+    VerificationResult,
+    VerifyCommandResult,
+)
 from .result_status import JudgeStatus, ResultStatus
 from .shell import ShellCommand, ShellCommandLike
 from .verification import (
@@ -42,6 +48,7 @@ __all__ = [
     "TestCaseFile",
     "TestCaseProvider",
     "TestcaseResult",
+    "TestcaseResults",
     "VerifcationTimeoutError",
     "Verification",
     "VerificationFile",
@@ -2,26 +2,38 @@
 
 Copy from ac-library-python
 https://github.com/not522/ac-library-python/blob/58f324ec020d57191e7b9e4957b0c5feb5ed3aff/atcoder/_scc.py
+
+The depth-first search is rewritten without recursion
+and the graph is stored in integer arrays so that large graphs fit in memory.
 """
 
-import sys
+from array import array
+
+
+def _zeros(n: int, value: int = 0) -> "array[int]":
+    return array("i", [value]) * n
 
 
 class CSR:
-    def __init__(self, n: int, edges: list[tuple[int, int]]) -> None:
-        self.start = [0] * (n + 1)
-        self.elist = [0] * len(edges)
+    """Compressed Sparse Row representation of a directed graph.
+
+    The targets of the edges from ``v`` are ``elist[start[v]:start[v + 1]]``.
+    """
+
+    def __init__(self, n: int, sources: "array[int]", targets: "array[int]") -> None:
+        self.start = _zeros(n + 1)
+        self.elist = _zeros(len(targets))
 
-        for e in edges:
-            self.start[e[0] + 1] += 1
+        for s in sources:
+            self.start[s + 1] += 1
 
         for i in range(1, n + 1):
             self.start[i] += self.start[i - 1]
 
-        counter = self.start.copy()
-        for e in edges:
-            self.elist[counter[e[0]]] = e[1]
-            counter[e[0]] += 1
+        counter = self.start[:n]
+        for s, t in zip(sources, targets, strict=True):
+            self.elist[counter[s]] = t
+            counter[s] += 1
 
 
 class SccGraph:
@@ -34,69 +46,74 @@ class SccGraph:
 
     def __init__(self, n: int) -> None:
         self._n = n
-        self._edges: list[tuple[int, int]] = []
+        self._sources = array("i")
+        self._targets = array("i")
 
     def add_edge(self, from_vertex: int, to_vertex: int) -> None:
-        self._edges.append((from_vertex, to_vertex))
-
-    def scc_ids(self) -> tuple[int, list[int]]:
-        g = CSR(self._n, self._edges)
+        self._sources.append(from_vertex)
+        self._targets.append(to_vertex)
+
+    def scc_ids(self) -> tuple[int, "array[int]"]:
+        n = self._n
+        g = CSR(n, self._sources, self._targets)
+        start = g.start
+        elist = g.elist
         now_ord = 0
         group_num = 0
-        visited: list[int] = []
-        low = [0] * self._n
-        order = [-1] * self._n
-        ids = [0] * self._n
-
-        sys.setrecursionlimit(max(self._n + 1000, sys.getrecursionlimit()))
-
-        def dfs(v: int) -> None:
-            nonlocal now_ord
-            nonlocal group_num
-            nonlocal visited
-            nonlocal low
-            nonlocal order
-            nonlocal ids
-
-            low[v] = now_ord
-            order[v] = now_ord
-            now_ord += 1
-            visited.append(v)
-            for i in range(g.start[v], g.start[v + 1]):
-                to = g.elist[i]
-                if order[to] == -1:
-                    dfs(to)
-                    low[v] = min(low[v], low[to])
-                else:
-                    low[v] = min(low[v], order[to])
-
-            if low[v] == order[v]:
-                while True:
-                    u = visited[-1]
-                    visited.pop()
-                    order[u] = self._n
-                    ids[u] = group_num
-                    if u == v:
-                        break
-                group_num += 1
+        visited = array("i")
+        low = _zeros(n)
+        order = _zeros(n, -1)
+        ids = _zeros(n)
 
-        for i in range(self._n):
-            if order[i] == -1:
-                dfs(i)
+        # The position of the next edge to visit for each vertex
+        next_edge = start[:n]
+        call_stack = array("i")
 
-        for i in range(self._n):
+        for root in range(n):
+            if order[root] != -1:
+                continue
+
+            low[root] = order[root] = now_ord
+            now_ord += 1
+            visited.append(root)
+            call_stack.append(root)
+            while call_stack:
+                v = call_stack[-1]
+                i = next_edge[v]
+                if i < start[v + 1]:
+                    next_edge[v] = i + 1
+                    to = elist[i]
+                    if order[to] == -1:
+                        low[to] = order[to] = now_ord
+                        now_ord += 1
+                        visited.append(to)
+                        call_stack.append(to)
+                    else:
+                        low[v] = min(low[v], order[to])
+                    continue
+
+                call_stack.pop()
+                if low[v] == order[v]:
+                    while True:
+                        u = visited.pop()
+                        order[u] = n
+                        ids[u] = group_num
+                        if u == v:
+                            break
+                    group_num += 1
+                if call_stack:
+                    parent = call_stack[-1]
+                    low[parent] = min(low[parent], low[v])
+
+        for i in range(n):
             ids[i] = group_num - 1 - ids[i]
 
         return group_num, ids
 
     def scc(self) -> list[list[int]]:
-        ids = self.scc_ids()
-        group_num = ids[0]
-        counts = [0] * group_num
-        for x in ids[1]:
-            counts[x] += 1
+        group_num, ids = self.scc_ids()
         groups: list[list[int]] = [[] for _ in range(group_num)]
         for i in range(self._n):
-            groups[ids[1][i]].append(i)
+            groups[ids[i]].append(i)
 
         return groups
@@ -1,5 +1,8 @@
 import enum
+import itertools
 import pathlib
+import warnings
+from collections.abc import Iterable, Iterator
 from functools import cached_property
 from logging import getLogger
 from typing import TYPE_CHECKING, Any, NamedTuple
@@ -7,7 +10,7 @@ from typing import TYPE_CHECKING, Any, NamedTuple
 from pydantic import BaseModel, Field
 
 from competitive_verifier.log import GitHubMessageParams
-from competitive_verifier.util import to_relative
+from competitive_verifier.util import gc_paused, to_relative_all
 
 from ._scc import SccGraph
 from .path import ForcePosixPath, SortedPathSet
@@ -28,6 +31,21 @@ class _DependencyGraph(NamedTuple):
     verified_with: _DependencyEdges
 
 
+class _PathIndex(NamedTuple):
+    paths: list[pathlib.Path]
+    indexes: dict[pathlib.Path, int]
+
+
+def _iter_bits(bits: int) -> Iterator[int]:
+    # Scanning the binary string is linear, while clearing the lowest bit one by one
+    # costs the size of the integer for each bit.
+    digits = format(bits, "b")[::-1]
+    i = digits.find("1")
+    while i >= 0:
+        yield i
+        i = digits.find("1", i + 1)
+
+
 class DocumentOutputMode(str, enum.Enum):
     visible = "visible"
     """The document will be output. (default)
@@ -134,14 +152,32 @@ class VerificationInput(BaseModel):
     )
 
     def merge(self, other: "VerificationInput") -> "VerificationInput":
-        return VerificationInput(files=self.files | other.files)
+        return self.merge_all([other])
+
+    def merge_all(self, others: Iterable["VerificationInput"]) -> "VerificationInput":
+        """Merge ``others`` in order into a new ``VerificationInput``.
+
+        The files are accumulated into one dict,
+        so each of ``others`` can be released after it is merged.
+        """
+        files = self.files.copy()
+        for other in others:
+            files.update(other.files)
+        return VerificationInput(files=files)
 
     @classmethod
     def parse_file_relative(cls, path: "StrPath") -> "VerificationInput":
-        impl = cls.model_validate_json(pathlib.Path(path).read_bytes())
+        with gc_paused():
+            impl = cls.model_validate_json(pathlib.Path(path).read_bytes())
+        relatives = to_relative_all(
+            itertools.chain(
+                impl.files.keys(),
+                *(f.dependencies for f in impl.files.values()),
+            )
+        )
         new_files: dict[pathlib.Path, VerificationFile] = {}
         for p, f in impl.files.items():
-            rp = to_relative(p)
+            rp = relatives[p]
             if not rp:
                 logger.warning(
                     "Files in other directories are not subject to verification: %s",
@@ -149,12 +185,31 @@ class VerificationInput(BaseModel):
                     extra={"github": GitHubMessageParams()},
                 )
                 continue
-            f.dependencies = {d for d in map(to_relative, f.dependencies) if d}
+            f.dependencies = {
+                d for d in map(relatives.__getitem__, f.dependencies) if d
+            }
             new_files[rp] = f
 
         impl.files = new_files
         return impl
 
+    @cached_property
+    def _path_index(self) -> _PathIndex:
+        paths = list(self.files.keys())
+        return _PathIndex(paths=paths, indexes={p: i for i, p in enumerate(paths)})
+
+    @cached_property
+    def _scc_groups(self) -> list[list[int]]:
+        """Strongly Connected Component as indexes. Tests are ahead."""
+        indexes = self._path_index.indexes
+        g = SccGraph(len(indexes))
+        for i, file in enumerate(self.files.values()):
+            for e in file.dependencies:
+                t = indexes.get(e)
+                if t is not None:
+                    g.add_edge(i, t)
+        return g.scc()
+
     def scc(self, *, reverse: bool = False) -> list[set[pathlib.Path]]:
         """Strongly Connected Component.
 
@@ -163,35 +218,77 @@ class VerificationInput(BaseModel):
         Returns:
             list[set[pathlib.Path]]: Strongly Connected Component result
         """
-        paths = list(self.files.keys())
-        vers_rev = {v: i for i, v in enumerate(paths)}
-        g = SccGraph(len(paths))
-        for p, file in self.files.items():
-            for e in file.dependencies:
-                t = vers_rev.get(e, -1)
-                if t >= 0:
-                    if reverse:
-                        g.add_edge(t, vers_rev[p])
-                    else:
-                        g.add_edge(vers_rev[p], t)
-        return [{paths[ix] for ix in ls} for ls in g.scc()]
+        paths = self._path_index.paths
+        groups = self._scc_groups
+        if reverse:
+            groups = groups[::-1]
+        return [{paths[ix] for ix in ls} for ls in groups]
+
+    @cached_property
+    def _transitive_closure(self) -> list[int]:
+        """Transitive closure of the dependencies as bitsets over ``_path_index``."""
+        paths, indexes = self._path_index
+        closure = [0] * len(paths)
+        # Libraries are ahead, so the dependencies of the group are already resolved.
+        for group in reversed(self._scc_groups):
+            bits = 0
+            for i in group:
+                bits |= 1 << i
+            for i in group:
+                for dep in self.files[paths[i]].dependencies:
+                    t = indexes.get(dep)
+                    if t is not None and not (bits >> t) & 1:
+                        bits |= closure[t]
+            for i in group:
+                closure[i] = bits
+        return closure
+
+    def transitive_depends_on_bits(self, path: pathlib.Path) -> int:
+        """The files on which ``path`` depends transitively as a bitset.
+
+        Use ``paths_of_bits`` to convert it to the paths.
+        """
+        return self._transitive_closure[self._path_index.indexes[path]]
+
+    def transitive_depends_on_indexes(self, path: pathlib.Path) -> Iterator[int]:
+        """The indexes of the files on which ``path`` depends transitively.
+
+        The indexes follow the order of ``files``.
+        Use ``path_of_index`` to convert them to the paths.
+        """
+        return _iter_bits(self.transitive_depends_on_bits(path))
+
+    def path_of_index(self, index: int) -> pathlib.Path:
+        """Convert an index of ``files`` to the path."""
+        return self._path_index.paths[index]
+
+    def paths_of_bits(self, bits: int) -> list[pathlib.Path]:
+        """Convert a bitset over the files to the paths."""
+        paths = self._path_index.paths
+        return [paths[i] for i in _iter_bits(bits)]
+
+    def get_transitive_depends_on(self, path: pathlib.Path) -> list[pathlib.Path]:
+        """The files on which ``path`` depends transitively, including ``path``."""
+        return self.paths_of_bits(self.transitive_depends_on_bits(path))
 
     @cached_property
     def transitive_depends_on(self) -> _DependencyEdges:
-        d: _DependencyEdges = {}
-        g = self.scc(reverse=True)
-        for group in g:
-            result = group.copy()
-            for p in group:
-                for dep in self.files[p].dependencies:
-                    if dep not in result:
-                        resolved = d.get(dep)
-                        if resolved is not None:
-                            result.update(resolved)
-            for p in group:
-                d[p] = result
-
-        return d
+        """The files on which each file depends transitively.
+
+        Deprecated: this materializes a set for each file.
+        Use ``transitive_depends_on_bits`` or ``get_transitive_depends_on`` instead.
+        """
+        warnings.warn(
+            "VerificationInput.transitive_depends_on is deprecated. "
+            "Use transitive_depends_on_bits or get_transitive_depends_on instead.",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        closure = self._transitive_closure
+        return {
+            p: set(self.paths_of_bits(closure[i]))
+            for i, p in enumerate(self._path_index.paths)
+        }
 
     @cached_property
     def _dependency_graph(
@@ -1,12 +1,20 @@
 import datetime
 import pathlib
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
 from logging import getLogger
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, ClassVar, Protocol, overload
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import (
+    BaseModel,
+    Field,
+    ValidatorFunctionWrapHandler,
+    field_serializer,
+    field_validator,
+)
 
 from competitive_verifier.log import GitHubMessageParams
-from competitive_verifier.util import to_relative
+from competitive_verifier.util import gc_paused, to_relative_all
 
 from .path import ForcePosixPath
 from .result_status import JudgeStatus, ResultStatus
@@ -44,6 +52,104 @@ class TestcaseResult(BaseModel):
     """
 
 
+class _TestcaseResultLike(Protocol):
+    @property
+    def name(self) -> str: ...
+    @property
+    def status(self) -> JudgeStatus: ...
+    @property
+    def elapsed(self) -> float: ...
+    @property
+    def memory(self) -> float | None: ...
+
+
+class TestcaseResults(Sequence[TestcaseResult]):
+    """Compact results of test cases.
+
+    Keep the fields in arrays instead of a model per test case.
+    ``TestcaseResult`` models are created only when they are read or serialized.
+    """
+
+    __slots__ = ("_elapsed", "_memory", "_names", "_statuses")
+
+    _STATUSES = tuple(JudgeStatus)
+    _STATUS_CODES: ClassVar[dict[JudgeStatus, int]] = {
+        st: i for i, st in enumerate(_STATUSES)
+    }
+
+    _names: list[str]
+    _statuses: bytearray
+    _elapsed: "array[float]"
+    _memory: "array[float]"
+    """The memory usages in megabytes. Negative if unknown."""
+
+    def __init__(self, results: Iterable[_TestcaseResultLike] = ()) -> None:
+        self._names = []
+        self._statuses = bytearray()
+        self._elapsed = array("d")
+        self._memory = array("d")
+        for result in results:
+            self.append(result)
+
+    def append(self, result: _TestcaseResultLike) -> None:
+        self._names.append(result.name)
+        self._statuses.append(self._STATUS_CODES[result.status])
+        self._elapsed.append(result.elapsed)
+        self._memory.append(-1.0 if result.memory is None else result.memory)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    @overload
+    def __getitem__(self, index: int) -> TestcaseResult: ...
+    @overload
+    def __getitem__(self, index: slice) -> list[TestcaseResult]: ...
+    def __getitem__(self, index: int | slice) -> TestcaseResult | list[TestcaseResult]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        memory = self._memory[index]
+        return TestcaseResult(
+            name=self._names[index],
+            status=self._STATUSES[self._statuses[index]],
+            elapsed=self._elapsed[index],
+            memory=None if memory < 0 else memory,
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, TestcaseResults):
+            return (
+                self._names == other._names
+                and self._statuses == other._statuses
+                and self._elapsed == other._elapsed
+                and self._memory == other._memory
+            )
+        if isinstance(other, Sequence):
+            return self.to_models() == list(other)  # pyright: ignore[reportUnknownArgumentType]
+        return NotImplemented
+
+    __hash__ = None  # pyright: ignore[reportAssignmentType]
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({len(self)} cases)"
+
+    @property
+    def names(self) -> Sequence[str]:
+        return self._names
+
+    @property
+    def elapsed(self) -> Sequence[float]:
+        return self._elapsed
+
+    def statuses(self) -> Iterator[JudgeStatus]:
+        return map(self._STATUSES.__getitem__, self._statuses)
+
+    def memories(self) -> Iterator[float | None]:
+        return (None if m < 0 else m for m in self._memory)
+
+    def to_models(self) -> list[TestcaseResult]:
+        return list(self)
+
+
 class VerificationResult(BaseModel):
     verification_name: str | None = Field(
         default=None,
@@ -77,11 +183,13 @@ class VerificationResult(BaseModel):
     """Maximum size of memory used in megabytes.
     """
 
-    testcases: list[TestcaseResult] | None = Field(
+    testcases: Sequence[TestcaseResult] | None = Field(
         default=None,
         description="The results of each test case.",
     )
     """The results of each test case.
+
+    It is kept as ``TestcaseResults`` and converted to the models when serialized.
     """
 
     last_execution_time: datetime.datetime = Field(
@@ -96,6 +204,24 @@ class VerificationResult(BaseModel):
     def verification_list(cls, v: Any) -> Any:  # noqa: ANN401
         return v.lower() if isinstance(v, str) else v
 
+    @field_validator("testcases", mode="wrap")
+    @classmethod
+    def compact_testcases(
+        cls,
+        v: Any,  # noqa: ANN401
+        handler: ValidatorFunctionWrapHandler,
+    ) -> TestcaseResults | None:
+        if isinstance(v, TestcaseResults):
+            return v
+        testcases: Sequence[TestcaseResult] | None = handler(v)
+        return None if testcases is None else TestcaseResults(testcases)
+
+    @field_serializer("testcases")
+    def serialize_testcases(
+        self, testcases: Sequence[TestcaseResult] | None
+    ) -> list[TestcaseResult] | None:
+        return None if testcases is None else list(testcases)
+
     def need_reverifying(self, base_time: datetime.datetime) -> bool:
         if self.status != ResultStatus.SUCCESS:
             return True
@@ -145,10 +271,12 @@ class VerifyCommandResult(BaseModel):
 
     @classmethod
     def parse_file_relative(cls, path: "StrPath") -> "VerifyCommandResult":
-        impl = cls.model_validate_json(pathlib.Path(path).read_bytes())
+        with gc_paused():
+            impl = cls.model_validate_json(pathlib.Path(path).read_bytes())
+        relatives = to_relative_all(impl.files.keys())
         new_files: dict[pathlib.Path, FileResult] = {}
         for p, f in impl.files.items():
-            rp = to_relative(p)
+            rp = relatives[p]
             if not rp:
                 logger.warning(
                     "Files in other directories are not subject to verification: %s",
@@ -162,15 +290,25 @@ class VerifyCommandResult(BaseModel):
         return impl
 
     def merge(self, other: "VerifyCommandResult") -> "VerifyCommandResult":
+        return self.merge_all([other])
+
+    def merge_all(
+        self, others: Iterable["VerifyCommandResult"]
+    ) -> "VerifyCommandResult":
+        """Merge ``others`` in order into a new ``VerifyCommandResult``.
+
+        The files are accumulated into one dict,
+        so each of ``others`` can be released after it is merged.
+        """
+        total_seconds = self.total_seconds
         d = self.files.copy()
-        for k, r in other.files.items():
-            cur = d.get(k)
-            if r.newest or (cur is None) or (not cur.newest):
-                d[k] = r
-        return VerifyCommandResult(
-            total_seconds=self.total_seconds + other.total_seconds,
-            files=d,
-        )
+        for other in others:
+            total_seconds += other.total_seconds
+            for k, r in other.files.items():
+                cur = d.get(k)
+                if r.newest or (cur is None) or (not cur.newest):
+                    d[k] = r
+        return VerifyCommandResult(total_seconds=total_seconds, files=d)
 
     def is_success(self, *, allow_skip: bool = True) -> bool:
         return all(f.is_success(allow_skip=allow_skip) for f in self.files.values())
@@ -17,3 +17,4 @@ class JudgeStatus(Enum):
     RE = "RE"
     TLE = "TLE"
     MLE = "MLE"
+    OLE = "OLE"
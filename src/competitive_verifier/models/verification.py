@@ -1,3 +1,4 @@
+import pathlib
 from abc import ABC, abstractmethod
 from typing import Annotated, Literal, Protocol
 
@@ -17,6 +18,8 @@ class VerifcationTimeoutError(Exception):
 class VerificationParams(Protocol):
     default_tle: float | None
     default_mle: float | None
+    enforce_limits: bool
+    keep_answers: pathlib.Path | None
 
 
 class BaseVerification(BaseModel, ABC):
@@ -172,6 +175,8 @@ class BaseProblemVerification(BaseVerification, ABC):
             error=self.error,
             mle=self.mle or params.default_mle,
             deadline=deadline,
+            enforce_limits=params.enforce_limits,
+            keep_answers=params.keep_answers,
         )
         result.verification_name = self.name
         return result
@@ -1,9 +1,13 @@
 """Port of oj-verify."""
 
-from .oj_download import main as download
-from .oj_test import main as test
-from .problem import LocalProblem, problem_from_url
-from .resolver import OjResolve
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .oj_download import main as download
+    from .oj_test import main as test
+    from .problem import LocalProblem, problem_from_url
+    from .resolver import OjResolve
 
 __all__ = [
     "LocalProblem",
@@ -12,3 +16,22 @@ __all__ = [
     "problem_from_url",
     "test",
 ]
+
+# Submodules are imported on first access,
+# because `resolver` imports all languages and `problem` imports `requests`.
+_LAZY_ATTRIBUTES: dict[str, tuple[str, str]] = {
+    "LocalProblem": (".problem", "LocalProblem"),
+    "OjResolve": (".resolver", "OjResolve"),
+    "download": (".oj_download", "main"),
+    "problem_from_url": (".problem", "problem_from_url"),
+    "test": (".oj_test", "main"),
+}
+
+
+def __getattr__(name: str) -> Any:  # noqa: ANN401
+    if (attr := _LAZY_ATTRIBUTES.get(name)) is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module, attr_name = attr
+    value = getattr(importlib.import_module(module, __name__), attr_name)
+    globals()[name] = value
+    return value
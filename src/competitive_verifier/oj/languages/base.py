@@ -43,6 +43,9 @@ class Language(BaseModel):
     def bundle(self, path: pathlib.Path, *, basedir: pathlib.Path) -> bytes | None:
         return None
 
+    def close(self) -> None:
+        pass
+
     @abc.abstractmethod
     def list_environments(
         self, path: pathlib.Path, *, basedir: pathlib.Path
@@ -59,3 +62,4 @@ class OjVerifyUserDefinedConfig(OjVerifyLanguageConfig):
     bundle: ShellCommandLike | None = None
     list_attributes: ShellCommandLike | None = None
     list_dependencies: ShellCommandLike | None = None
+    batch: ShellCommandLike | None = None
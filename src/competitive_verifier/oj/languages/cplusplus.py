@@ -1,6 +1,8 @@
+import hashlib
 import os
 import pathlib
 import platform
+import re
 import shlex
 import shutil
 from logging import getLogger
@@ -8,8 +10,10 @@ from typing import Any
 
 from pydantic import BaseModel, Field
 
+from competitive_verifier import config
 from competitive_verifier.exec import command_stdout
 from competitive_verifier.log import GitHubMessageParams
+from competitive_verifier.util import read_text_normalized
 
 from . import special_comments
 from .base import Language, LanguageEnvironment, OjVerifyLanguageConfig
@@ -23,6 +27,8 @@ logger = getLogger(__name__)
 class OjVerifyCPlusPlusConfigEnv(BaseModel):
     CXX: str
     CXXFLAGS: list[str] | None = None
+    PCH: list[str] | None = None
+    """Headers to precompile. e.g. ``["bits/stdc++.h"]``. Only GCC is supported."""
 
 
 class OjVerifyCPlusPlusConfig(OjVerifyLanguageConfig):
@@ -30,13 +36,95 @@ class OjVerifyCPlusPlusConfig(OjVerifyLanguageConfig):
     environments: list[OjVerifyCPlusPlusConfigEnv] | None = None
 
 
+def _precompiled_header_directory(
+    CXX: pathlib.Path,
+    CXXFLAGS: list[str],
+    header: str,
+) -> pathlib.Path:
+    """The include directory which contains ``<header>.gch``."""
+    digest = hashlib.sha256(
+        "\0".join([str(CXX), *CXXFLAGS, header]).encode("utf-8")
+    ).hexdigest()[:16]
+    return (config.get_cache_dir() / "cplusplus-pch" / digest / "include").resolve()
+
+
+def _precompile_header_script(
+    CXX: pathlib.Path,
+    CXXFLAGS: list[str],
+    header: str,
+) -> str:
+    """Shell script which builds ``<header>.gch`` if it is missing or stale.
+
+    The script runs as a part of the compile command on the machine which verifies,
+    so the cache of the machine which resolved is not required.
+    GCC looks for ``<header>.gch`` in each include directory before ``<header>``,
+    and falls back to the header silently if the precompiled header is missing or
+    was built with different options. So a failure of the script is ignored.
+
+    The version of the compiler is stored next to ``<header>.gch``, and the header is
+    precompiled again when it differs, because GCC rejects the precompiled header
+    built by another version without any warnings.
+    """
+    include_dir = _precompiled_header_directory(CXX, CXXFLAGS, header)
+    gch = shlex.quote(str(include_dir / f"{header}.gch"))
+    stamp = shlex.quote(str(include_dir / f"{header}.gch.version"))
+    # Files are compiled in parallel, so the temporary files are unique to the shell process.
+    source = shlex.quote(str(include_dir.parent / "source")) + ".$$.hpp"
+    tmp = f"{gch}.$$.tmp"
+    build = shlex.join([str(CXX), *CXXFLAGS, "-x", "c++-header"])
+    version = shlex.join([str(CXX), "-dumpfullversion", "-dumpversion"])
+    return (
+        f"pch_version=$({version} 2>/dev/null);"
+        f' if [ ! -e {gch} ] || [ "$(cat {stamp} 2>/dev/null)" != "$pch_version" ]; then'
+        f" mkdir -p {shlex.quote(str((include_dir / header).parent))}"
+        f" && printf '#include <%s>\\n' {shlex.quote(header)} > {source}"
+        f" && {build} {source} -o {tmp}"
+        f" && mv -f {tmp} {gch}"
+        f" && printf '%s\\n' \"$pch_version\" > {stamp}.$$.tmp"
+        f" && mv -f {stamp}.$$.tmp {stamp};"
+        f" rm -f {source} {tmp} {stamp}.$$.tmp;"
+        " fi"
+    )
+
+
 class CPlusPlusLanguageEnvironment(LanguageEnvironment):
     cxx: pathlib.Path
     cxx_flags: list[str]
-
-    def __init__(self, *, CXX: pathlib.Path, CXXFLAGS: list[str]):
+    precompiled_headers: list[str]
+
+    def __init__(
+        self,
+        *,
+        CXX: pathlib.Path,
+        CXXFLAGS: list[str],
+        PCH: list[str] | None = None,
+    ):
         self.cxx = CXX
         self.cxx_flags = CXXFLAGS
+        self.precompiled_headers = PCH or []
+
+    def _precompiled_headers(self, path: pathlib.Path) -> list[str]:
+        """Headers which ``path`` includes and which should be precompiled."""
+        if not self.precompiled_headers:
+            return []
+        if not self.is_gcc():
+            logger.debug("precompiled headers are supported only by GCC: %s", self.cxx)
+            return []
+        if os.name != "posix":
+            logger.debug("precompiled headers are supported only on POSIX")
+            return []
+
+        try:
+            code = read_text_normalized(path)
+        except OSError:
+            return []
+        return [
+            header
+            for header in self.precompiled_headers
+            if re.search(
+                rf"^\s*#\s*include\s*<{re.escape(header)}>", code, re.MULTILINE
+            )
+        ]
 
     @property
     def name(self) -> str:
@@ -44,16 +132,39 @@ class CPlusPlusLanguageEnvironment(LanguageEnvironment):
 
     def get_compile_command(
         self, path: pathlib.Path, *, basedir: pathlib.Path, tempdir: pathlib.Path
-    ) -> list[str]:
-        return [
+    ) -> list[str] | str:
+        headers = self._precompiled_headers(path)
+        command = [
             str(self.cxx),
             *self.cxx_flags,
+            *(
+                flag
+                for header in headers
+                for flag in (
+                    "-I",
+                    str(
+                        _precompiled_header_directory(self.cxx, self.cxx_flags, header)
+                    ),
+                )
+            ),
             "-I",
             str(basedir),
             "-o",
             str(tempdir / "a.out"),
             str(path),
         ]
+        if not headers:
+            return command
+        # Build the precompiled headers when the file is compiled.
+        return "; ".join(
+            [
+                *(
+                    _precompile_header_script(self.cxx, self.cxx_flags, header)
+                    for header in headers
+                ),
+                shlex.join(command),
+            ]
+        )
 
     def get_execute_command(
         self, path: pathlib.Path, *, basedir: pathlib.Path, tempdir: pathlib.Path
@@ -149,6 +260,7 @@ class CPlusPlusLanguage(Language):
                 CPlusPlusLanguageEnvironment(
                     CXX=pathlib.Path(env.CXX),
                     CXXFLAGS=env.CXXFLAGS or default_CXXFLAGS,
+                    PCH=env.PCH,
                 )
                 for env in self.config.environments
             )
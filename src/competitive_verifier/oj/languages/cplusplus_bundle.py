@@ -1,6 +1,7 @@
 # Python Version: 3.x
 import contextlib
 import functools
+import hashlib
 import json
 import os
 import pathlib
@@ -9,6 +10,7 @@ import shutil
 from logging import getLogger
 from typing import Any
 
+from competitive_verifier import config
 from competitive_verifier.exec import command_stdout
 
 logger = getLogger(__name__)
@@ -165,10 +167,15 @@ TR1_LIBS = {
 }
 
 
+@functools.cache
+def _compiler_version(compiler: str) -> str:
+    return command_stdout([compiler, "--version"])
+
+
 @functools.cache
 def _check_compiler(compiler: str) -> str:
     # Executables named "g++" are not always g++, due to the fake g++ of macOS
-    version = command_stdout([compiler, "--version"])
+    version = _compiler_version(compiler)
     if "clang" in version.lower() or "Apple LLVM".lower() in version.lower():
         return "clang"
     if "g++" in version.lower():
@@ -205,9 +212,28 @@ def _get_uncommented_code(
     return command_stdout(command, text=False)
 
 
+def _uncommented_code_cache_path(code: bytes, *, compiler: str) -> pathlib.Path | None:
+    """Path of the cache of the uncommented code.
+
+    The output of ``-fpreprocessed`` depends only on the content of the file and the compiler,
+    so the cache is shared among files and runs.
+    """
+    if shutil.which(compiler) is None or _check_compiler(compiler) != "gcc":
+        return None
+    h = hashlib.sha256(_compiler_version(compiler).encode("utf-8"))
+    h.update(b"\0")
+    h.update(code)
+    return config.get_cache_dir() / "cplusplus-bundle" / f"{h.hexdigest()}.uncommented"
+
+
 def get_uncommented_code(
     path: pathlib.Path, *, iquotes: list[pathlib.Path], compiler: str
 ) -> bytes:
+    cache_path = _uncommented_code_cache_path(path.read_bytes(), compiler=compiler)
+    if cache_path is not None:
+        with contextlib.suppress(OSError):
+            return cache_path.read_bytes()
+
     iquotes_options: list[str] = []
     for iquote in iquotes:
         iquotes_options.extend(["-I", str(iquote.resolve())])
@@ -223,7 +249,17 @@ def get_uncommented_code(
                 lines.append(b"\n")
         else:
             lines.append(line)
-    return b"".join(lines)
+    uncommented = b"".join(lines)
+
+    if cache_path is not None:
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = cache_path.with_name(f".{cache_path.name}.{os.getpid()}.tmp")
+            tmp.write_bytes(uncommented)
+            tmp.replace(cache_path)
+        except OSError:
+            logger.warning("failed to write the cache: %s", cache_path)
+    return uncommented
 
 
 class BundleError(Exception):
@@ -1,6 +1,6 @@
 from typing import Literal
 
-from pydantic import Field
+from pydantic import Field, model_validator
 
 from competitive_verifier.models import ShellCommand, ShellCommandLike
 
@@ -16,6 +16,18 @@ class OjVerifyGoConfig(OjVerifyUserDefinedConfig):
         ),
     )
 
+    @model_validator(mode="after")
+    def default_compile(self: "OjVerifyGoConfig") -> "OjVerifyGoConfig":
+        # Build once and run the binary for each test case instead of `go run`.
+        # A config which sets `compile` or `execute` keeps the other one as it was.
+        if not {"compile", "execute"} & self.model_fields_set:
+            self.execute = ShellCommand(command=["{tempdir}/a.out"])
+            self.compile = ShellCommand(
+                command=["go", "build", "-o", "{tempdir}/a.out", "{basedir}/{path}"],
+                env={"GO111MODULE": "off"},
+            )
+        return self
+
 
 class GoLanguage(UserDefinedLanguage):
     extension: Literal["go"] = "go"  # pyright: ignore[reportIncompatibleVariableOverride]
@@ -1,6 +1,6 @@
 from typing import Literal
 
-from pydantic import Field
+from pydantic import Field, model_validator
 
 from competitive_verifier.models import ShellCommand, ShellCommandLike
 
@@ -15,6 +15,25 @@ class OjVerifyHaskellConfig(OjVerifyUserDefinedConfig):
         ),
     )
 
+    @model_validator(mode="after")
+    def default_compile(self: "OjVerifyHaskellConfig") -> "OjVerifyHaskellConfig":
+        # Build once and run the binary for each test case instead of `runghc`.
+        # A config which sets `compile` or `execute` keeps the other one as it was.
+        if not {"compile", "execute"} & self.model_fields_set:
+            self.execute = ShellCommand(command=["{tempdir}/a.out"])
+            self.compile = ShellCommand(
+                command=[
+                    "ghc",
+                    "-O2",
+                    "-outputdir",
+                    "{tempdir}",
+                    "-o",
+                    "{tempdir}/a.out",
+                    "{basedir}/{path}",
+                ],
+            )
+        return self
+
 
 class HaskellLanguage(UserDefinedLanguage):
     extension: Literal["hs"] = "hs"  # pyright: ignore[reportIncompatibleVariableOverride]
@@ -1,10 +1,18 @@
+import contextlib
+import functools
+import hashlib
+import os
 import pathlib
+import shlex
 from collections.abc import Sequence
 from logging import getLogger
 from typing import Any, Literal
 
 from pydantic import Field, ValidationInfo, field_validator
 
+from competitive_verifier import config, git
+
+from . import special_comments
 from .base import LanguageEnvironment, OjVerifyUserDefinedConfig
 from .user_defined import UserDefinedLanguage
 
@@ -29,21 +37,196 @@ class JavaLanguageEnvironment(LanguageEnvironment):
 
     def get_compile_command(
         self, path: pathlib.Path, *, basedir: pathlib.Path, tempdir: pathlib.Path
-    ) -> list[str]:
-        return ["javac", str(basedir / path)]
+    ) -> list[str] | str:
+        # javac compiles the dependencies found in the source path together.
+        # Each file has its own build directory, so files compiled at the same time
+        # do not write the same classes.
+        build_dir = _get_build_dir(path)
+        if os.name != "posix":
+            return [
+                "javac",
+                "-sourcepath",
+                str(basedir),
+                "-d",
+                str(build_dir / "classes"),
+                str(basedir / path),
+            ]
+
+        batch, batch_jar_prefix = _batch(basedir.resolve())
+        return _compile_script(
+            basedir=basedir,
+            path=basedir / path,
+            class_name=_class_name(path, basedir=basedir),
+            build_dir=build_dir,
+            batch=batch if (basedir / path).resolve() in batch else [],
+            batch_jar_prefix=batch_jar_prefix,
+        )
 
     def get_execute_command(
         self, path: pathlib.Path, *, basedir: pathlib.Path, tempdir: pathlib.Path
     ) -> list[str]:
-        relative_path = (basedir / path).relative_to(basedir)
-        class_path = ".".join([*relative_path.parent.parts, relative_path.stem])
-        return ["java", class_path]
+        build_dir = _get_build_dir(path)
+        if os.name != "posix":
+            return [
+                "java",
+                "-classpath",
+                str(build_dir / "classes"),
+                _class_name(path, basedir=basedir),
+            ]
+        # The launcher is written by the compile command.
+        return [str(build_dir / "run")]
+
+
+def _get_build_dir(path: pathlib.Path) -> pathlib.Path:
+    return (
+        config.get_cache_dir()
+        / "java"
+        / hashlib.md5(
+            path.as_posix().encode("utf-8"), usedforsecurity=False
+        ).hexdigest()
+    ).resolve()
+
+
+def _class_name(path: pathlib.Path, *, basedir: pathlib.Path) -> str:
+    relative_path = (basedir / path).relative_to(basedir)
+    return ".".join([*relative_path.parent.parts, relative_path.stem])
+
+
+@functools.cache
+def _batch(basedir: pathlib.Path) -> tuple[list[pathlib.Path], pathlib.Path]:
+    """Java verification files under ``basedir``, which are compiled by one javac.
+
+    Returns:
+        tuple[list[pathlib.Path], pathlib.Path]: The files and the prefix of the jar built from them.
+        The digest of all Java files under ``basedir`` is a part of the prefix,
+        so a jar is never overwritten by another content.
+    """
+    java_files = sorted(
+        p.resolve() for p in git.ls_files(basedir) if p.suffix == ".java"
+    )
+    sources = [
+        p for p in java_files if special_comments.is_compiled_for_verification(p)
+    ]
+    h = hashlib.sha256()
+    for path in sources:
+        h.update(path.as_posix().encode("utf-8"))
+        h.update(b"\0")
+    for path in java_files:
+        h.update(b"\0")
+        h.update(path.as_posix().encode("utf-8"))
+        h.update(b"\0")
+        with contextlib.suppress(OSError):
+            h.update(path.read_bytes())
+    prefix = config.get_cache_dir() / "java" / "batch" / h.hexdigest()
+    return sources, prefix.resolve()
+
+
+def _compile_script(
+    *,
+    basedir: pathlib.Path,
+    path: pathlib.Path,
+    class_name: str,
+    build_dir: pathlib.Path,
+    batch: list[pathlib.Path],
+    batch_jar_prefix: pathlib.Path,
+) -> str:
+    """Shell script which builds ``<build_dir>/app.jar`` and the launcher ``<build_dir>/run``.
+
+    If ``batch`` is not empty, all of the files are compiled by one javac,
+    and the jar is shared by all verification files through hard links.
+    The jar is named after the version of javac, and it is written to a temporary file
+    and renamed, so files compiled at the same time need no lock.
+    The first verification builds it and the others only link it.
+    If it fails, only ``path`` is compiled, so a broken file doesn't fail the others.
+    The failure is also recorded, so the others don't compile all of the files again.
+
+    The launcher uses an AppCDS archive which the first test case creates
+    if the JVM of the machine which verifies supports ``-XX:+AutoCreateSharedArchive``.
+    AppCDS archives only the classes loaded from a jar.
+    """
+    app = build_dir / "app.jar"
+    archive = build_dir / "app.jsa"
+    # The archive of the previous jar is removed because its classes are stale.
+    remove_app = shlex.join(["rm", "-rf", str(app), str(archive)])
+    javac = ["javac", "-sourcepath", str(basedir), "-d"]
+    build_file = " && ".join(
+        [
+            shlex.join(["rm", "-rf", str(build_dir / "classes")]),
+            remove_app,
+            shlex.join([*javac, str(build_dir / "classes"), str(path)]),
+            shlex.join(["jar", "cf", str(app), "-C", str(build_dir / "classes"), "."]),
+        ]
+    )
+    if batch:
+        batch_classes = build_dir / "batch"
+        batch_jar = build_dir / "batch.jar"
+        cleanup = shlex.join(["rm", "-rf", str(batch_classes), str(batch_jar)])
+        build_all = " && ".join(
+            [
+                cleanup,
+                shlex.join(["mkdir", "-p", str(batch_jar_prefix.parent)]),
+                shlex.join([*javac, str(batch_classes), *map(str, batch)]),
+                shlex.join(
+                    ["jar", "cf", str(batch_jar), "-C", str(batch_classes), "."]
+                ),
+                f'mv -f {shlex.quote(str(batch_jar))} "$shared"',
+            ]
+        )
+        app_quoted = shlex.quote(str(app))
+        link = f'ln -f "$shared" {app_quoted} || cp -f "$shared" {app_quoted}'
+        build = " ".join(
+            [
+                f"shared={shlex.quote(str(batch_jar_prefix))}.$(javac -version 2>&1 | cksum | cut -d ' ' -f 1).jar;",
+                'if [ ! -e "$shared" ] && [ ! -e "$shared.failed" ]; then',
+                f'{{ {build_all}; }} || : > "$shared.failed";',
+                f"{cleanup};",
+                "fi;",
+                f'if [ -e "$shared" ]; then [ "$shared" -ef {app_quoted} ] || {{ {remove_app} && {{ {link}; }}; }};',
+                f"else {build_file}; fi",
+            ]
+        )
+    else:
+        build = build_file
+
+    cds = [
+        # The first test case creates the AppCDS archive, and the others start faster with it.
+        "-XX:+AutoCreateSharedArchive",
+        f"-XX:SharedArchiveFile={archive}",
+        # Warnings of the JVM are written to stdout by default.
+        "-Xlog:disable",
+        "-Xlog:all=warning:stderr",
+    ]
+    probe = [
+        "java",
+        "-XX:+AutoCreateSharedArchive",
+        f"-XX:SharedArchiveFile={archive}",
+        "-Xshare:off",
+        "-version",
+    ]
+
+    def launcher(options: list[str]) -> str:
+        java = shlex.join(["java", *options, "-classpath", str(app), class_name])
+        return shlex.quote(f'#!/bin/sh\nexec {java} "$@"')
+
+    run = shlex.quote(str(build_dir / "run"))
+    return (
+        f"{shlex.join(['mkdir', '-p', str(build_dir)])}"
+        f" && {{ {build}; }}"
+        f" && if {shlex.join(probe)} >/dev/null 2>&1;"
+        f" then printf '%s\\n' {launcher(cds)} > {run}.$$.tmp;"
+        f" else printf '%s\\n' {launcher([])} > {run}.$$.tmp; fi"
+        f" && chmod +x {run}.$$.tmp && mv -f {run}.$$.tmp {run}"
+    )
 
 
 class JavaLanguage(UserDefinedLanguage):
     extension: Literal["java"] = "java"  # pyright: ignore[reportIncompatibleVariableOverride]
     config: OjVerifyJavaConfig = Field(default_factory=OjVerifyJavaConfig)  # pyright: ignore[reportIncompatibleVariableOverride]
 
+    def close(self) -> None:
+        super().close()
+        _batch.cache_clear()
+
     def list_environments(
         self, path: pathlib.Path, *, basedir: pathlib.Path
     ) -> Sequence[LanguageEnvironment]:
@@ -1,20 +1,17 @@
-# pyright: reportUnknownVariableType=false, reportUnknownMemberType=false
 # Python Version: 3.x
-import concurrent.futures
+import ast
 import functools
 import os
 import pathlib
-import platform
+import shlex
 import sys
-from collections.abc import Sequence
+from collections.abc import Iterator, Sequence
 from logging import getLogger
 
-import importlab.environment
-import importlab.fs
-import importlab.graph
-
+from competitive_verifier import config, git
 from competitive_verifier.models import ShellCommand
 
+from . import special_comments
 from .base import Language, LanguageEnvironment
 
 logger = getLogger(__name__)
@@ -33,12 +30,38 @@ class PythonLanguageEnvironment(LanguageEnvironment):
             else basedir.resolve().as_posix()
         )
 
+    def _env(self, *, basedir: pathlib.Path) -> dict[str, str]:
+        return {
+            "PYTHONPATH": self._python_path(basedir=basedir),
+            # Bytecode is shared by all verifications and persists across runs
+            # without writing `__pycache__` into the repository.
+            "PYTHONPYCACHEPREFIX": str(_get_pycache_prefix().resolve()),
+        }
+
     def get_compile_command(
         self, path: pathlib.Path, *, basedir: pathlib.Path, tempdir: pathlib.Path
     ) -> ShellCommand:
+        # Compile the file and the libraries it imports in one interpreter,
+        # so that each test case only loads the bytecode.
+        graph = _python_import_graph(basedir.resolve())
+        dependencies = sorted(
+            dep.relative_to(graph.basedir)
+            for dep in graph.transitive_dependencies(basedir / path)
+        )
+        compile_file = ["python", "-m", "compileall", "-q", str(path)]
+        compile_file.extend(map(str, dependencies))
+        batch = _batch_compile_paths(graph.basedir)
+        if path not in batch or set(batch) == {path, *dependencies}:
+            return ShellCommand(command=compile_file, env=self._env(basedir=basedir))
+
+        # All verification files and their libraries are compiled by the first one,
+        # and the others only check that the bytecode is up to date.
+        # If any of them is broken, only the file and its libraries are compiled,
+        # so a broken file doesn't fail the others.
+        compile_all = ["python", "-m", "compileall", "-q", *map(str, batch)]
         return ShellCommand(
-            command=["python", "-m", "py_compile", str(path)],
-            env={"PYTHONPATH": self._python_path(basedir=basedir)},
+            command=f"{shlex.join(compile_all)} || {shlex.join(compile_file)}",
+            env=self._env(basedir=basedir),
         )
 
     def get_execute_command(
@@ -46,61 +69,144 @@ class PythonLanguageEnvironment(LanguageEnvironment):
     ) -> ShellCommand:
         return ShellCommand(
             command=["python", str(path)],
-            env={"PYTHONPATH": self._python_path(basedir=basedir)},
+            env=self._env(basedir=basedir),
         )
 
 
+def _get_pycache_prefix() -> pathlib.Path:
+    return config.get_cache_dir() / "pycache"
+
+
+class _PythonImportGraph:
+    """Import graph of Python files under ``basedir``.
+
+    Each file is parsed once and the graph is shared by all files,
+    so that a library imported from many files is not parsed again and again.
+    Imports are resolved in the same way as ``importlab``.
+    """
+
+    basedir: pathlib.Path
+    _dependencies: dict[pathlib.Path, frozenset[pathlib.Path]]
+    _transitive_dependencies: dict[pathlib.Path, frozenset[pathlib.Path]]
+
+    def __init__(self, basedir: pathlib.Path) -> None:
+        self.basedir = basedir.resolve()
+        self._dependencies = {}
+        self._transitive_dependencies = {}
+
+    def dependencies(self, path: pathlib.Path) -> frozenset[pathlib.Path]:
+        """Files under ``basedir`` which ``path`` imports directly."""
+        path = path.resolve()
+        deps = self._dependencies.get(path)
+        if deps is None:
+            deps = self._dependencies[path] = frozenset(
+                dep
+                for name, is_from, is_star in self._imports(path)
+                if (dep := self._resolve(path, name, is_from=is_from, is_star=is_star))
+                and self.basedir in dep.parents
+            )
+            logger.debug("the dependencies of %s: %s", path, deps)
+        return deps
+
+    def transitive_dependencies(self, path: pathlib.Path) -> frozenset[pathlib.Path]:
+        """Files under ``basedir`` which ``path`` imports directly or indirectly."""
+        path = path.resolve()
+        deps = self._transitive_dependencies.get(path)
+        if deps is None:
+            visited = {path}
+            stack = [path]
+            while stack:
+                for dep in self.dependencies(stack.pop()):
+                    if dep not in visited:
+                        visited.add(dep)
+                        stack.append(dep)
+            visited.remove(path)
+            deps = self._transitive_dependencies[path] = frozenset(visited)
+        return deps
+
+    @staticmethod
+    def _imports(path: pathlib.Path) -> Iterator[tuple[str, bool, bool]]:
+        try:
+            tree = ast.parse(path.read_bytes(), filename=str(path))
+        except (OSError, SyntaxError, ValueError):
+            logger.debug("failed to parse %s", path, exc_info=True)
+            return
+
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    yield alias.name, False, False
+            elif isinstance(node, ast.ImportFrom):
+                module_name = "." * node.level + (node.module or "")
+                for alias in node.names:
+                    if alias.name == "*":
+                        yield module_name, True, True
+                    else:
+                        sep = "" if module_name.endswith(".") else "."
+                        yield module_name + sep + alias.name, True, False
+
+    def _resolve(
+        self, path: pathlib.Path, name: str, *, is_from: bool, is_star: bool
+    ) -> pathlib.Path | None:
+        if name in sys.builtin_module_names or name.startswith("__future__"):
+            return None
+
+        remainder = name.lstrip(".")
+        level = len(name) - len(remainder)
+        directory = self.basedir
+        if level:
+            directory = path.parent
+            for _ in range(level - 1):
+                directory = directory.parent
+
+        parts = remainder.split(".") if remainder else []
+        candidates = [parts]
+        # The last part in `from a.b import c` might be a symbol rather than a module
+        if is_from and not is_star:
+            candidates.append(parts[:-1])
+
+        for candidate in candidates:
+            base = directory.joinpath(*candidate)
+            for f in (base / "__init__.py", base.parent / f"{base.name}.py"):
+                # We cannot import a file from itself
+                if f != path and f.is_file():
+                    return f
+        return None
+
+
 @functools.cache
+def _python_import_graph(basedir: pathlib.Path) -> _PythonImportGraph:
+    return _PythonImportGraph(basedir)
+
+
+@functools.cache
+def _batch_compile_paths(basedir: pathlib.Path) -> list[pathlib.Path]:
+    """Verification files under ``basedir`` and the files which they import.
+
+    Returns:
+        list[pathlib.Path]: Paths relative to ``basedir``
+    """
+    graph = _python_import_graph(basedir)
+    paths = set[pathlib.Path]()
+    for tracked in git.ls_files(basedir):
+        path = tracked.resolve()
+        if path.suffix == ".py" and special_comments.is_compiled_for_verification(path):
+            paths.add(path)
+            paths |= graph.transitive_dependencies(path)
+    return sorted(p.relative_to(basedir) for p in paths if p.is_relative_to(basedir))
+
+
 def _python_list_depending_files(
     path: pathlib.Path, basedir: pathlib.Path
 ) -> list[pathlib.Path]:
-    # compute the dependency graph of the `path`
-    env = importlab.environment.Environment(
-        importlab.fs.Path([importlab.fs.OSFileSystem(str(basedir.resolve()))]),
-        (sys.version_info.major, sys.version_info.minor),
-    )
-    try:
-        executor = concurrent.futures.ThreadPoolExecutor()
-        future = executor.submit(
-            importlab.graph.ImportGraph.create,  # pyright: ignore[reportUnknownArgumentType]
-            env,
-            [str(path)],
-            True,
-        )
-
-        timeout = 5.0 if platform.uname().system == "Windows" else 1.0
-        # 1.0 sec causes timeout on CI using Windows
-
-        res_graph = future.result(timeout=timeout)
-    except concurrent.futures.TimeoutError as e:
-        raise RuntimeError(
-            f"Failed to analyze the dependency graph (timeout): {path}"
-        ) from e
-    try:
-        node_deps_pairs: list[tuple[str, list[str]]] = res_graph.deps_list()
-    except Exception as e:
-        raise RuntimeError(
-            f"Failed to analyze the dependency graph (circular imports?): {path}"
-        ) from e
-    logger.debug("the dependency graph of %s: %s", path, node_deps_pairs)
-
-    # collect Python files which are depended by the `path` and under `basedir`
-    res_deps: list[pathlib.Path] = []
-    res_deps.append(path.resolve())
-    for node_, deps_ in node_deps_pairs:
-        node = pathlib.Path(node_)
-        deps = list(map(pathlib.Path, deps_))
-        if node.resolve() == path.resolve():
-            res_deps.extend(
-                dep.resolve()
-                for dep in deps
-                if basedir.resolve() in dep.resolve().parents
-            )
-            break
-    return list(set(res_deps))
+    path = path.resolve()
+    return sorted({path, *_python_import_graph(basedir.resolve()).dependencies(path)})
 
 
 class PythonLanguage(Language):
+    def close(self) -> None:
+        _batch_compile_paths.cache_clear()
+
     def list_dependencies(
         self, path: pathlib.Path, *, basedir: pathlib.Path
     ) -> list[pathlib.Path]:
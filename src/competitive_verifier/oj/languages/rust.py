@@ -1,22 +1,28 @@
 import abc
+import contextlib
 import enum
 import functools
+import hashlib
 import itertools
 import json
+import os
 import pathlib
+import shlex
 import shutil
 from collections import defaultdict
-from collections.abc import Sequence
+from collections.abc import Iterable, Sequence
 from enum import Enum
 from logging import getLogger
 from typing import Any, Literal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ValidationError
 
+from competitive_verifier import config
 from competitive_verifier.exec import command_stdout
 from competitive_verifier.models import ShellCommand
 from competitive_verifier.util import read_text_normalized
 
+from . import special_comments
 from .base import Language, LanguageEnvironment, OjVerifyLanguageConfig
 
 # ruff: noqa: PLR2004
@@ -28,6 +34,7 @@ _cargo_checked_workspaces: set[pathlib.Path] = set()
 _related_source_files_by_workspace: dict[
     pathlib.Path, dict[pathlib.Path, frozenset[pathlib.Path]]
 ] = {}
+_verified_targets_by_workspace: dict[pathlib.Path, list[dict[str, Any]]] = {}
 
 
 class OjVerifyRustListDependenciesBackend(BaseModel):
@@ -365,8 +372,24 @@ class RustLanguageEnvironment(LanguageEnvironment):
         path = basedir / path
         metadata = _cargo_metadata(cwd=path.parent)
         target = _ensure_target(metadata, path)
+        build_target = ["cargo", "build", "--release", *_target_option(target)]
+        targets = _verified_targets(metadata)
+        if len(targets) <= 1 or target not in targets:
+            return ShellCommand(command=build_target, cwd=path.parent)
+
+        # All verified targets of the workspace are built by one cargo call.
+        # The first verification builds them in parallel and the others are no-op.
+        # If any of them is broken, only the target is built,
+        # so a broken target doesn't fail the others.
+        build_all = [
+            "cargo",
+            "build",
+            "--release",
+            "--workspace",
+            *itertools.chain.from_iterable(_target_option(t) for t in targets),
+        ]
         return ShellCommand(
-            command=["cargo", "build", "--release", *_target_option(target)],
+            command=f"{shlex.join(build_all)} || {shlex.join(build_target)}",
             cwd=path.parent,
         )
 
@@ -386,6 +409,36 @@ class RustLanguageEnvironment(LanguageEnvironment):
         )
 
 
+def _verified_targets(metadata: dict[str, Any]) -> list[dict[str, Any]]:
+    """Returns binaries and examples of the workspace which are verified.
+
+    Args:
+        metadata (dict[str, Any]): "metadata" for a Cargo.toml file in the workspace
+    Returns:
+        list[dict[str, Any]]: Targets whose main source file has a special comment for verification
+    """
+    workspace_root = pathlib.Path(metadata["workspace_root"])
+    if workspace_root in _verified_targets_by_workspace:
+        return _verified_targets_by_workspace[workspace_root]
+
+    targets_in_workspace = itertools.chain.from_iterable(
+        p["targets"]
+        for p in metadata["packages"]
+        if p["id"] in metadata["workspace_members"]
+    )
+    ret = [
+        t
+        for t in targets_in_workspace
+        if (_is_bin(t) or _is_example(t))
+        and special_comments.is_compiled_for_verification(
+            pathlib.Path(t["src_path"]).resolve()
+        )
+    ]
+
+    _verified_targets_by_workspace[workspace_root] = ret
+    return ret
+
+
 class RustLanguage(Language):
     config: OjVerifyRustConfig = Field(default_factory=OjVerifyRustConfig)
 
@@ -477,6 +530,7 @@ def _run_cargo_metadata(manifest_path: pathlib.Path) -> dict[str, Any]:
     """Runs `cargo metadata` for a certain `Cargo.toml`.
 
     This function is considered to be executed just once for every Cargo.toml in the repository.
+    The output is cached on disk while `Cargo.lock` and the manifests in the workspace are unchanged.
     For detailed information about `cargo metadata`, see:
 
     - <https://doc.rust-lang.org/cargo/commands/cargo-metadata.html#output-format>
@@ -489,7 +543,18 @@ def _run_cargo_metadata(manifest_path: pathlib.Path) -> dict[str, Any]:
     Raises:
         RuntimeError: If the `cargo metadata` command fails
     """
-    return json.loads(
+    cache_path = _cargo_metadata_cache_path(manifest_path)
+    with contextlib.suppress(OSError, ValidationError):
+        cache = _CargoMetadataCache.model_validate_json(
+            cache_path.read_text(encoding="utf-8")
+        )
+        if cache.cargo_version == _cargo_version(
+            manifest_path.parent
+        ) and cache.digests == _file_digests(cache.digests):
+            logger.debug("cargo metadata cache is up to date: %s", manifest_path)
+            return cache.metadata
+
+    metadata = json.loads(
         command_stdout(
             [
                 "cargo",
@@ -503,6 +568,80 @@ def _run_cargo_metadata(manifest_path: pathlib.Path) -> dict[str, Any]:
         )
     )
 
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cache_path.with_name(f".{cache_path.name}.{os.getpid()}.tmp")
+        tmp.write_text(
+            _CargoMetadataCache(
+                cargo_version=_cargo_version(manifest_path.parent),
+                digests=_file_digests(_cargo_metadata_inputs(manifest_path, metadata)),
+                metadata=metadata,
+            ).model_dump_json(),
+            encoding="utf-8",
+        )
+        tmp.replace(cache_path)
+    except OSError:
+        logger.warning("Failed to write cargo metadata cache: %s", cache_path)
+    return metadata
+
+
+class _CargoMetadataCache(BaseModel):
+    # Output of `cargo --version`, which may differ for each directory by rustup
+    cargo_version: str
+    # (path of a file which affects the metadata) → (digest of the file)
+    digests: dict[str, str]
+    metadata: dict[str, Any]
+
+
+def _cargo_metadata_cache_path(manifest_path: pathlib.Path) -> pathlib.Path:
+    h = hashlib.sha256(str(manifest_path.resolve()).encode("utf-8"))
+    for name in ["CARGO_TARGET_DIR", "CARGO_BUILD_TARGET_DIR", "RUSTUP_TOOLCHAIN"]:
+        h.update(b"\0")
+        h.update(os.getenv(name, "").encode("utf-8"))
+    return config.get_cache_dir() / "cargo-metadata" / f"{h.hexdigest()}.json"
+
+
+@functools.cache
+def _cargo_version(cwd: pathlib.Path) -> str:
+    """Returns the output of `cargo --version` in `cwd`.
+
+    Raises:
+        RuntimeError: If the `cargo --version` command fails
+    """
+    return command_stdout(["cargo", "--version"], cwd=cwd).strip()
+
+
+def _cargo_metadata_inputs(
+    manifest_path: pathlib.Path, metadata: dict[str, Any]
+) -> list[pathlib.Path]:
+    workspace_root = pathlib.Path(metadata["workspace_root"])
+    return [
+        manifest_path,
+        workspace_root / "Cargo.toml",
+        workspace_root / "Cargo.lock",
+        workspace_root / ".cargo" / "config",
+        workspace_root / ".cargo" / "config.toml",
+        workspace_root / "rust-toolchain",
+        workspace_root / "rust-toolchain.toml",
+        # Manifests of workspace members and path dependencies
+        *(
+            pathlib.Path(p["manifest_path"])
+            for p in metadata["packages"]
+            if p["source"] is None
+        ),
+    ]
+
+
+def _file_digest(path: pathlib.Path) -> str:
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except OSError:
+        return ""
+
+
+def _file_digests(paths: Iterable[pathlib.Path | str]) -> dict[str, str]:
+    return {str(p): _file_digest(pathlib.Path(p)) for p in paths}
+
 
 def _find_target(
     metadata: dict[str, Any],
@@ -27,6 +27,21 @@ def list_special_comments(path: pathlib.Path) -> Mapping[str, str]:
     return attributes
 
 
+# Special comments which make a file compiled and tested
+VERIFICATION_ATTRIBUTES = ("PROBLEM", "LOCALCASE", "STANDALONE")
+
+
+def is_compiled_for_verification(path: pathlib.Path) -> bool:
+    """Whether ``path`` is compiled and tested as a verification file."""
+    try:
+        attributes = list_special_comments(path)
+    except OSError:
+        return False
+    return "IGNORE" not in attributes and any(
+        k in attributes for k in VERIFICATION_ATTRIBUTES
+    )
+
+
 def _unquote(s: str) -> str:
     if s.startswith(("'", '"', "`")):
         end_quote_pos = s.rfind(s[0])
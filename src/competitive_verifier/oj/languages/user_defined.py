@@ -1,12 +1,21 @@
 # Python Version: 3.x
-import glob
+import contextlib
+import functools
+import os
 import pathlib
+import queue
+import subprocess
+import threading
+from collections import defaultdict
 from collections.abc import Sequence
 from logging import getLogger
 from tempfile import TemporaryDirectory
+from typing import Literal
 
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr, ValidationError
 
+from competitive_verifier import git
+from competitive_verifier.log import GitHubMessageParams
 from competitive_verifier.models import ShellCommand, ShellCommandLike
 
 from . import special_comments
@@ -16,6 +25,9 @@ logger = getLogger(__name__)
 
 StrPath = pathlib.Path | str
 
+BATCH_TIMEOUT = 60.0
+"""The timeout in seconds of each request to the ``batch`` process."""
+
 
 class PathContainer(BaseModel):
     path: StrPath
@@ -61,6 +73,125 @@ class PathContainer(BaseModel):
         return ShellCommand.parse_command_like(self.format_command(command))
 
 
+@functools.cache
+def _tracked_files_by_suffix(basedir: pathlib.Path) -> dict[str, list[pathlib.Path]]:
+    # Listed once per resolve and shared by all files of all user-defined languages.
+    # The cache is cleared by UserDefinedLanguage.close when the resolve finishes.
+    files: defaultdict[str, list[pathlib.Path]] = defaultdict(list)
+    for path in sorted(git.ls_files(basedir)):
+        files[path.suffix].append(path)
+    return dict(files)
+
+
+class _BatchRequest(BaseModel):
+    kind: Literal["attributes", "dependencies", "bundle"]
+    path: str
+
+
+class _BatchResponse(BaseModel):
+    attributes: dict[str, str] | None = None
+    dependencies: list[str] | None = None
+    bundle: str | None = None
+
+
+class BatchTimeoutError(RuntimeError):
+    pass
+
+
+class _BatchProcess:
+    """The process of the ``batch`` hook which is started once and handles many files.
+
+    Each request is a JSON line such as ``{"kind": "dependencies", "path": "a.awk"}``
+    written to stdin, and the process writes a JSON line such as
+    ``{"dependencies": ["a.awk", "lib.awk"]}`` to stdout for each request.
+    ``null`` or a missing key means that the hook is not supported.
+    """
+
+    timeout: float
+    _tempdir: TemporaryDirectory[str]
+    _process: subprocess.Popen[str]
+    _lines: "queue.Queue[str]"
+
+    def __init__(
+        self,
+        command: ShellCommandLike,
+        *,
+        basedir: pathlib.Path,
+        timeout: float | None = None,
+    ) -> None:
+        self.timeout = BATCH_TIMEOUT if timeout is None else timeout
+        self._tempdir = TemporaryDirectory()
+        cmd = PathContainer(
+            path=basedir, basedir=basedir, tempdir=self._tempdir.name
+        ).parse_command(command)
+        logger.info("subprocess.Popen: %s", cmd.command)
+        self._process = subprocess.Popen(
+            cmd.command,
+            shell=isinstance(cmd.command, str),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            env=os.environ | cmd.env if cmd.env else None,
+            cwd=cmd.cwd,
+            text=True,
+            encoding="utf-8",
+        )
+        # readline() of a pipe cannot time out, so lines are read in another thread.
+        self._lines = queue.Queue()
+        threading.Thread(target=self._read_lines, daemon=True).start()
+
+    def _read_lines(self) -> None:
+        stdout = self._process.stdout
+        assert stdout is not None
+        with contextlib.suppress(OSError, ValueError):
+            for line in stdout:
+                self._lines.put(line)
+        self._lines.put("")
+
+    def request(
+        self,
+        kind: Literal["attributes", "dependencies", "bundle"],
+        path: pathlib.Path,
+    ) -> _BatchResponse:
+        """Send a request and wait for the response.
+
+        Raises:
+            RuntimeError: The process has exited.
+            BatchTimeoutError: The process did not respond in ``timeout`` seconds. The process is killed.
+        """
+        stdin = self._process.stdin
+        assert stdin is not None
+        try:
+            stdin.write(_BatchRequest(kind=kind, path=str(path)).model_dump_json())
+            stdin.write("\n")
+            stdin.flush()
+        except OSError as e:
+            raise RuntimeError(f"The batch process exited: {path}") from e
+        try:
+            line = self._lines.get(timeout=self.timeout)
+        except queue.Empty as e:
+            self._process.kill()
+            raise BatchTimeoutError(
+                f"The batch process did not respond in {self.timeout} seconds: {path}"
+            ) from e
+        if not line:
+            raise RuntimeError(f"The batch process exited: {path}")
+        return _BatchResponse.model_validate_json(line)
+
+    def close(self) -> None:
+        if self._process.stdin:
+            with contextlib.suppress(OSError):
+                self._process.stdin.close()
+        try:
+            self._process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self._process.kill()
+            self._process.wait()
+        if self._process.stdout:
+            with contextlib.suppress(OSError):
+                self._process.stdout.close()
+        self._tempdir.cleanup()
+
+
 class UserDefinedLanguageEnvironment(LanguageEnvironment):
     config: OjVerifyUserDefinedConfig
     _name: str
@@ -93,11 +224,51 @@ class UserDefinedLanguageEnvironment(LanguageEnvironment):
 class UserDefinedLanguage(Language):
     extension: str
     config: OjVerifyUserDefinedConfig
+    _batch_process: _BatchProcess | None = PrivateAttr(default=None)
+    _batch_disabled: bool = PrivateAttr(default=False)
+    _dependencies_warned: bool = PrivateAttr(default=False)
+
+    def _batch(
+        self,
+        kind: Literal["attributes", "dependencies", "bundle"],
+        path: pathlib.Path,
+        *,
+        basedir: pathlib.Path,
+    ) -> _BatchResponse | None:
+        if self.config.batch is None or self._batch_disabled:
+            return None
+        try:
+            if self._batch_process is None:
+                self._batch_process = _BatchProcess(self.config.batch, basedir=basedir)
+            return self._batch_process.request(kind, path)
+        except (OSError, RuntimeError, ValidationError):
+            # Timeout, an early exit or a malformed response.
+            logger.warning(
+                "The batch process of .%s files failed. Fall back to the commands for each file.",
+                self.extension,
+                exc_info=True,
+                extra={"github": GitHubMessageParams()},
+            )
+            self._batch_disabled = True
+            if self._batch_process is not None:
+                self._batch_process.close()
+                self._batch_process = None
+            return None
+
+    def close(self) -> None:
+        if self._batch_process is not None:
+            self._batch_process.close()
+            self._batch_process = None
+        self._dependencies_warned = False
+        _tracked_files_by_suffix.cache_clear()
 
     def list_attributes(
         self, path: pathlib.Path, *, basedir: pathlib.Path
     ) -> dict[str, str]:
         if self.config.list_attributes is None:
+            batch = self._batch("attributes", path, basedir=basedir)
+            if batch is not None and batch.attributes is not None:
+                return batch.attributes
             return dict(special_comments.list_special_comments(path))
 
         with TemporaryDirectory() as tempdir:
@@ -117,15 +288,20 @@ class UserDefinedLanguage(Language):
         self, path: pathlib.Path, *, basedir: pathlib.Path
     ) -> list[pathlib.Path]:
         if self.config.list_dependencies is None:
-            logger.warning(
-                "The functionality to list dependencies of .%s file is not implemented yet.",
-                self.extension,
+            batch = self._batch("dependencies", path, basedir=basedir)
+            if batch is not None and batch.dependencies is not None:
+                return [path, *map(pathlib.Path, batch.dependencies)]
+            if not self._dependencies_warned:
+                self._dependencies_warned = True
+                logger.warning(
+                    "The functionality to list dependencies of .%s file is not implemented yet.",
+                    self.extension,
+                )
+            return list(
+                _tracked_files_by_suffix(basedir.resolve()).get(
+                    "." + self.extension, []
+                )
             )
-            return [
-                path
-                for path in map(pathlib.Path, glob.glob("**", recursive=True))
-                if path.suffix == "." + self.extension
-            ]
 
         with TemporaryDirectory() as tempdir:
             text = (
@@ -140,7 +316,10 @@ class UserDefinedLanguage(Language):
 
     def bundle(self, path: pathlib.Path, *, basedir: pathlib.Path) -> bytes | None:
         if self.config.bundle is None:
-            return None
+            batch = self._batch("bundle", path, basedir=basedir)
+            if batch is None or batch.bundle is None:
+                return None
+            return batch.bundle.encode()
         with TemporaryDirectory() as tempdir:
             return (
                 PathContainer(path=path, basedir=basedir, tempdir=tempdir)
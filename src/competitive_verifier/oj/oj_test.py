@@ -1,38 +1,115 @@
+import contextlib
 import math
 import os
 import pathlib
 import platform
+import select
 import shlex
 import shutil
+import signal
 import subprocess
 import sys
 import tempfile
+import threading
 import time
 from collections import Counter
 from dataclasses import dataclass
 from logging import getLogger
-from typing import BinaryIO
+from typing import IO, BinaryIO, cast
 
 from competitive_verifier.log import GitHubMessageParams
 from competitive_verifier.models import (
     JudgeStatus,
     ResultStatus,
     TestCaseProvider,
-    TestcaseResult,
+    TestcaseResults,
     VerifcationTimeoutError,
     VerificationResult,
 )
+from competitive_verifier.resource import limit_command
 
 from . import gnu
 from .format import Printer, green, red
 
 logger = getLogger(__name__)
 
+OUTPUT_LIMIT_FACTOR = 16
+"""The default output limit is this multiple of the size of the expected output."""
+MIN_OUTPUT_LIMIT = 64 << 20
+"""The minimum of the default output limit in bytes."""
+
+_READ_SIZE = 1 << 16
+_POLL_INTERVAL = 0.05
+"""The interval in seconds to check the timeout while waiting for the output."""
+# select(2) does not support pipes on Windows.
+_SELECT_PIPE = os.name == "posix"
+
+# File descriptors created by Python are not inheritable (PEP 446),
+# so they need not be closed in the child. Not closing them lets CPython spawn the child
+# with posix_spawn(3) or vfork(2) instead of fork(2).
+# Test cases run under GNU time start a new session, and subprocess does not use
+# posix_spawn(3) for it. They are still spawned with vfork(2) on Linux.
+_CLOSE_FDS = os.name != "posix"
+
 
 class CaseExecutionError(Exception):
     pass
 
 
+@dataclass
+class PreparedCommand:
+    """A command resolved once and run for each test case."""
+
+    command: list[str]
+    """The arguments of the command"""
+    executable: str
+    """The path of the executable of ``command[0]``"""
+    env: dict[str, str] | None
+    """The whole environment variables, or None to inherit them"""
+
+    @classmethod
+    def prepare(
+        cls,
+        command: list[str] | str,
+        *,
+        env: dict[str, str] | None = None,
+    ) -> "PreparedCommand":
+        """Split the command, find the executable and merge the environment variables.
+
+        Args:
+            command: The command
+            env: The additional environment variables
+
+        Raises:
+            CaseExecutionError: The command is empty or not found.
+        """
+        if isinstance(command, str):
+            command = shlex.split(command)
+
+        if len(command) == 0:
+            raise CaseExecutionError
+
+        if env is not None:
+            env = os.environ | env
+
+        # Search the same PATH as the child does.
+        path = env.get("PATH") if env is not None else None
+        executable = shutil.which(command[0], path=path)
+        if executable is None:
+            raise CaseExecutionError
+        return cls(command=command, executable=executable, env=env)
+
+
+def _stderr() -> IO[str] | None:
+    """The stderr of the child. None means the stderr of this process, the fd 2."""
+    try:
+        if sys.stderr.fileno() == 2:  # noqa: PLR2004
+            return None
+    except (AttributeError, OSError, ValueError):
+        pass
+    return sys.stderr
+
+
 @dataclass
 class OjExecInfo:
     answer: str | None
@@ -43,48 +120,181 @@ class OjExecInfo:
     """The maximum memory usage of the executed command in megabytes"""
     returncode: int | None
     """The returncode of the executed command"""
+    output_exceeded: bool = False
+    """Whether the command was killed because its output exceeded the limit"""
+
+
+def default_output_limit(expected_output_path: pathlib.Path) -> int | None:
+    """The output limit in bytes for a test case, or None if it is unknown."""
+    try:
+        size = expected_output_path.stat().st_size
+    except OSError:
+        return None
+    return max(size * OUTPUT_LIMIT_FACTOR, MIN_OUTPUT_LIMIT)
+
+
+def _kill(proc: "subprocess.Popen[bytes]", *, group: bool) -> None:
+    if group and hasattr(os, "killpg"):
+        with contextlib.suppress(ProcessLookupError):
+            os.killpg(proc.pid, signal.SIGKILL)
+    else:
+        proc.kill()
+
+
+def _is_cpu_time_exceeded(returncode: int | None) -> bool:
+    sigxcpu: int | None = getattr(signal, "SIGXCPU", None)
+    # GNU time exits with 128 + the signal number when the command is killed by a signal.
+    return sigxcpu is not None and returncode in {-sigxcpu, 128 + sigxcpu}
+
+
+def _run_with_output_limit(
+    command: list[str],
+    *,
+    executable: str | None,
+    env: dict[str, str] | None,
+    stdin: BinaryIO | int | None,
+    timeout: float | None,
+    start_new_session: bool,
+    output_limit: int,
+) -> tuple[str | None, int | None, bool]:
+    """Run the command and kill it as soon as its output exceeds ``output_limit`` bytes.
+
+    Returns:
+        tuple[str | None, int | None, bool]: The output, the returncode and whether the output exceeded the limit. The output and the returncode are None if timed out.
+    """
+    timed_out = threading.Event()
+    chunks: list[bytes] = []
+    size = 0
+    output_exceeded = False
+    with subprocess.Popen(
+        command,
+        executable=executable,
+        env=env,
+        stdin=stdin,
+        stdout=subprocess.PIPE,
+        stderr=_stderr(),
+        close_fds=_CLOSE_FDS,
+        start_new_session=start_new_session,
+    ) as proc:
+
+        def on_timeout() -> None:
+            timed_out.set()
+            _kill(proc, group=start_new_session)
+
+        timer = threading.Timer(timeout, on_timeout) if timeout is not None else None
+        if timer:
+            timer.start()
+        try:
+            fd = cast("IO[bytes]", proc.stdout).fileno()
+            # The processes spawned by the command may still hold stdout after the
+            # command is killed, so stop reading once it timed out.
+            while not timed_out.is_set():
+                if _SELECT_PIPE and not select.select([fd], [], [], _POLL_INTERVAL)[0]:
+                    continue
+                chunk = os.read(fd, _READ_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > output_limit:
+                    output_exceeded = True
+                    _kill(proc, group=start_new_session)
+                    break
+                chunks.append(chunk)
+            returncode = proc.wait()
+        finally:
+            if timer:
+                timer.cancel()
+
+    if timed_out.is_set() and not output_exceeded:
+        return None, None, False
+    # Same as the text mode of subprocess.run: strict UTF-8 and universal newlines.
+    # The output cut by the limit may end in the middle of a character.
+    answer = b"".join(chunks).decode(
+        "utf-8", errors="replace" if output_exceeded else "strict"
+    )
+    answer = answer.replace("\r\n", "\n").replace("\r", "\n")
+    return answer, returncode, output_exceeded
 
 
 def measure_command(
-    command: list[str] | str,
+    command: PreparedCommand | list[str] | str,
     *,
     env: dict[str, str] | None = None,
     stdin: BinaryIO | int | None = None,
     timeout: float | None = None,
     gnu_time: bool = False,
+    output_limit: int | None = None,
+    memory_limit: float | None = None,
+    cpu_time_limit: float | None = None,
 ) -> OjExecInfo:
-    if isinstance(command, str):
-        command = shlex.split(command)
-
-    if len(command) == 0:
-        raise CaseExecutionError
+    """Run the command and measure it.
 
-    with gnu.GnuTimeWrapper(enabled=gnu_time) as gw:
-        if shutil.which(command[0]) is None:
-            raise CaseExecutionError
+    Args:
+        command: The command
+        env: The additional environment variables. Ignored if ``command`` is a PreparedCommand.
+        stdin: The standard input
+        timeout: The timeout in seconds. The command is killed after it.
+        gnu_time: Measure the memory usage with GNU time. The command runs in a new session then, so subprocess spawns it with vfork(2) instead of posix_spawn(3).
+        output_limit: The output limit in bytes. The command is killed as soon as it exceeds the limit.
+        memory_limit: Limit the address space of the command to megabytes by the kernel
+        cpu_time_limit: Limit the CPU time of the command to seconds by the kernel
 
-        command = gw.get_command(command)
-        begin = time.perf_counter()
+    Returns:
+        OjExecInfo: The result. ``answer`` and ``returncode`` are None if it timed out.
+    """
+    if not isinstance(command, PreparedCommand):
+        command = PreparedCommand.prepare(command, env=env)
+    env = command.env
 
+    with gnu.GnuTimeWrapper(enabled=gnu_time) as gw:
         # We need kill processes called from the "time" command using process groups. Without this, orphans spawn. see https://github.com/kmyk/online-judge-tools/issues/640
         start_new_session = gw.gnu_time is not None
+        executable = None if start_new_session else command.executable
+        limited = limit_command(
+            command.command, memory=memory_limit, cpu_time=cpu_time_limit
+        )
+        is_limited = limited is not command.command
+        if is_limited:
+            # The shell which sets the limits finds the executable.
+            executable = None
+        command = gw.get_command(limited)
+        begin = time.perf_counter()
 
+        output_exceeded = False
         try:
-            if env is not None:
-                env = os.environ | env
-            proc = subprocess.run(
-                command,
-                env=env,
-                timeout=timeout,
-                stdin=stdin,
-                stdout=subprocess.PIPE,
-                stderr=sys.stderr,
-                encoding="utf-8",
-                start_new_session=start_new_session,
-                check=False,
-            )
-            answer = proc.stdout
-            returncode = proc.returncode
+            if output_limit is None:
+                proc = subprocess.run(
+                    command,
+                    executable=executable,
+                    env=env,
+                    timeout=timeout,
+                    stdin=stdin,
+                    stdout=subprocess.PIPE,
+                    stderr=_stderr(),
+                    close_fds=_CLOSE_FDS,
+                    encoding="utf-8",
+                    start_new_session=start_new_session,
+                    check=False,
+                )
+                answer = proc.stdout
+                returncode = proc.returncode
+            else:
+                answer, returncode, output_exceeded = _run_with_output_limit(
+                    command,
+                    executable=executable,
+                    env=env,
+                    stdin=stdin,
+                    timeout=timeout,
+                    start_new_session=start_new_session,
+                    output_limit=output_limit,
+                )
+            if (
+                cpu_time_limit is not None
+                and is_limited
+                and _is_cpu_time_exceeded(returncode)
+            ):
+                answer = None
+                returncode = None
         except subprocess.TimeoutExpired:
             answer = None
             returncode = None
@@ -102,6 +312,7 @@ def measure_command(
             elapsed=end - begin,
             memory=gw.get_memory(),
             returncode=returncode,
+            output_exceeded=output_exceeded,
         )
 
 
@@ -119,6 +330,20 @@ class OjTestArguments:
     error: float | None
     env: dict[str, str] | None = None
     deadline: float = float("inf")
+    output_limit: int | None = None
+    """The output limit in bytes.
+
+    The default is based on the size of the expected output.
+    There is no default limit for a problem with a checker,
+    because the expected output does not bound the size of the correct output.
+    """
+    enforce_limits: bool = False
+    """Let the kernel stop the test cases which exceed MLE or TLE. See ``limit_command``."""
+    keep_answers: pathlib.Path | None = None
+    """The directory to which the whole output of each test case is saved for debugging.
+
+    Otherwise, the output is dropped once the test case is judged.
+    """
 
 
 @dataclass
@@ -191,7 +416,7 @@ class OjTestResult:
     """max memory [MB]
     """
 
-    testcases: list[OjTestcaseResult]
+    testcases: TestcaseResults
 
 
 def _try_parse_float(value: str) -> float | None:
@@ -292,9 +517,12 @@ def determine_status(
     memory: float | None,
     mle: float | None,
     match_result: bool | None,
+    output_exceeded: bool = False,
 ) -> JudgeStatus:
     if exitcode is None:
         return JudgeStatus.TLE
+    if output_exceeded:
+        return JudgeStatus.OLE
     if memory is not None and mle is not None and memory > mle:
         return JudgeStatus.MLE
     if exitcode != 0:
@@ -310,6 +538,8 @@ def single_case(
     test_output_path: pathlib.Path,
     *,
     args: OjTestArguments,
+    prepared: PreparedCommand | None = None,
+    answer_dir: pathlib.Path | None = None,
 ) -> OjTestcaseResult:
     try:
         logger.info("%s: start", test_name)
@@ -317,18 +547,27 @@ def single_case(
         # run the binary
         with test_input_path.open("rb") as infp:
             info = measure_command(
-                args.command,
+                prepared or args.command,
                 env=args.env,
                 stdin=infp,
                 timeout=args.tle,
                 gnu_time=True,
+                output_limit=(
+                    args.output_limit
+                    if args.output_limit is not None or args.problem.checker
+                    else default_output_limit(test_output_path)
+                ),
+                memory_limit=args.mle if args.enforce_limits else None,
+                cpu_time_limit=args.tle if args.enforce_limits else None,
             )
             answer = info.answer or ""
             elapsed: float = info.elapsed
             memory: float | None = info.memory
 
         match_result = (
-            special_judge(
+            None
+            if info.output_exceeded
+            else special_judge(
                 str(args.problem.checker),
                 answer,
                 input_path=test_input_path,
@@ -343,6 +582,7 @@ def single_case(
             memory=memory,
             mle=args.mle,
             match_result=match_result,
+            output_exceeded=info.output_exceeded,
         )
 
         result = OjTestcaseResult(
@@ -373,6 +613,10 @@ def single_case(
         )
     else:
         result.log()
+        if answer_dir is not None:
+            (answer_dir / f"{test_name}.out").write_text(
+                answer, encoding="utf-8", newline=""
+            )
         return result
 
 
@@ -403,22 +647,20 @@ class _StatusCounter(Counter[JudgeStatus]):
         )
 
 
-def summarize(history: list[OjTestcaseResult]):
-    elapsed: float = 0.0
+def summarize(history: TestcaseResults):
+    elapsed: float = sum(history.elapsed)
     slowest: float = -1.0
     slowest_name: str | None = None
     heaviest: float = -1.0
     heaviest_name: str | None = None
-    counter = _StatusCounter()
-    for result in history:
-        counter[result.status] += 1
-        elapsed += result.elapsed
-        if slowest < result.elapsed:
-            slowest = result.elapsed
-            slowest_name = result.name
-        if result.memory is not None and heaviest < result.memory:
-            heaviest = result.memory
-            heaviest_name = result.name
+    counter = _StatusCounter(history.statuses())
+    if history.elapsed:
+        slowest = max(history.elapsed)
+        slowest_name = history.names[history.elapsed.index(slowest)]
+    for name, memory in zip(history.names, history.memories(), strict=True):
+        if memory is not None and heaviest < memory:
+            heaviest = memory
+            heaviest_name = name
 
     # print the summary
     if slowest_name is not None:
@@ -455,13 +697,37 @@ def _run(args: OjTestArguments) -> OjTestResult:
 
     tests = list(args.problem.iter_system_cases())
 
+    # The command is resolved once for all test cases.
+    # If it fails, each test case reports the error.
+    prepared: PreparedCommand | None = None
+    with contextlib.suppress(CaseExecutionError):
+        prepared = PreparedCommand.prepare(args.command, env=args.env)
+
+    answer_dir: pathlib.Path | None = None
+    if args.keep_answers is not None:
+        args.keep_answers.mkdir(parents=True, exist_ok=True)
+        answer_dir = pathlib.Path(
+            tempfile.mkdtemp(prefix="answers-", dir=args.keep_answers)
+        )
+        logger.info("The answers are saved to %s", answer_dir)
+
     # run tests
-    history: list[OjTestcaseResult] = []
+    # The results are compacted as soon as they are judged.
+    history = TestcaseResults()
     for t in tests:
         if time.perf_counter() > args.deadline:
             raise VerifcationTimeoutError
 
-        history.append(single_case(t.name, t.input_path, t.output_path, args=args))
+        history.append(
+            single_case(
+                t.name,
+                t.input_path,
+                t.output_path,
+                args=args,
+                prepared=prepared,
+                answer_dir=answer_dir,
+            )
+        )
 
     return summarize(history)
 
@@ -475,6 +741,8 @@ def main(
     mle: float | None,
     error: float | None,
     deadline: float = float("inf"),
+    enforce_limits: bool = False,
+    keep_answers: pathlib.Path | None = None,
 ) -> VerificationResult:
     args = OjTestArguments(
         command=command,
@@ -484,6 +752,8 @@ def main(
         mle=mle,
         error=error,
         deadline=deadline,
+        enforce_limits=enforce_limits,
+        keep_answers=keep_answers,
     )
     result = _run(args)
     return VerificationResult(
@@ -491,13 +761,5 @@ def main(
         elapsed=result.elapsed,
         slowest=result.slowest,
         heaviest=result.heaviest,
-        testcases=[
-            TestcaseResult(
-                name=case.name,
-                elapsed=case.elapsed,
-                memory=case.memory,
-                status=case.status,
-            )
-            for case in result.testcases
-        ],
+        testcases=result.testcases,
     )
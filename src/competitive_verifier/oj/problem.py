@@ -6,6 +6,7 @@ import posixpath
 import re
 import subprocess
 import sys
+import threading
 import urllib.parse
 import zipfile
 from abc import abstractmethod
@@ -149,8 +150,14 @@ class LibraryCheckerProblem(Problem):
         return None
 
     _is_repository_updated: ClassVar[set[pathlib.Path]] = set()
+    _repository_lock: ClassVar[threading.Lock] = threading.Lock()
 
     def update_cloned_repository(self) -> None:
+        # Problems may be downloaded concurrently in background.
+        with self._repository_lock:
+            self._update_cloned_repository()
+
+    def _update_cloned_repository(self) -> None:
         if self.repo_path in self._is_repository_updated:
             return
 
@@ -1,5 +1,6 @@
 import fnmatch
 import hashlib
+import json
 import os
 import pathlib
 import traceback
@@ -19,6 +20,7 @@ from competitive_verifier.models import (
     AddtionalSource,
     CommandVerification,
     ConstVerification,
+    DocumentOutputMode,
     LocalProblemVerification,
     ProblemVerification,
     ResultStatus,
@@ -28,7 +30,7 @@ from competitive_verifier.models import (
 )
 from competitive_verifier.util import resolve_referenced_path
 
-from .languages import LanguageEnvironment, VerificationConfig
+from .languages import Language, LanguageEnvironment, VerificationConfig
 from .problem import problem_from_url
 
 logger = getLogger(__name__)
@@ -38,6 +40,36 @@ def _get_bundled_dir() -> pathlib.Path:
     return config.get_config_dir() / "bundled"
 
 
+def _get_bundled_digests_path() -> pathlib.Path:
+    return config.get_cache_dir() / "bundled.json"
+
+
+def _bundle_digest(
+    paths: set[pathlib.Path],
+    *,
+    language: Language,
+    basedir: pathlib.Path,
+) -> str:
+    """Digest of the contents of the file and its transitive dependencies.
+
+    The language configuration such as the bundle command and the base directory
+    which the bundle command is resolved with are also digested.
+    """
+    h = hashlib.sha256()
+    h.update(type(language).__qualname__.encode("utf-8"))
+    h.update(b"\0")
+    h.update(language.model_dump_json().encode("utf-8"))
+    h.update(b"\0")
+    h.update(basedir.as_posix().encode("utf-8"))
+    h.update(b"\0")
+    for p in sorted(paths):
+        h.update(p.as_posix().encode("utf-8"))
+        h.update(b"\0")
+        h.update(p.read_bytes())
+        h.update(b"\0")
+    return h.hexdigest()
+
+
 def _write_bundled(content: bytes, *, path: pathlib.Path) -> pathlib.Path:
     """Write bundled code.
 
@@ -57,6 +89,7 @@ class OjResolver:
     exclude: list[str]
     config: VerificationConfig
     _match_exclude_cache: dict[pathlib.Path, bool]
+    _bundled_digests: dict[str, str]
 
     def __init__(
         self,
@@ -75,6 +108,7 @@ class OjResolver:
         self.exclude = list(map(_remove_slash, exclude))
         self.config = config
         self._match_exclude_cache = {}
+        self._bundled_digests = {}
 
     def _match_exclude2(self, paths: list[pathlib.Path]) -> bool:
         if not paths:
@@ -268,8 +302,67 @@ class OjResolver:
             logger.info("UNITTEST envvar %s=%s is truthy.", unit_test_envvar, var)
             yield ConstVerification(status=ResultStatus.SUCCESS)
 
+    def _load_bundled_digests(self) -> None:
+        try:
+            digests = json.loads(_get_bundled_digests_path().read_bytes())
+        except (OSError, ValueError):
+            digests = {}
+        self._bundled_digests = digests if isinstance(digests, dict) else {}
+
+    def _save_bundled_digests(self) -> None:
+        digests_path = _get_bundled_digests_path()
+        digests_path.parent.mkdir(parents=True, exist_ok=True)
+        digests_path.write_text(
+            json.dumps(self._bundled_digests, sort_keys=True), encoding="utf-8"
+        )
+
+    def _bundle(
+        self,
+        language: Language,
+        path: pathlib.Path,
+        *,
+        basedir: pathlib.Path,
+        depends_on: set[pathlib.Path],
+    ) -> list[AddtionalSource]:
+        key = path.as_posix()
+        dest_path = _get_bundled_dir() / path
+        try:
+            digest = _bundle_digest(depends_on, language=language, basedir=basedir)
+        except OSError:
+            digest = None
+        if (
+            digest is not None
+            and self._bundled_digests.get(key) == digest
+            and dest_path.exists()
+        ):
+            logger.debug("bundle is up to date: %s", dest_path.as_posix())
+            return [AddtionalSource(name="bundled", path=dest_path)]
+
+        self._bundled_digests.pop(key, None)
+        try:
+            bundled_code = language.bundle(path, basedir=basedir)
+        except Exception:  # noqa: BLE001
+            dest_path = _write_bundled(traceback.format_exc().encode(), path=path)
+            return [AddtionalSource(name="bundle error", path=dest_path)]
+
+        if not bundled_code:
+            return []
+        dest_path = _write_bundled(bundled_code, path=path)
+        if digest is not None:
+            self._bundled_digests[key] = digest
+        return [AddtionalSource(name="bundled", path=dest_path)]
+
     def resolve(self, *, bundle: bool) -> VerificationInput:
+        try:
+            return self._resolve(bundle=bundle)
+        finally:
+            # Some languages are registered with multiple suffixes
+            for language in {id(v): v for v in self._lang_dict.values()}.values():
+                language.close()
+
+    def _resolve(self, *, bundle: bool) -> VerificationInput:
         files: dict[pathlib.Path, VerificationFile] = {}
+        languages: dict[pathlib.Path, Language] = {}
         basedir = pathlib.Path.cwd()
 
         for path in git.ls_files(*self.include):
@@ -284,23 +377,6 @@ class OjResolver:
             deps = set(git.ls_files(*language.list_dependencies(path, basedir=basedir)))
             attr = language.list_attributes(path, basedir=basedir)
 
-            additonal_sources: list[AddtionalSource] = []
-            if bundle:
-                try:
-                    bundled_code = language.bundle(path, basedir=basedir)
-                    if bundled_code:
-                        dest_path = _write_bundled(bundled_code, path=path)
-                        additonal_sources.append(
-                            AddtionalSource(name="bundled", path=dest_path)
-                        )
-                except Exception:  # noqa: BLE001
-                    dest_path = _write_bundled(
-                        traceback.format_exc().encode(), path=path
-                    )
-                    additonal_sources.append(
-                        AddtionalSource(name="bundle error", path=dest_path)
-                    )
-
             verifications = list(
                 chain.from_iterable(
                     self.env_to_verifications(vs, attr=attr, path=path, basedir=basedir)
@@ -311,9 +387,27 @@ class OjResolver:
                 dependencies=deps,
                 verification=verifications,
                 document_attributes=attr,
-                additonal_sources=additonal_sources,
             )
-        return VerificationInput(files=files)
+            languages[path] = language
+
+        resolved = VerificationInput(files=files)
+        if bundle:
+            self._load_bundled_digests()
+            for path, file in resolved.files.items():
+                # The bundled code is only embedded in documents
+                if file.display == DocumentOutputMode.never:
+                    continue
+                file.additonal_sources = self._bundle(
+                    languages[path],
+                    path,
+                    basedir=basedir,
+                    depends_on={
+                        *resolved.get_transitive_depends_on(path),
+                        *file.dependencies,
+                    },
+                )
+            self._save_bundled_digests()
+        return resolved
 
 
 class OjResolve(IncludeExcludeArguments, VerboseArguments):
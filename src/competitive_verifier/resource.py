@@ -1,3 +1,4 @@
+import math
 import sys
 from logging import getLogger
 
@@ -19,3 +20,52 @@ def try_ulimit_stack() -> None:  # pragma: no cover
         ulimit_stack()
     except Exception:  # noqa: BLE001
         logger.warning("failed to increase the stack size[ulimit]")
+
+
+def limit_command(
+    command: list[str],
+    *,
+    memory: float | None,
+    cpu_time: float | None,
+) -> list[str]:
+    """Wrap the command with ``ulimit`` to limit the resources of it.
+
+    The kernel stops the command as soon as it exceeds the limits,
+    instead of detecting them after the command exits.
+    The limits are set by the shell, because ``preexec_fn`` is not safe with threads
+    and makes ``subprocess`` spawn the command with fork(2) instead of vfork(2).
+
+    Args:
+        command (list[str]): The command
+        memory (float | None): The limit of the address space (``RLIMIT_AS``) in megabytes
+        cpu_time (float | None): The limit of the CPU time (``RLIMIT_CPU``) in seconds
+
+    Returns:
+        list[str]: The wrapped command, or ``command`` itself if there is nothing to limit
+    """
+    if sys.platform == "win32" or (memory is None and cpu_time is None):
+        return command
+
+    import resource  # noqa: PLC0415
+
+    limits: list[str] = []
+
+    def add_limit(option: str, kind: int, soft: int, hard: int, unit: int) -> None:
+        _, current_hard = resource.getrlimit(kind)
+        if current_hard != resource.RLIM_INFINITY:
+            soft = min(soft, current_hard // unit)
+            hard = min(hard, current_hard // unit)
+        # The soft limit first, so that it never exceeds the hard limit.
+        limits.append(f"ulimit -S -{option} {soft}")
+        limits.append(f"ulimit -H -{option} {hard}")
+
+    if memory is not None:
+        # ulimit -v is in kilobytes.
+        size = int(memory * 1024)
+        add_limit("v", resource.RLIMIT_AS, size, size, 1024)
+    if cpu_time is not None:
+        # SIGXCPU is sent at the soft limit, and SIGKILL at the hard limit.
+        seconds = math.ceil(cpu_time)
+        add_limit("t", resource.RLIMIT_CPU, seconds, seconds + 1, 1)
+
+    return ["/bin/sh", "-c", " && ".join([*limits, 'exec "$@"']), "sh", *command]
@@ -1,6 +1,8 @@
+import functools
+import gc
 import pathlib
-
-from charset_normalizer import from_bytes
+from collections.abc import Generator, Iterable
+from contextlib import contextmanager
 
 
 def to_relative(path: pathlib.Path) -> pathlib.Path | None:
@@ -10,6 +12,51 @@ def to_relative(path: pathlib.Path) -> pathlib.Path | None:
         return None
 
 
+def to_relative_all(
+    paths: Iterable[pathlib.Path],
+) -> dict[pathlib.Path, pathlib.Path | None]:
+    """``to_relative`` for many paths.
+
+    The current directory and each parent directory are resolved only once.
+    """
+    cwd = pathlib.Path.cwd().resolve()
+    resolved_dirs: dict[pathlib.Path, pathlib.Path] = {}
+    result: dict[pathlib.Path, pathlib.Path | None] = {}
+    for path in paths:
+        if path in result:
+            continue
+        if path.name in {"", ".."}:
+            resolved = path.resolve()
+        else:
+            parent = resolved_dirs.get(path.parent)
+            if parent is None:
+                parent = resolved_dirs[path.parent] = path.parent.resolve()
+            resolved = parent / path.name
+            if resolved.is_symlink():
+                resolved = resolved.resolve()
+        try:
+            result[path] = resolved.relative_to(cwd)
+        except ValueError:
+            result[path] = None
+    return result
+
+
+@contextmanager
+def gc_paused() -> Generator[None, None, None]:
+    """Pause the cyclic garbage collector.
+
+    Loading a large JSON allocates many objects without garbage,
+    and the collections triggered by the allocations take as long as the loading.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
 def _resolve_referenced_path_inner(
     target_path: str,
     *,
@@ -50,8 +97,28 @@ def resolve_referenced_path(
 
 
 def read_text_normalized(path: pathlib.Path) -> str:
+    """Read and decode the file. The result is cached until the file is modified."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return normalize_bytes_text(path.read_bytes())
+    return _read_text_normalized(path.absolute(), stat.st_mtime_ns, stat.st_size)
+
+
+@functools.lru_cache(maxsize=1024)
+def _read_text_normalized(
+    path: pathlib.Path,
+    mtime_ns: int,  # noqa: ARG001 # a part of the cache key
+    size: int,  # noqa: ARG001 # a part of the cache key
+) -> str:
     return normalize_bytes_text(path.read_bytes())
 
 
 def normalize_bytes_text(b: bytes) -> str:
-    return str(from_bytes(b).best())
+    try:
+        # Most source files are UTF-8 or ASCII. Detecting the charset is much slower.
+        return b.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        from charset_normalizer import from_bytes  # noqa: PLC0415
+
+        return str(from_bytes(b).best())
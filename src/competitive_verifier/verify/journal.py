@@ -0,0 +1,130 @@
+import hashlib
+import os
+import pathlib
+from logging import getLogger
+
+from pydantic import BaseModel, ValidationError
+
+from competitive_verifier.log import GitHubMessageParams
+from competitive_verifier.models import FileResult, ForcePosixPath
+
+logger = getLogger(__name__)
+
+JOURNAL_VERSION = 1
+
+
+class _JournalHeader(BaseModel):
+    version: int = JOURNAL_VERSION
+    key: str
+
+
+class FileResultEntry(BaseModel):
+    path: ForcePosixPath
+    elapsed: float
+    result: FileResult
+
+
+def journal_key(*parts: str) -> str:
+    """Digest of the values which identify a verification run."""
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+class ResultJournal:
+    """JSON Lines journal of ``FileResult`` written while ``verify`` is running.
+
+    The first line is a header which identifies the verification input.
+    Each following line is a result of a verification file.
+    """
+
+    path: pathlib.Path
+    resume: bool
+    resumed: dict[pathlib.Path, FileResult]
+    resumed_seconds: float
+
+    def __init__(self, path: pathlib.Path, *, resume: bool) -> None:
+        self.path = path
+        self.resume = resume
+        self.resumed = {}
+        self.resumed_seconds = 0.0
+
+    def start(self, key: str) -> dict[pathlib.Path, FileResult]:
+        """Start journaling.
+
+        Args:
+            key (str): The identifier of the verification input
+
+        Returns:
+            dict[pathlib.Path, FileResult]: Results loaded from the journal
+        """
+        if self.resume and self._load(key):
+            logger.info(
+                "Resume from journal: %s, %d files",
+                self.path.as_posix(),
+                len(self.resumed),
+            )
+            return self.resumed
+
+        self.resumed = {}
+        self.resumed_seconds = 0.0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("w", encoding="utf-8") as fp:
+            fp.write(_JournalHeader(key=key).model_dump_json())
+            fp.write("\n")
+        return self.resumed
+
+    def _load(self, key: str) -> bool:
+        if not self.path.exists():
+            logger.info("Journal is not found: %s", self.path.as_posix())
+            return False
+
+        with self.path.open("r", encoding="utf-8") as fp:
+            lines = fp.read().splitlines()
+
+        try:
+            header = _JournalHeader.model_validate_json(lines[0] if lines else "")
+        except ValidationError:
+            header = None
+        if header is None or header.version != JOURNAL_VERSION or header.key != key:
+            logger.warning(
+                "The journal doesn't match the current verification. Ignored: %s",
+                self.path.as_posix(),
+                extra={"github": GitHubMessageParams(file=self.path)},
+            )
+            return False
+
+        resumed: dict[pathlib.Path, FileResult] = {}
+        seconds = 0.0
+        for i, line in enumerate(lines[1:], start=2):
+            try:
+                entry = FileResultEntry.model_validate_json(line)
+            except ValidationError:
+                # The last line may be broken if the process was killed while writing.
+                logger.warning(
+                    "Broken journal line is ignored: %s: line %d",
+                    self.path.as_posix(),
+                    i,
+                )
+                continue
+            resumed[entry.path] = entry.result
+            seconds += entry.elapsed
+
+        self.resumed = resumed
+        self.resumed_seconds = seconds
+        return True
+
+    def append(self, path: pathlib.Path, result: FileResult, *, elapsed: float) -> None:
+        line = FileResultEntry(
+            path=path, elapsed=elapsed, result=result
+        ).model_dump_json(exclude_none=True)
+        with self.path.open("a", encoding="utf-8") as fp:
+            fp.write(line)
+            fp.write("\n")
+            fp.flush()
+            os.fsync(fp.fileno())
+
+    def remove(self) -> None:
+        self.path.unlink(missing_ok=True)
@@ -17,7 +17,9 @@ from competitive_verifier.arg import (
 from competitive_verifier.log import GitHubMessageParams
 from competitive_verifier.models import VerificationInput, VerifyCommandResult
 
+from .journal import ResultJournal
 from .verifier import SplitState, Verifier
+from .work_queue import DirectoryWorkQueue
 
 logger = getLogger(__name__)
 
@@ -35,6 +37,8 @@ class Verify(
     timeout: float = math.inf
     default_tle: float | None = None
     default_mle: float | None = None
+    enforce_limits: bool = False
+    keep_answers: pathlib.Path | None = None
 
     prev_result: pathlib.Path | None = None
 
@@ -42,9 +46,18 @@ class Verify(
 
     output: pathlib.Path | None = None
 
+    journal: pathlib.Path | None = None
+    resume: bool = False
+
     split: int | None = None
     split_index: int | None = None
 
+    queue: pathlib.Path | None = None
+    worker: bool = False
+
+    lookahead: int = 0
+    prefetch: int = 0
+
     def read_prev_result(self) -> VerifyCommandResult | None:
         if not self.prev_result:
             return None
@@ -94,6 +107,27 @@ class Verify(
             case _:
                 return None
 
+    @cached_property
+    def work_queue(self) -> DirectoryWorkQueue | None:
+        if self.queue is None:
+            if self.worker:
+                raise ValueError("--worker argument requires --queue argument.")
+            return None
+        if self.split_state is not None:
+            raise ValueError("--queue argument cannot be used with --split.")
+        return DirectoryWorkQueue(self.queue)
+
+    @cached_property
+    def result_journal(self) -> ResultJournal | None:
+        path = self.journal
+        if path is None and self.output:
+            path = self.output.with_name(self.output.name + ".journal.jsonl")
+        if path is None:
+            if self.resume:
+                raise ValueError("--resume argument requires --journal or --output.")
+            return None
+        return ResultJournal(path, resume=self.resume)
+
     @classmethod
     def add_parser(cls, parser: ArgumentParser):
         super().add_parser(parser)
@@ -117,6 +151,19 @@ class Verify(
             default=None,
             help="Threshold memory usage (MB) to be MLE",
         )
+        parser.add_argument(
+            "--enforce-limits",
+            action="store_true",
+            help="Let the kernel stop test cases which exceed the MLE or the TLE "
+            "by setting RLIMIT_AS and RLIMIT_CPU. "
+            "Note that RLIMIT_AS limits the virtual memory, which is larger than the memory usage.",
+        )
+        parser.add_argument(
+            "--keep-answers",
+            type=pathlib.Path,
+            required=False,
+            help="The directory to which the whole output of each test case is saved for debugging",
+        )
         parser.add_argument(
             "--prev-result",
             type=pathlib.Path,
@@ -137,6 +184,17 @@ class Verify(
             required=False,
             help="The output file for which verifier saves the result json.",
         )
+        parser.add_argument(
+            "--journal",
+            type=pathlib.Path,
+            required=False,
+            help="The journal file to which each result of files is appended. default: {output}.journal.jsonl",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Resume the interrupted verification from the journal",
+        )
         parallel_group = parser.add_argument_group("parallel")
         parallel_group.add_argument(
             "--split",
@@ -150,11 +208,37 @@ class Verify(
             help="Parallel job index",
             required=False,
         )
+        parallel_group.add_argument(
+            "--queue",
+            type=pathlib.Path,
+            help="Shared directory of the work queue. The coordinator publishes files to verify and workers pull them dynamically",
+            required=False,
+        )
+        parallel_group.add_argument(
+            "--worker",
+            action="store_true",
+            help="Run as a worker which verifies files pulled from --queue",
+        )
+        parallel_group.add_argument(
+            "--lookahead",
+            type=int,
+            default=0,
+            help="The number of upcoming files whose test cases are downloaded and compiled in the background while the current file is tested",
+        )
+        parallel_group.add_argument(
+            "--prefetch",
+            type=int,
+            default=0,
+            help="The number of upcoming files whose test cases are downloaded in the background while the current file is tested",
+        )
 
     def _run(self) -> bool:
         logger.debug("arguments:%s", self)
         logger.info("verify_files_json=%s", self.verify_files_json)
         verifications = VerificationInput.parse_file_relative(self.verify_files_json)
+        queue = self.work_queue
+        if self.worker and queue:
+            return self._run_worker(verifications, queue)
         prev_result = self.read_prev_result()
 
         verifier = Verifier(
@@ -163,11 +247,22 @@ class Verify(
             timeout=self.timeout,
             default_tle=self.default_tle,
             default_mle=self.default_mle,
+            enforce_limits=self.enforce_limits,
+            keep_answers=self.keep_answers,
             prev_result=prev_result,
             split_state=self.split_state,
         )
-        result = verifier.verify(download=self.download)
+        journal = self.result_journal
+        result = verifier.verify(
+            download=self.download,
+            journal=journal,
+            queue=queue,
+            lookahead=self.lookahead,
+            prefetch=self.prefetch,
+        )
         self.write_result(result)
+        if journal:
+            journal.remove()
 
         is_success = result.is_success()
 
@@ -177,3 +272,28 @@ class Verify(
             logger.warning("not success!")
 
         return is_success or self.ignore_error
+
+    def _run_worker(
+        self,
+        verifications: VerificationInput,
+        queue: DirectoryWorkQueue,
+    ) -> bool:
+        verifier = Verifier(
+            verifications,
+            use_git_timestamp=github.env.is_in_github_actions(),
+            timeout=self.timeout,
+            default_tle=self.default_tle,
+            default_mle=self.default_mle,
+            enforce_limits=self.enforce_limits,
+            keep_answers=self.keep_answers,
+            prev_result=None,
+            split_state=None,
+        )
+        is_success = verifier.work(queue, download=self.download)
+
+        if is_success:
+            logger.info("success!")
+        else:
+            logger.warning("not success!")
+
+        return is_success or self.ignore_error
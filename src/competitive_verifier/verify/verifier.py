@@ -1,15 +1,27 @@
 import datetime
+import itertools
 import pathlib
+import shlex
 import time
 from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import ExitStack
+from dataclasses import dataclass, field
 from functools import cached_property
 from logging import getLogger
 
 from competitive_verifier import git, log
+from competitive_verifier.download import DownloadPrefetcher
 from competitive_verifier.download import download_files as run_download
 from competitive_verifier.models import (
+    CommandVerification,
     FileResult,
+    LocalProblemVerification,
+    ProblemVerification,
     ResultStatus,
+    ShellCommand,
+    ShellCommandLike,
     VerifcationTimeoutError,
     Verification,
     VerificationFile,
@@ -18,7 +30,9 @@ from competitive_verifier.models import (
     VerifyCommandResult,
 )
 from competitive_verifier.resource import try_ulimit_stack
+from competitive_verifier.verify.journal import ResultJournal, journal_key
 from competitive_verifier.verify.split_state import SplitState
+from competitive_verifier.verify.work_queue import DirectoryWorkQueue
 
 logger = getLogger(__name__)
 
@@ -27,6 +41,61 @@ def _now() -> datetime.datetime:
     return datetime.datetime.now(datetime.timezone.utc).astimezone()
 
 
+@dataclass
+class _PreparedFile:
+    """Result of the download and compile stage of a verification file."""
+
+    error: Exception | None = None
+    compiled: list[bool] = field(default_factory=list[bool])
+
+
+def _shared_output_keys(command: ShellCommandLike | None) -> set[str]:
+    """Keys of the output directories shared by files of the same language.
+
+    They are the class directory of javac and the pycache prefix of Python.
+    """
+    if command is None:
+        return set()
+    c = ShellCommand.parse_command_like(command)
+    keys = set[str]()
+    args = shlex.split(c.command) if isinstance(c.command, str) else c.command
+    # javac may be one of the commands in a shell script
+    javac = False
+    for arg, value in itertools.pairwise(args):
+        if pathlib.Path(arg).stem == "javac":
+            javac = True
+        elif arg in {"&&", "||", "|", ";"} or arg.endswith(";"):
+            javac = False
+        elif javac and arg == "-d":
+            keys.add(value)
+    if c.env and (prefix := c.env.get("PYTHONPYCACHEPREFIX")):
+        keys.add(prefix)
+    return keys
+
+
+def _verification_keys(ve: Verification) -> set[str]:
+    """Keys of the directories to which ``ve`` writes."""
+    keys = set[str]()
+    if isinstance(ve, ProblemVerification):
+        keys.add(ve.problem)
+    elif isinstance(ve, (CommandVerification, LocalProblemVerification)) and ve.tempdir:
+        keys.add(ve.tempdir.as_posix())
+    if isinstance(
+        ve, (CommandVerification, ProblemVerification, LocalProblemVerification)
+    ):
+        keys |= _shared_output_keys(ve.compile)
+        keys |= _shared_output_keys(ve.command)
+    return keys
+
+
+def _working_keys(f: VerificationFile) -> set[str]:
+    """Keys of the directories to which verifications of ``f`` write."""
+    keys = set[str]()
+    for ve in f.verification_list:
+        keys |= _verification_keys(ve)
+    return keys
+
+
 class InputContainer(ABC):
     verifications: VerificationInput
     verification_time: datetime.datetime
@@ -121,6 +190,8 @@ class BaseVerifier(InputContainer):
     timeout: float
     default_tle: float | None
     default_mle: float | None
+    enforce_limits: bool
+    keep_answers: pathlib.Path | None
     split_state: SplitState | None
 
     _result: VerifyCommandResult | None
@@ -135,6 +206,8 @@ class BaseVerifier(InputContainer):
         prev_result: VerifyCommandResult | None,
         split_state: SplitState | None,
         verification_time: datetime.datetime | None = None,
+        enforce_limits: bool = False,
+        keep_answers: pathlib.Path | None = None,
     ) -> None:
         super().__init__(
             verifications=verifications,
@@ -146,6 +219,8 @@ class BaseVerifier(InputContainer):
         self.timeout = timeout
         self.default_tle = default_tle
         self.default_mle = default_mle
+        self.enforce_limits = enforce_limits
+        self.keep_answers = keep_answers
         self._result = None
 
     @property
@@ -161,14 +236,20 @@ class BaseVerifier(InputContainer):
         *,
         download: bool,
         deadline: float,
+        prepared: _PreparedFile | None = None,
+        prefetcher: DownloadPrefetcher | None = None,
     ) -> list[VerificationResult]:
         logger.debug("%r", f)
         verifications = list[VerificationResult]()
         try:
-            if time.perf_counter() > deadline:
-                raise VerifcationTimeoutError  # noqa: TRY301
-            if download:
-                run_download(f, check=True, group_log=False)
+            if prepared is not None:
+                if prepared.error is not None:
+                    raise prepared.error  # noqa: TRY301
+            else:
+                if time.perf_counter() > deadline:
+                    raise VerifcationTimeoutError  # noqa: TRY301
+                if download:
+                    self._download(f, prefetcher)
         except VerifcationTimeoutError:
             verifications.append(
                 self.create_command_result(ResultStatus.SKIPPED, time.perf_counter())
@@ -186,14 +267,20 @@ class BaseVerifier(InputContainer):
             )
             return verifications
 
-        for ve in f.verification_list:
+        for i, ve in enumerate(f.verification_list):
             logger.debug("command=%r", ve)
             prev_time = time.perf_counter()
             try:
                 if prev_time > deadline:
                     raise VerifcationTimeoutError  # noqa: TRY301
 
-                rs, error_message = self.run_verification(ve, deadline=deadline)
+                rs, error_message = self.run_verification(
+                    ve,
+                    deadline=deadline,
+                    compiled=prepared.compiled[i]
+                    if prepared is not None and i < len(prepared.compiled)
+                    else None,
+                )
                 if error_message:
                     logger.error(
                         "%s: %s, verification=%s",
@@ -230,7 +317,274 @@ class BaseVerifier(InputContainer):
                 )
         return verifications
 
-    def verify(self, *, download: bool = True) -> VerifyCommandResult:
+    def _input_key(self) -> str:
+        return journal_key(
+            self.verifications.model_dump_json(),
+            str(self.split_state),
+        )
+
+    @staticmethod
+    def _download(
+        f: VerificationFile,
+        prefetcher: DownloadPrefetcher | None,
+    ) -> None:
+        if prefetcher is None:
+            run_download(f, check=True, group_log=False)
+        else:
+            prefetcher.download(f, check=True)
+
+    def _prepare_file(
+        self,
+        p: pathlib.Path,
+        f: VerificationFile,
+        *,
+        download: bool,
+        deadline: float,
+        prefetcher: DownloadPrefetcher | None = None,
+    ) -> _PreparedFile:
+        """Download test cases and compile in advance of running the tests."""
+        try:
+            if time.perf_counter() > deadline:
+                raise VerifcationTimeoutError  # noqa: TRY301
+            if download:
+                self._download(f, prefetcher)
+        except Exception as e:  # noqa: BLE001
+            return _PreparedFile(error=e)
+
+        compiled = list[bool]()
+        written = set[str]()
+        for ve in f.verification_list:
+            if time.perf_counter() > deadline:
+                break
+            # Environments of a file may share the output, e.g. {tempdir}/a.out of g++ and clang++.
+            # Such verifications are compiled just before they are tested.
+            keys = _verification_keys(ve)
+            if keys & written:
+                break
+            written |= keys
+            try:
+                compiled.append(ve.run_compile_command())
+            except Exception:
+                logger.exception(
+                    "Failed to compile: %s, %r",
+                    p,
+                    ve,
+                    extra={"github": log.GitHubMessageParams()},
+                )
+                compiled.append(False)
+        return _PreparedFile(compiled=compiled)
+
+    def _verify_file(
+        self,
+        p: pathlib.Path,
+        f: VerificationFile,
+        *,
+        download: bool,
+        deadline: float,
+        prepared: _PreparedFile | None = None,
+        prefetcher: DownloadPrefetcher | None = None,
+    ) -> FileResult:
+        with log.group(f"Verify: {p.as_posix()}"):
+            return FileResult(
+                verifications=self._enumerate_verifications(
+                    p,
+                    f,
+                    download=download,
+                    deadline=deadline,
+                    prepared=prepared,
+                    prefetcher=prefetcher,
+                )
+            )
+
+    def _verify_files(
+        self,
+        files: dict[pathlib.Path, VerificationFile],
+        *,
+        download: bool,
+        deadline: float,
+        lookahead: int,
+        prefetch: int,
+        timed: bool,
+    ) -> Iterator[tuple[pathlib.Path, FileResult, float]]:
+        def _perf_counter() -> float:
+            return time.perf_counter() if timed else 0.0
+
+        items = list(files.items())
+        with ExitStack() as stack:
+            prefetcher = (
+                stack.enter_context(DownloadPrefetcher(max_workers=prefetch))
+                if download and prefetch > 0
+                else None
+            )
+            executor = (
+                stack.enter_context(ThreadPoolExecutor(max_workers=lookahead))
+                if lookahead > 0
+                else None
+            )
+            pending: dict[int, tuple[set[str], Future[_PreparedFile]]] = {}
+            next_index = 0
+            next_prefetch = 0
+            for current, (p, f) in enumerate(items):
+                if prefetcher is not None:
+                    # Download problems of upcoming files while the current file is tested.
+                    # At most ``prefetch`` files ahead of the current file are downloaded
+                    # whether or not their downloads have finished.
+                    next_prefetch = max(next_prefetch, current)
+                    while (
+                        next_prefetch < len(items)
+                        and next_prefetch <= current + prefetch
+                    ):
+                        prefetcher.prefetch(items[next_prefetch][1])
+                        next_prefetch += 1
+
+                # Download and compile upcoming files while the tests of the current file run.
+                # A file which shares a working directory with a pending file has to wait.
+                while (
+                    executor is not None
+                    and next_index < len(items)
+                    and next_index <= current + lookahead
+                ):
+                    keys = _working_keys(items[next_index][1])
+                    if next_index > current and any(
+                        keys & k for k, _ in pending.values()
+                    ):
+                        break
+                    pending[next_index] = (
+                        keys,
+                        executor.submit(
+                            self._prepare_file,
+                            *items[next_index],
+                            download=download,
+                            deadline=deadline,
+                            prefetcher=prefetcher,
+                        ),
+                    )
+                    next_index += 1
+
+                prev_time = _perf_counter()
+                file_result = self._verify_file(
+                    p,
+                    f,
+                    download=download,
+                    deadline=deadline,
+                    prepared=pending.pop(current)[1].result()
+                    if executor is not None
+                    else None,
+                    prefetcher=prefetcher,
+                )
+                yield p, file_result, _perf_counter() - prev_time
+
+    def _work(
+        self,
+        queue: DirectoryWorkQueue,
+        *,
+        download: bool,
+        deadline: float,
+    ) -> tuple[int, bool]:
+        """Verify files claimed from the work queue until no items remain.
+
+        Returns:
+            tuple[int, bool]: The number of verified files, and whether all of them succeeded and their results were pushed back
+        """
+        count = 0
+        is_success = True
+        while (item := queue.claim()) is not None:
+            index, p = item
+            prev_time = time.perf_counter()
+            f = self.verifications.files.get(p)
+            if f is None:
+                logger.error(
+                    "%s is not found in verify_files.json",
+                    p,
+                    extra={"github": log.GitHubMessageParams()},
+                )
+                file_result = FileResult(
+                    verifications=[
+                        self.create_command_result(ResultStatus.FAILURE, prev_time)
+                    ]
+                )
+            else:
+                file_result = self._verify_file(
+                    p, f, download=download, deadline=deadline
+                )
+            if not file_result.is_success(allow_skip=True):
+                is_success = False
+            if not queue.complete(
+                index, p, file_result, elapsed=time.perf_counter() - prev_time
+            ):
+                logger.warning(
+                    "The work queue was removed before the result was pushed back: %s",
+                    p,
+                    extra={"github": log.GitHubMessageParams()},
+                )
+                return count, False
+            count += 1
+        return count, is_success
+
+    def work(self, queue: DirectoryWorkQueue, *, download: bool = True) -> bool:
+        """Verify files claimed from the work queue until no items remain.
+
+        Returns:
+            bool: True if the queue was published, and all files verified by this worker succeeded and were pushed back
+        """
+        deadline = time.perf_counter() + self.timeout
+        if not queue.wait_published(self._input_key(), deadline=deadline):
+            logger.warning(
+                "The work queue was not published: %s",
+                queue.root.as_posix(),
+                extra={"github": log.GitHubMessageParams()},
+            )
+            return False
+        try_ulimit_stack()
+        count, is_success = self._work(queue, download=download, deadline=deadline)
+        logger.info("%d files are verified by this worker", count)
+        return is_success
+
+    def _verify_with_queue(
+        self,
+        queue: DirectoryWorkQueue,
+        files: dict[pathlib.Path, VerificationFile],
+        *,
+        download: bool,
+        deadline: float,
+    ) -> Iterator[tuple[pathlib.Path, FileResult, float]]:
+        queue.publish(self._input_key(), list(files))
+        try:
+            collected = set[pathlib.Path]()
+            while True:
+                # Also take over the items whose workers have died.
+                self._work(queue, download=download, deadline=deadline)
+                with log.group("Collect results from workers"):
+                    for entry in queue.iter_results(deadline=deadline):
+                        collected.add(entry.path)
+                        yield entry.path, entry.result, entry.elapsed
+                if queue.collected_all or time.perf_counter() > deadline:
+                    break
+            for p in files.keys() - collected:
+                logger.warning("Skip[Timeout]: %s", p)
+                yield (
+                    p,
+                    FileResult(
+                        verifications=[
+                            self.create_command_result(
+                                ResultStatus.SKIPPED, time.perf_counter()
+                            )
+                        ]
+                    ),
+                    0.0,
+                )
+        finally:
+            queue.finish()
+
+    def verify(
+        self,
+        *,
+        download: bool = True,
+        journal: ResultJournal | None = None,
+        queue: DirectoryWorkQueue | None = None,
+        lookahead: int = 0,
+        prefetch: int = 0,
+    ) -> VerifyCommandResult:
         start_time = time.perf_counter()
         deadline = start_time + self.timeout
 
@@ -252,20 +606,42 @@ class BaseVerifier(InputContainer):
             else {}
         )
 
+        resumed = journal.start(self._input_key()) if journal else {}
+
+        new_results = dict[pathlib.Path, FileResult]()
+        files = dict[pathlib.Path, VerificationFile]()
         for p, f in current_verification_files.items():
-            with log.group(f"Verify: {p.as_posix()}"):
-                file_results[p] = FileResult(
-                    verifications=self._enumerate_verifications(
-                        p,
-                        f,
-                        download=download,
-                        deadline=deadline,
-                    )
-                )
+            if (resumed_result := resumed.get(p)) is not None:
+                logger.info("Resumed: %s", p.as_posix())
+                new_results[p] = resumed_result
+            else:
+                files[p] = f
+
+        for p, file_result, elapsed in (
+            self._verify_files(
+                files,
+                download=download,
+                deadline=deadline,
+                lookahead=lookahead,
+                prefetch=prefetch,
+                timed=journal is not None,
+            )
+            if queue is None
+            else self._verify_with_queue(
+                queue, files, download=download, deadline=deadline
+            )
+        ):
+            new_results[p] = file_result
+            if journal:
+                journal.append(p, file_result, elapsed=elapsed)
+        for p in current_verification_files:
+            file_results[p] = new_results[p]
 
         sippable_file_results = self.skippable_results()
         self._result = VerifyCommandResult(
-            total_seconds=time.perf_counter() - start_time,
+            total_seconds=time.perf_counter()
+            - start_time
+            + (journal.resumed_seconds if journal else 0.0),
             files=file_results | sippable_file_results,
         )
         return self._result
@@ -275,13 +651,21 @@ class BaseVerifier(InputContainer):
         verification: Verification,
         *,
         deadline: float = float("inf"),
+        compiled: bool | None = None,
     ) -> tuple[ResultStatus | VerificationResult, str | None]:
         """Run verification.
 
+        Args:
+            verification: The verification
+            deadline: The deadline of ``time.perf_counter()``
+            compiled: The result of the compile command if it has already run
+
         Returns:
             tuple[ResultStatus, Optional[str]]: (Result, error_message)
         """
-        if not verification.run_compile_command():
+        if compiled is None:
+            compiled = verification.run_compile_command()
+        if not compiled:
             return ResultStatus.FAILURE, "Failed to compile"
 
         if time.perf_counter() > deadline:
@@ -334,6 +718,8 @@ class BaseVerifier(InputContainer):
 
 class Verifier(BaseVerifier):
     use_git_timestamp: bool
+    _mtimes: list[float | None]
+    _commit_times: dict[int, datetime.datetime]
 
     def __init__(
         self,
@@ -346,6 +732,8 @@ class Verifier(BaseVerifier):
         split_state: SplitState | None,
         verification_time: datetime.datetime | None = None,
         use_git_timestamp: bool,
+        enforce_limits: bool = False,
+        keep_answers: pathlib.Path | None = None,
     ) -> None:
         super().__init__(
             verifications=verifications,
@@ -355,16 +743,36 @@ class Verifier(BaseVerifier):
             timeout=timeout,
             default_tle=default_tle,
             default_mle=default_mle,
+            enforce_limits=enforce_limits,
+            keep_answers=keep_answers,
         )
         self.use_git_timestamp = use_git_timestamp
+        self._mtimes = [None] * len(verifications.files)
+        self._commit_times = {}
+
+    def _get_mtime(self, index: int) -> float:
+        mtime = self._mtimes[index]
+        if mtime is None:
+            path = self.verifications.path_of_index(index)
+            mtime = self._mtimes[index] = path.stat().st_mtime
+        return mtime
 
     def get_file_timestamp(self, path: pathlib.Path) -> datetime.datetime:
-        dependicies = self.verifications.transitive_depends_on[path]
+        bits = self.verifications.transitive_depends_on_bits(path)
 
         if self.use_git_timestamp:
-            return git.get_commit_time(dependicies)
+            # The files in a cycle share the dependencies.
+            commit_time = self._commit_times.get(bits)
+            if commit_time is None:
+                commit_time = self._commit_times[bits] = git.get_commit_time(
+                    self.verifications.paths_of_bits(bits)
+                )
+            return commit_time
 
-        timestamp = max(x.stat().st_mtime for x in dependicies)
+        # Libraries are shared by many files, so stat each of them once.
+        timestamp = max(
+            map(self._get_mtime, self.verifications.transitive_depends_on_indexes(path))
+        )
         system_local_timezone = _now().tzinfo
 
         # microsecond=0 is required because it's erased in git commit
@@ -0,0 +1,299 @@
+import contextlib
+import os
+import pathlib
+import shutil
+import threading
+import time
+import uuid
+from collections.abc import Iterator
+from logging import getLogger
+
+from pydantic import BaseModel, Field, ValidationError
+
+from competitive_verifier.models import FileResult, ForcePosixPath
+
+from .journal import FileResultEntry
+
+logger = getLogger(__name__)
+
+_QUEUE_FILE = "queue.json"
+_CLAIMS_DIR = "claims"
+_RESULTS_DIR = "results"
+_FINISHED_FILE = "finished"
+
+
+class _QueueInfo(BaseModel):
+    run_id: str
+    key: str
+    items: list[ForcePosixPath] = Field(default_factory=list[ForcePosixPath])
+
+
+def _write_atomic(path: pathlib.Path, content: str) -> None:
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(content, encoding="utf-8")
+    tmp.replace(path)
+
+
+class DirectoryWorkQueue:
+    """Work queue shared by a coordinator and workers through a directory.
+
+    The coordinator publishes the paths of verification files to ``queue.json``.
+    Any process which can see the directory claims an item
+    by creating ``<run_id>/claims/<index>`` exclusively,
+    and writes the result to ``<run_id>/results/<index>.json``.
+
+    While an item is held, its claim file is touched periodically.
+    A claim which is not touched for ``lease`` seconds is considered abandoned
+    by a dead process and can be claimed again.
+    """
+
+    root: pathlib.Path
+    poll_interval: float
+    lease: float
+    _info: _QueueInfo | None
+    _cursor: int
+    _remaining: set[int]
+    _held: set[int]
+    _lock: threading.Lock
+    _heartbeat: threading.Thread | None
+
+    def __init__(
+        self,
+        root: pathlib.Path,
+        *,
+        poll_interval: float = 1.0,
+        lease: float = 60.0,
+    ) -> None:
+        self.root = root
+        self.poll_interval = poll_interval
+        self.lease = lease
+        self._info = None
+        self._cursor = 0
+        self._remaining = set()
+        self._held = set()
+        self._lock = threading.Lock()
+        self._heartbeat = None
+
+    @property
+    def _queue_file(self) -> pathlib.Path:
+        return self.root / _QUEUE_FILE
+
+    def _run_dir(self, info: _QueueInfo) -> pathlib.Path:
+        return self.root / info.run_id
+
+    def _require_info(self) -> _QueueInfo:
+        if self._info is None:
+            raise RuntimeError("The work queue is not published yet.")
+        return self._info
+
+    def _set_info(self, info: _QueueInfo) -> None:
+        self._info = info
+        self._cursor = 0
+        self._remaining = set(range(len(info.items)))
+
+    def publish(self, key: str, items: list[pathlib.Path]) -> None:
+        """Publish work items. Called by the coordinator.
+
+        The run published by the previous coordinator is removed.
+        The other contents of the directory are kept.
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+        if (prev := self._read_info(include_finished=True)) is not None:
+            self._queue_file.unlink(missing_ok=True)
+            shutil.rmtree(self._run_dir(prev), ignore_errors=True)
+
+        info = _QueueInfo(run_id=uuid.uuid4().hex, key=key, items=items)
+        run_dir = self._run_dir(info)
+        (run_dir / _CLAIMS_DIR).mkdir(parents=True)
+        (run_dir / _RESULTS_DIR).mkdir(parents=True)
+        _write_atomic(self._queue_file, info.model_dump_json())
+        self._set_info(info)
+        logger.info("Published %d items: %s", len(items), self.root.as_posix())
+
+    def _read_info(self, *, include_finished: bool = False) -> _QueueInfo | None:
+        try:
+            info = _QueueInfo.model_validate_json(
+                self._queue_file.read_text(encoding="utf-8")
+            )
+        except (OSError, ValidationError):
+            return None
+        if not include_finished and (self._run_dir(info) / _FINISHED_FILE).exists():
+            return None
+        return info
+
+    def wait_published(self, key: str, *, deadline: float = float("inf")) -> bool:
+        """Wait for the coordinator to publish work items. Called by workers.
+
+        Returns:
+            bool: True if the queue for ``key`` is published before ``deadline``
+        """
+        logger.info("Waiting for the work queue: %s", self.root.as_posix())
+        while (info := self._read_info()) is None:
+            if time.perf_counter() > deadline:
+                return False
+            time.sleep(self.poll_interval)
+
+        if info.key != key:
+            raise RuntimeError(
+                "The work queue was published for the other verify_files.json."
+            )
+        self._set_info(info)
+        return True
+
+    def _try_claim(self, claim_path: pathlib.Path) -> bool:
+        try:
+            fd = os.open(claim_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            return False
+        with os.fdopen(fd, "w", encoding="utf-8") as fp:
+            fp.write(f"{os.getpid()}\n")
+        return True
+
+    def _is_expired(self, claim_path: pathlib.Path) -> bool:
+        return claim_path.stat().st_mtime + self.lease < time.time()
+
+    def _try_reclaim(self, claim_path: pathlib.Path) -> bool:
+        """Take over the expired claim.
+
+        Only one process succeeds in renaming the claim file.
+        """
+        try:
+            if not self._is_expired(claim_path):
+                return False
+            expired = claim_path.with_name(f"{claim_path.name}.{uuid.uuid4().hex}")
+            claim_path.rename(expired)
+        except FileNotFoundError:
+            return False
+        if not self._is_expired(expired):
+            # The holder touched it just now.
+            with contextlib.suppress(OSError):
+                expired.rename(claim_path)
+            return False
+        expired.unlink(missing_ok=True)
+        return self._try_claim(claim_path)
+
+    def _iter_expired(self) -> Iterator[int]:
+        info = self._require_info()
+        run_dir = self._run_dir(info)
+        for index in range(len(info.items)):
+            if index in self._held:
+                continue
+            if (run_dir / _RESULTS_DIR / f"{index}.json").exists():
+                continue
+            with contextlib.suppress(FileNotFoundError):
+                if self._is_expired(run_dir / _CLAIMS_DIR / str(index)):
+                    yield index
+
+    def claim(self) -> tuple[int, pathlib.Path] | None:
+        """Claim a work item which nobody has claimed or whose claim has expired.
+
+        The claim is kept alive until :meth:`complete` is called.
+
+        Returns:
+            tuple[int, pathlib.Path] | None: Index and path of the item, or None if all items are claimed
+        """
+        info = self._require_info()
+        claims_dir = self._run_dir(info) / _CLAIMS_DIR
+        try:
+            # Items before the cursor have been claimed by someone.
+            while self._cursor < len(info.items):
+                index = self._cursor
+                self._cursor += 1
+                if self._try_claim(claims_dir / str(index)):
+                    return self._hold(index)
+
+            for index in self._iter_expired():
+                if self._try_reclaim(claims_dir / str(index)):
+                    logger.warning(
+                        "Reclaim the expired work item: %s", info.items[index]
+                    )
+                    return self._hold(index)
+        except FileNotFoundError:
+            # The coordinator has already removed the run.
+            return None
+        return None
+
+    def _hold(self, index: int) -> tuple[int, pathlib.Path]:
+        with self._lock:
+            self._held.add(index)
+            if self._heartbeat is None:
+                self._heartbeat = threading.Thread(target=self._keep_alive, daemon=True)
+                self._heartbeat.start()
+        return index, self._require_info().items[index]
+
+    def _keep_alive(self) -> None:
+        claims_dir = self._run_dir(self._require_info()) / _CLAIMS_DIR
+        while True:
+            time.sleep(self.lease / 4)
+            with self._lock:
+                if not self._held:
+                    self._heartbeat = None
+                    return
+                for index in self._held:
+                    with contextlib.suppress(OSError):
+                        os.utime(claims_dir / str(index))
+
+    def complete(
+        self,
+        index: int,
+        path: pathlib.Path,
+        result: FileResult,
+        *,
+        elapsed: float,
+    ) -> bool:
+        """Push back the result of the claimed item.
+
+        Returns:
+            bool: False if the coordinator has already removed the run
+        """
+        info = self._require_info()
+        try:
+            _write_atomic(
+                self._run_dir(info) / _RESULTS_DIR / f"{index}.json",
+                FileResultEntry(
+                    path=path, elapsed=elapsed, result=result
+                ).model_dump_json(exclude_none=True),
+            )
+        except FileNotFoundError:
+            return False
+        finally:
+            with self._lock:
+                self._held.discard(index)
+        return True
+
+    @property
+    def collected_all(self) -> bool:
+        """Whether :meth:`iter_results` has yielded the results of all items."""
+        return not self._remaining
+
+    def iter_results(
+        self, *, deadline: float = float("inf")
+    ) -> Iterator[FileResultEntry]:
+        """Yield results as they are pushed back. Called by the coordinator.
+
+        Stop when all results are collected, ``deadline`` has passed
+        or a claim has expired. The caller should claim the expired item
+        and call this again until :attr:`collected_all` is True.
+        """
+        info = self._require_info()
+        results_dir = self._run_dir(info) / _RESULTS_DIR
+        remaining = self._remaining
+        while remaining:
+            for index in sorted(remaining):
+                result_path = results_dir / f"{index}.json"
+                if not result_path.exists():
+                    continue
+                remaining.remove(index)
+                yield FileResultEntry.model_validate_json(
+                    result_path.read_text(encoding="utf-8")
+                )
+            if not remaining or time.perf_counter() > deadline:
+                break
+            if next(self._iter_expired(), None) is not None:
+                break
+            time.sleep(self.poll_interval)
+
+    def finish(self) -> None:
+        """Mark the run as finished so that workers don't wait for it."""
+        info = self._require_info()
+        (self._run_dir(info) / _FINISHED_FILE).touch()
@@ -31,9 +31,16 @@ class GoWithoutConfigData(IntegrationData):
                     "verification": [
                         {
                             "command": {
+                                "command": [
+                                    f"{self.config_dir_path / 'cache/problems/e128a4d2859247e106283caaf0d12563'}/a.out",
+                                ],
+                            },
+                            "compile": {
                                 "command": [
                                     "go",
-                                    "run",
+                                    "build",
+                                    "-o",
+                                    f"{self.config_dir_path / 'cache/problems/e128a4d2859247e106283caaf0d12563'}/a.out",
                                     f"{self.targets_path}/helloworld.aoj.go",
                                 ],
                                 "env": {"GO111MODULE": "off"},
@@ -1,10 +1,45 @@
+import hashlib
+import pathlib
 import shutil
 from typing import Any
 
+from competitive_verifier.oj.languages.java import (
+    _batch,  # pyright: ignore[reportPrivateUsage]
+    _compile_script,  # pyright: ignore[reportPrivateUsage]
+)
+
 from .integration_data import IntegrationData
 
 
 class JavaData(IntegrationData):
+    def _build_dir(self, path: str) -> pathlib.Path:
+        return (
+            self.config_dir_path
+            / "cache/java"
+            / hashlib.md5(path.encode(), usedforsecurity=False).hexdigest()
+        )
+
+    def _compile_command(self, path: str) -> str:
+        _, batch_jar_prefix = _batch(self.targets_path.resolve())
+        return _compile_script(
+            basedir=self.targets_path,
+            path=self.targets_path / path,
+            class_name=path.removesuffix(".java").replace("/", "."),
+            build_dir=self._build_dir(path),
+            batch=[
+                (self.targets_path / p).resolve()
+                for p in [
+                    "examples/Aplusb_main.java",
+                    "examples/Aplusb_test.java",
+                    "examples/HelloWorld_test.java",
+                ]
+            ],
+            batch_jar_prefix=batch_jar_prefix,
+        )
+
+    def _execute_command(self, path: str) -> list[str]:
+        return [str(self._build_dir(path) / "run")]
+
     def check_envinronment(self) -> bool:
         return bool(shutil.which("javac"))
 
@@ -35,11 +70,12 @@ class JavaData(IntegrationData):
                     "document_attributes": {"STANDALONE": ""},
                     "verification": [
                         {
-                            "command": ["java", "examples.Aplusb_main"],
-                            "compile": [
-                                "javac",
-                                str(self.targets_path / "examples/Aplusb_main.java"),
-                            ],
+                            "command": self._execute_command(
+                                "examples/Aplusb_main.java"
+                            ),
+                            "compile": self._compile_command(
+                                "examples/Aplusb_main.java"
+                            ),
                             "name": "Java",
                             "tempdir": f"{self.config_dir_path / 'cache/standalone/382841ad26b555d39a8784691c59fce8'}",
                             "type": "command",
@@ -60,11 +96,12 @@ class JavaData(IntegrationData):
                     },
                     "verification": [
                         {
-                            "command": ["java", "examples.Aplusb_test"],
-                            "compile": [
-                                "javac",
-                                str(self.targets_path / "examples/Aplusb_test.java"),
-                            ],
+                            "command": self._execute_command(
+                                "examples/Aplusb_test.java"
+                            ),
+                            "compile": self._compile_command(
+                                "examples/Aplusb_test.java"
+                            ),
                             "name": "Java",
                             "problem": "https://judge.yosupo.jp/problem/aplusb",
                             "type": "problem",
@@ -97,13 +134,12 @@ class JavaData(IntegrationData):
                     },
                     "verification": [
                         {
-                            "command": ["java", "examples.HelloWorld_test"],
-                            "compile": [
-                                "javac",
-                                str(
-                                    self.targets_path / "examples/HelloWorld_test.java"
-                                ),
-                            ],
+                            "command": self._execute_command(
+                                "examples/HelloWorld_test.java"
+                            ),
+                            "compile": self._compile_command(
+                                "examples/HelloWorld_test.java"
+                            ),
                             "name": "Java",
                             "problem": "https://onlinejudge.u-aizu.ac.jp/courses/lesson/2/ITP1/1/ITP1_1_A",
                             "type": "problem",
@@ -75,13 +75,10 @@ class RustWithoutConfigData(IntegrationData):
                                 / "target/release/aizu-online-judge-itp1-1-a"
                             ),
                             "compile": {
-                                "command": [
-                                    "cargo",
-                                    "build",
-                                    "--release",
-                                    "--bin",
-                                    "aizu-online-judge-itp1-1-a",
-                                ],
+                                "command": "cargo build --release --workspace"
+                                " --bin aizu-online-judge-itp1-1-a"
+                                " --bin library-checker-aplusb"
+                                " || cargo build --release --bin aizu-online-judge-itp1-1-a",
                                 "cwd": str(self.targets_path / "verification/src/bin"),
                             },
                             "name": "Rust",
@@ -109,13 +106,10 @@ class RustWithoutConfigData(IntegrationData):
                                 / "target/release/library-checker-aplusb"
                             ),
                             "compile": {
-                                "command": [
-                                    "cargo",
-                                    "build",
-                                    "--release",
-                                    "--bin",
-                                    "library-checker-aplusb",
-                                ],
+                                "command": "cargo build --release --workspace"
+                                " --bin aizu-online-judge-itp1-1-a"
+                                " --bin library-checker-aplusb"
+                                " || cargo build --release --bin library-checker-aplusb",
                                 "cwd": str(self.targets_path / "verification/src/bin"),
                             },
                             "name": "Rust",
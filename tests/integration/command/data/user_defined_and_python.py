@@ -5,6 +5,13 @@ from competitive_verifier.oj.gnu import time_command
 
 from .integration_data import IntegrationData
 
+PYTHON_COMPILE_ALL = (
+    "python -m compileall -q python/failure.mle.py python/failure.re.py"
+    " python/failure.tle.py python/failure.wa.py python/lib_all_failure.py"
+    " python/lib_all_success.py python/lib_some_failure.py python/lib_some_skip.py"
+    " python/lib_some_skip_some_wa.py python/success1.py python/success2.py"
+)
+
 
 class UserDefinedAndPythonData(IntegrationData):
     @property
@@ -215,17 +222,19 @@ class UserDefinedAndPythonData(IntegrationData):
                                 "command": ["python", "python/success1.py"],
                                 "env": {
                                     "PYTHONPATH": str(self.targets_path),
+                                    "PYTHONPYCACHEPREFIX": str(
+                                        self.config_dir_path / "cache/pycache"
+                                    ),
                                 },
                             },
                             "compile": {
-                                "command": [
-                                    "python",
-                                    "-m",
-                                    "py_compile",
-                                    "python/success1.py",
-                                ],
+                                "command": PYTHON_COMPILE_ALL
+                                + " || python -m compileall -q python/success1.py python/lib_some_failure.py python/lib_some_skip.py",
                                 "env": {
                                     "PYTHONPATH": str(self.targets_path),
+                                    "PYTHONPYCACHEPREFIX": str(
+                                        self.config_dir_path / "cache/pycache"
+                                    ),
                                 },
                             },
                             "problem": "https://judge.yosupo.jp/problem/aplusb",
@@ -259,17 +268,19 @@ class UserDefinedAndPythonData(IntegrationData):
                                 "command": ["python", "python/failure.wa.py"],
                                 "env": {
                                     "PYTHONPATH": str(self.targets_path),
+                                    "PYTHONPYCACHEPREFIX": str(
+                                        self.config_dir_path / "cache/pycache"
+                                    ),
                                 },
                             },
                             "compile": {
-                                "command": [
-                                    "python",
-                                    "-m",
-                                    "py_compile",
-                                    "python/failure.wa.py",
-                                ],
+                                "command": PYTHON_COMPILE_ALL
+                                + " || python -m compileall -q python/failure.wa.py python/lib_all_failure.py python/lib_some_skip_some_wa.py",
                                 "env": {
                                     "PYTHONPATH": str(self.targets_path),
+                                    "PYTHONPYCACHEPREFIX": str(
+                                        self.config_dir_path / "cache/pycache"
+                                    ),
                                 },
                             },
                             "problem": "https://judge.yosupo.jp/problem/aplusb",
@@ -295,17 +306,19 @@ class UserDefinedAndPythonData(IntegrationData):
                                 "command": ["python", "python/failure.mle.py"],
                                 "env": {
                                     "PYTHONPATH": str(self.targets_path),
+                                    "PYTHONPYCACHEPREFIX": str(
+                                        self.config_dir_path / "cache/pycache"
+                                    ),
                                 },
                             },
                             "compile": {
-                                "command": [
-                                    "python",
-                                    "-m",
-                                    "py_compile",
-                                    "python/failure.mle.py",
-                                ],
+                                "command": PYTHON_COMPILE_ALL
+                                + " || python -m compileall -q python/failure.mle.py python/lib_all_failure.py python/lib_some_failure.py",
                                 "env": {
                                     "PYTHONPATH": str(self.targets_path),
+                                    "PYTHONPYCACHEPREFIX": str(
+                                        self.config_dir_path / "cache/pycache"
+                                    ),
                                 },
                             },
                             "problem": "https://judge.yosupo.jp/problem/aplusb",
@@ -347,17 +360,19 @@ class UserDefinedAndPythonData(IntegrationData):
                                 "command": ["python", "python/success2.py"],
                                 "env": {
                                     "PYTHONPATH": str(self.targets_path),
+                                    "PYTHONPYCACHEPREFIX": str(
+                                        self.config_dir_path / "cache/pycache"
+                                    ),
                                 },
                             },
                             "compile": {
-                                "command": [
-                                    "python",
-                                    "-m",
-                                    "py_compile",
-                                    "python/success2.py",
-                                ],
+                                "command": PYTHON_COMPILE_ALL
+                                + " || python -m compileall -q python/success2.py python/lib_all_success.py python/lib_some_skip_some_wa.py",
                                 "env": {
                                     "PYTHONPATH": str(self.targets_path),
+                                    "PYTHONPYCACHEPREFIX": str(
+                                        self.config_dir_path / "cache/pycache"
+                                    ),
                                 },
                             },
                             "problem": "https://judge.yosupo.jp/problem/aplusb",
@@ -388,17 +403,19 @@ class UserDefinedAndPythonData(IntegrationData):
                                 "command": ["python", "python/failure.re.py"],
                                 "env": {
                                     "PYTHONPATH": str(self.targets_path),
+                                    "PYTHONPYCACHEPREFIX": str(
+                                        self.config_dir_path / "cache/pycache"
+                                    ),
                                 },
                             },
                             "compile": {
-                                "command": [
-                                    "python",
-                                    "-m",
-                                    "py_compile",
-                                    "python/failure.re.py",
-                                ],
+                                "command": PYTHON_COMPILE_ALL
+                                + " || python -m compileall -q python/failure.re.py python/lib_all_failure.py",
                                 "env": {
                                     "PYTHONPATH": str(self.targets_path),
+                                    "PYTHONPYCACHEPREFIX": str(
+                                        self.config_dir_path / "cache/pycache"
+                                    ),
                                 },
                             },
                             "problem": "https://judge.yosupo.jp/problem/aplusb",
@@ -429,17 +446,19 @@ class UserDefinedAndPythonData(IntegrationData):
                                 "command": ["python", "python/failure.tle.py"],
                                 "env": {
                                     "PYTHONPATH": str(self.targets_path),
+                                    "PYTHONPYCACHEPREFIX": str(
+                                        self.config_dir_path / "cache/pycache"
+                                    ),
                                 },
                             },
                             "compile": {
-                                "command": [
-                                    "python",
-                                    "-m",
-                                    "py_compile",
-                                    "python/failure.tle.py",
-                                ],
+                                "command": PYTHON_COMPILE_ALL
+                                + " || python -m compileall -q python/failure.tle.py python/lib_all_failure.py",
                                 "env": {
                                     "PYTHONPATH": str(self.targets_path),
+                                    "PYTHONPYCACHEPREFIX": str(
+                                        self.config_dir_path / "cache/pycache"
+                                    ),
                                 },
                             },
                             "problem": "https://onlinejudge.u-aizu.ac.jp/courses/lesson/2/ITP1/1/ITP1_1_A",
@@ -5,6 +5,7 @@ import pytest
 from pytest_mock import MockerFixture
 from pytest_mock.plugin import MockType
 
+from competitive_verifier.download import DownloadPrefetcher
 from competitive_verifier.download import download_files as download
 from competitive_verifier.models import (
     ConstVerification,
@@ -77,3 +78,46 @@ def test_oj_download(
 
     mock_yuki_coder = mock_problem[problem.YukicoderProblem]
     mock_yuki_coder.assert_called_once_with()
+
+
+def test_prefetcher(mocker: MockerFixture):
+    def _download(url: str, *, group_log: bool = False) -> bool:
+        return "yukicoder" not in url
+
+    mock_download = mocker.patch(
+        "competitive_verifier.oj.download", side_effect=_download
+    )
+
+    aplusb = VerificationFile(
+        verification=ProblemVerification(
+            problem="https://judge.yosupo.jp/problem/aplusb",
+            command="true",
+        )
+    )
+    yukicoder = VerificationFile(
+        verification=[
+            ProblemVerification(
+                problem="https://yukicoder.me/problems/no/1088",
+                command="true",
+            ),
+            ProblemVerification(
+                problem="https://judge.yosupo.jp/problem/aplusb",
+                command="true",
+            ),
+        ]
+    )
+
+    with DownloadPrefetcher(max_workers=2) as prefetcher:
+        prefetcher.prefetch([aplusb, yukicoder])
+        assert prefetcher.download(aplusb, check=True)
+        assert not prefetcher.download(yukicoder)
+        with pytest.raises(
+            RuntimeError,
+            match=r"^Failed to download: https://yukicoder\.me/problems/no/1088$",
+        ):
+            prefetcher.download(yukicoder, check=True)
+
+    assert sorted(c.args[0] for c in mock_download.call_args_list) == [
+        "https://judge.yosupo.jp/problem/aplusb",
+        "https://yukicoder.me/problems/no/1088",
+    ]
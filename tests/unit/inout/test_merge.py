@@ -260,3 +260,32 @@ T = TypeVar("T", VerificationInput, VerifyCommandResult)
 )
 def test_merge(objects: list[T], expected: T):
     assert merge(objects) == expected
+
+
+@pytest.mark.parametrize(
+    ("objects", "expected"),
+    inputs + results,
+)
+def test_merge_iterator(objects: list[T], expected: T):
+    before = [o.model_copy(deep=True) for o in objects]
+    assert merge(iter(objects)) == expected
+    assert objects == before
+
+
+def test_merge_generator():
+    result = merge(
+        VerifyCommandResult(
+            total_seconds=0.5,
+            files={Path(f"file{i % 8}"): FileResult(newest=i % 3 == 0)},
+        )
+        for i in range(64)
+    )
+    assert result.total_seconds == 32
+    assert result.files == {
+        Path(f"file{i}"): FileResult(newest=True) for i in [0, 1, 2, 3, 4, 5, 6, 7]
+    }
+
+
+def test_merge_empty():
+    with pytest.raises(TypeError, match=r"^merge\(\) of empty iterable$"):
+        merge(list[VerifyCommandResult]())
@@ -385,7 +385,9 @@ def test_transitive_depends_on():
             ),
         }
     )
-    assert obj.transitive_depends_on == {
+    with pytest.deprecated_call():
+        transitive_depends_on = obj.transitive_depends_on
+    assert transitive_depends_on == {
         pathlib.Path("fileA.c"): {pathlib.Path("fileA.c"), pathlib.Path("fileB.c")},
         pathlib.Path("fileB.c"): {pathlib.Path("fileA.c"), pathlib.Path("fileB.c")},
         pathlib.Path("file1.c"): {pathlib.Path("file1.c")},
@@ -397,3 +399,36 @@ def test_transitive_depends_on():
             pathlib.Path("file4.c"),
         },
     }
+
+
+def test_transitive_depends_on_bits():
+    obj = VerificationInput.model_validate(
+        {
+            "files": {
+                "fileA.c": {"dependencies": ["fileB.c", "other.c"]},
+                "fileB.c": {"dependencies": ["fileA.c", "file1.c"]},
+                "file1.c": {},
+                "file2.c": {"dependencies": ["fileA.c"]},
+            }
+        }
+    )
+    assert obj.transitive_depends_on_bits(pathlib.Path("fileA.c")) == 0b0111
+    assert obj.transitive_depends_on_bits(pathlib.Path("file1.c")) == 0b0100
+    assert obj.transitive_depends_on_bits(pathlib.Path("file2.c")) == 0b1111
+    assert obj.paths_of_bits(0b1010) == [
+        pathlib.Path("fileB.c"),
+        pathlib.Path("file2.c"),
+    ]
+    assert obj.get_transitive_depends_on(pathlib.Path("fileB.c")) == [
+        pathlib.Path("fileA.c"),
+        pathlib.Path("fileB.c"),
+        pathlib.Path("file1.c"),
+    ]
+    assert obj.paths_of_bits(0) == []
+    assert list(obj.transitive_depends_on_indexes(pathlib.Path("file2.c"))) == [
+        0,
+        1,
+        2,
+        3,
+    ]
+    assert obj.path_of_index(2) == pathlib.Path("file1.c")
@@ -8,10 +8,17 @@ from pytest_mock import MockerFixture
 
 from competitive_verifier.models import (
     FileResult,
+    JudgeStatus,
     ResultStatus,
     VerificationResult,
     VerifyCommandResult,
 )
+from competitive_verifier.models import (
+    TestcaseResult as CaseResult,
+)
+from competitive_verifier.models import (
+    TestcaseResults as CaseResults,
+)
 
 test_parse_FileResult_params: list[
     tuple[FileResult, dict[str, Any], dict[str, Any], str]
@@ -790,3 +797,38 @@ def test_parse_file_relative(testtemp: pathlib.Path, mocker: MockerFixture):
             total_seconds=2.5,
         ).model_dump()
     )
+
+
+def test_testcase_results():
+    results = CaseResults(
+        [
+            CaseResult(name="case1", status=JudgeStatus.AC, elapsed=1.5, memory=2.5),
+            CaseResult(name="case2", status=JudgeStatus.TLE, elapsed=2.0),
+        ]
+    )
+    models = [
+        CaseResult(name="case1", status=JudgeStatus.AC, elapsed=1.5, memory=2.5),
+        CaseResult(name="case2", status=JudgeStatus.TLE, elapsed=2.0),
+    ]
+    assert len(results) == 2
+    assert results != CaseResults()
+    assert results == models
+    assert results[1] == models[1]
+    assert results[:1] == models[:1]
+    assert results.to_models() == models
+
+    result = VerificationResult(
+        status=ResultStatus.SUCCESS,
+        elapsed=3.5,
+        testcases=results,
+        last_execution_time=datetime(2016, 12, 24, 15, 16, 34),
+    )
+    assert result.testcases is results
+    assert result.model_dump(mode="json")["testcases"] == [
+        {"name": "case1", "status": "AC", "elapsed": 1.5, "memory": 2.5},
+        {"name": "case2", "status": "TLE", "elapsed": 2.0, "memory": None},
+    ]
+
+    parsed = VerificationResult.model_validate_json(result.model_dump_json())
+    assert isinstance(parsed.testcases, CaseResults)
+    assert parsed == result
@@ -0,0 +1,36 @@
+import pytest
+
+from competitive_verifier.models._scc import SccGraph
+
+
+@pytest.mark.parametrize(
+    ("n", "edges", "expected"),
+    [
+        (0, [], []),
+        (3, [], [[2], [1], [0]]),
+        (
+            6,
+            [(1, 4), (5, 2), (3, 0), (5, 5), (4, 1), (0, 3), (4, 2)],
+            [[5], [1, 4], [2], [0, 3]],
+        ),
+        (4, [(0, 1), (1, 2), (2, 0), (2, 3)], [[0, 1, 2], [3]]),
+    ],
+)
+def test_scc(n: int, edges: list[tuple[int, int]], expected: list[list[int]]):
+    g = SccGraph(n)
+    for s, t in edges:
+        g.add_edge(s, t)
+    assert g.scc() == expected
+
+
+def test_scc_deep():
+    n = 200000
+    g = SccGraph(n)
+    for i in range(n - 1):
+        g.add_edge(i, i + 1)
+    g.add_edge(n - 1, n // 2)
+
+    groups = g.scc()
+    assert len(groups) == n // 2 + 1
+    assert groups[: n // 2] == [[i] for i in range(n // 2)]
+    assert groups[-1] == list(range(n // 2, n))
@@ -20,9 +20,12 @@ from competitive_verifier.models import (
     ShellCommand,
     Verification,
 )
+from competitive_verifier.models import (
+    TestcaseResults as CaseResults,
+)
 from competitive_verifier.models.verification import BaseProblemVerification
 from competitive_verifier.oj import LocalProblem, problem_from_url
-from competitive_verifier.oj.oj_test import OjTestArguments
+from competitive_verifier.oj.oj_test import OjTestArguments, OjTestResult
 
 
 def from_url_force(url: str):
@@ -35,6 +38,8 @@ def from_url_force(url: str):
 class DataVerificationParams:
     default_tle: float | None = 22
     default_mle: float | None = 128
+    enforce_limits: bool = False
+    keep_answers: pathlib.Path | None = None
 
 
 test_command_union_json_params: list[tuple[Verification, str, str]] = [
@@ -423,7 +428,16 @@ def test_run_problem_command(
         "competitive_verifier.oj.problem.LibraryCheckerProblem.checker_exe_name",
         "mockcheck",
     )
-    patch = mocker.patch("competitive_verifier.oj.oj_test._run")
+    patch = mocker.patch(
+        "competitive_verifier.oj.oj_test._run",
+        return_value=OjTestResult(
+            is_success=True,
+            elapsed=0,
+            slowest=-1.0,
+            heaviest=-1.0,
+            testcases=CaseResults(),
+        ),
+    )
 
     mocker.patch.object(
         Problem,
@@ -1,6 +1,8 @@
 import json
 from pathlib import Path
 
+import pytest
+
 from competitive_verifier.models import VerificationInput
 
 test_input = VerificationInput.model_validate(
@@ -149,7 +151,8 @@ def test_transitive_depends_on():
     }
     expected = {Path(p): {Path(s) for s in d} for p, d in simple.items()}
 
-    assert test_input.transitive_depends_on == expected
+    with pytest.deprecated_call():
+        assert test_input.transitive_depends_on == expected
     assert test_input.transitive_depends_on is test_input.transitive_depends_on
     assert test_input.transitive_depends_on == expected
 
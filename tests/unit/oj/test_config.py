@@ -32,15 +32,25 @@ from competitive_verifier.oj.languages import (
 default_languages: dict[str, Any] = {
     "cpp": {"read_macros": True},
     "go": {
-        "execute": {
-            "command": ["go", "run", "{basedir}/{path}"],
+        "compile": {
+            "command": ["go", "build", "-o", "{tempdir}/a.out", "{basedir}/{path}"],
             "env": {"GO111MODULE": "off"},
         },
+        "execute": {"command": ["{tempdir}/a.out"]},
     },
     "haskell": {
-        "execute": {
-            "command": ["runghc", "{basedir}/{path}"],
+        "compile": {
+            "command": [
+                "ghc",
+                "-O2",
+                "-outputdir",
+                "{tempdir}",
+                "-o",
+                "{tempdir}/a.out",
+                "{basedir}/{path}",
+            ],
         },
+        "execute": {"command": ["{tempdir}/a.out"]},
     },
     "java": {},
     "nim": {"environments": []},
@@ -80,6 +90,7 @@ test_oj_resolve_config_load_params: dict[str, tuple[str, dict[str, Any]]] = {
             [[languages.cpp.environments]]
             CXX = "g++"
             CXXFLAGS = ["flags"]
+            PCH = ["bits/stdc++.h"]
             extra = 1
             [[languages.cpp.environments]]
             CXX = "clang++"
@@ -111,7 +122,11 @@ test_oj_resolve_config_load_params: dict[str, tuple[str, dict[str, Any]]] = {
                 "cpp": {
                     "read_macros": False,
                     "environments": [
-                        {"CXX": "g++", "CXXFLAGS": ["flags"]},
+                        {
+                            "CXX": "g++",
+                            "CXXFLAGS": ["flags"],
+                            "PCH": ["bits/stdc++.h"],
+                        },
                         {"CXX": "clang++"},
                     ],
                 },
@@ -145,6 +160,32 @@ test_oj_resolve_config_load_params: dict[str, tuple[str, dict[str, Any]]] = {
             },
         },
     ),
+    "compile_only": (
+        textwrap.dedent(
+            """
+            [languages.go]
+            compile = "go vet {basedir}/{path}"
+            [languages.haskell]
+            compile = "ghc -fno-code {basedir}/{path}"
+            """
+        ),
+        {
+            "languages": default_languages
+            | {
+                "go": {
+                    "compile": "go vet {basedir}/{path}",
+                    "execute": {
+                        "command": ["go", "run", "{basedir}/{path}"],
+                        "env": {"GO111MODULE": "off"},
+                    },
+                },
+                "haskell": {
+                    "compile": "ghc -fno-code {basedir}/{path}",
+                    "execute": {"command": ["runghc", "{basedir}/{path}"]},
+                },
+            }
+        },
+    ),
     "rust_kind_none": (
         textwrap.dedent(
             """
@@ -0,0 +1,107 @@
+import os
+import pathlib
+import shutil
+import subprocess
+
+import pytest
+from pytest_mock import MockerFixture
+
+from competitive_verifier.oj.languages.cplusplus import (
+    CPlusPlusLanguageEnvironment,
+    _precompiled_header_directory,  # pyright: ignore[reportPrivateUsage]
+)
+
+
+@pytest.mark.skipif(os.name != "posix", reason="PCH is supported only on POSIX")
+@pytest.mark.parametrize(
+    ("cxx", "code", "expected"),
+    [
+        ("/usr/bin/g++", "#include <bits/stdc++.h>\nint main() {}\n", True),
+        ("/usr/bin/g++", "  #  include<bits/stdc++.h>\nint main() {}\n", True),
+        ("/usr/bin/g++", "#include <iostream>\nint main() {}\n", False),
+        ("/usr/bin/clang++", "#include <bits/stdc++.h>\nint main() {}\n", False),
+    ],
+)
+def test_precompiled_header(
+    cxx: str,
+    code: str,
+    expected: bool,
+    mocker: MockerFixture,
+):
+    mocker.patch.object(pathlib.Path, "read_bytes", return_value=code.encode())
+    env = CPlusPlusLanguageEnvironment(
+        CXX=pathlib.Path(cxx),
+        CXXFLAGS=["-O2"],
+        PCH=["bits/stdc++.h"],
+    )
+    include_dir = _precompiled_header_directory(
+        pathlib.Path(cxx), ["-O2"], "bits/stdc++.h"
+    )
+
+    command = env.get_compile_command(
+        pathlib.Path("test/a.test.cpp"),
+        basedir=pathlib.Path("/basedir"),
+        tempdir=pathlib.Path("/tempdir"),
+    )
+    compile_command = [
+        cxx,
+        "-O2",
+        *(["-I", str(include_dir)] if expected else []),
+        "-I",
+        "/basedir",
+        "-o",
+        "/tempdir/a.out",
+        "test/a.test.cpp",
+    ]
+    if expected:
+        # The header is precompiled when the file is compiled, not when it is resolved.
+        assert isinstance(command, str)
+        assert command.endswith("; " + " ".join(compile_command))
+        assert f"{include_dir}/bits/stdc++.h.gch" in command
+        assert not include_dir.exists()
+    else:
+        assert command == compile_command
+
+
+@pytest.mark.allow_mkdir
+@pytest.mark.skipif(
+    os.name != "posix" or shutil.which("g++") is None, reason="g++ is required"
+)
+def test_precompiled_header_compile(testtemp: pathlib.Path):
+    source = testtemp / "a.cpp"
+    source.write_text(
+        '#include <cstdio>\nint main() { std::puts("OK"); }\n', encoding="utf-8"
+    )
+    cxx = pathlib.Path(shutil.which("g++") or "g++")
+    env = CPlusPlusLanguageEnvironment(CXX=cxx, CXXFLAGS=["-O0"], PCH=["cstdio"])
+    command = env.get_compile_command(source, basedir=testtemp, tempdir=testtemp)
+    assert isinstance(command, str)
+    gch = _precompiled_header_directory(cxx, ["-O0"], "cstdio") / "cstdio.gch"
+
+    stamp = gch.with_name("cstdio.gch.version")
+    version = subprocess.run(
+        [str(cxx), "-dumpfullversion", "-dumpversion"],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+
+    for _ in range(2):
+        subprocess.run(command, shell=True, check=True)  # noqa: S602
+        assert gch.exists()
+        assert stamp.read_text(encoding="utf-8") == version
+        assert (
+            subprocess.run(
+                [str(testtemp / "a.out")], capture_output=True, text=True, check=True
+            ).stdout
+            == "OK\n"
+        )
+    assert not list(gch.parent.parent.glob("source.*"))
+
+    # The header built by another version of the compiler is built again.
+    gch.write_bytes(b"stale")
+    stamp.write_text("0.0.0\n", encoding="utf-8")
+    subprocess.run(command, shell=True, check=True)  # noqa: S602
+    assert gch.read_bytes() != b"stale"
+    assert stamp.read_text(encoding="utf-8") == version
+    assert not list(gch.parent.glob("*.tmp"))
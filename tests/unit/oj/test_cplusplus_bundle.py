@@ -0,0 +1,60 @@
+import pathlib
+
+import pytest
+from pytest_mock import MockerFixture
+from pytest_mock.plugin import MockType
+
+from competitive_verifier.oj.languages.cplusplus_bundle import (
+    _check_compiler,  # pyright: ignore[reportPrivateUsage]
+    _compiler_version,  # pyright: ignore[reportPrivateUsage]
+    _get_uncommented_code,  # pyright: ignore[reportPrivateUsage]
+    get_uncommented_code,
+)
+
+
+@pytest.fixture
+def mock_gcc(mocker: MockerFixture) -> MockType:
+    def _command_stdout(command: list[str], *, text: bool = True) -> str | bytes:
+        if command[1:] == ["--version"]:
+            return "g++ (GCC) 14.2.0\n"
+        path = pathlib.Path(command[-1])
+        return f'# 1 "{path.name}"\n'.encode() + path.read_bytes().replace(
+            b"// comment", b""
+        )
+
+    mocker.patch("shutil.which", return_value="/usr/bin/g++")
+    _compiler_version.cache_clear()
+    _check_compiler.cache_clear()
+    _get_uncommented_code.cache_clear()
+    return mocker.patch(
+        "competitive_verifier.oj.languages.cplusplus_bundle.command_stdout",
+        side_effect=_command_stdout,
+    )
+
+
+@pytest.mark.allow_mkdir
+def test_uncommented_code_cache(testtemp: pathlib.Path, mock_gcc: MockType):
+    (testtemp / "a.hpp").write_bytes(b"int a; // comment\n")
+    (testtemp / "b.hpp").write_bytes(b"int a; // comment\n")
+
+    assert (
+        get_uncommented_code(testtemp / "a.hpp", iquotes=[], compiler="g++")
+        == b"int a; \n"
+    )
+    # The cache is shared among files with the same content and among runs.
+    _get_uncommented_code.cache_clear()
+    assert (
+        get_uncommented_code(testtemp / "b.hpp", iquotes=[], compiler="g++")
+        == b"int a; \n"
+    )
+    assert [c.args[0][-1] for c in mock_gcc.call_args_list] == [
+        "--version",
+        str((testtemp / "a.hpp").resolve()),
+    ]
+
+    (testtemp / "a.hpp").write_bytes(b"int b; // comment\n")
+    assert (
+        get_uncommented_code(testtemp / "a.hpp", iquotes=[], compiler="g++")
+        == b"int b; \n"
+    )
+    assert mock_gcc.call_count == 3
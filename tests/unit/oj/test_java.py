@@ -0,0 +1,179 @@
+import hashlib
+import os
+import pathlib
+import shutil
+import subprocess
+from collections.abc import Generator
+
+import pytest
+from pytest_mock import MockerFixture
+
+from competitive_verifier.oj.languages.java import (
+    JavaLanguage,
+    JavaLanguageEnvironment,
+    _batch,  # pyright: ignore[reportPrivateUsage]
+    _compile_script,  # pyright: ignore[reportPrivateUsage]
+)
+
+FILES = {
+    "lib/Add.java": (
+        "package lib;\n"
+        "public class Add { public static long add(long a, long b) { return a + b; } }\n"
+    ),
+    "lib/Main.java": (
+        "// competitive-verifier: STANDALONE\n"
+        "package lib;\n"
+        "import java.util.Scanner;\n"
+        "public class Main {\n"
+        "  public static void main(String[] args) {\n"
+        "    Scanner sc = new Scanner(System.in);\n"
+        "    System.out.println(Add.add(sc.nextLong(), sc.nextLong()));\n"
+        "  }\n"
+        "}\n"
+    ),
+    "lib/Sub.java": (
+        "// competitive-verifier: PROBLEM https://judge.yosupo.jp/problem/aplusb\n"
+        "package lib;\n"
+        "import java.util.Scanner;\n"
+        "public class Sub {\n"
+        "  public static void main(String[] args) {\n"
+        "    Scanner sc = new Scanner(System.in);\n"
+        "    System.out.println(Add.add(sc.nextLong(), -sc.nextLong()));\n"
+        "  }\n"
+        "}\n"
+    ),
+}
+
+
+@pytest.fixture
+def basedir(
+    testtemp: pathlib.Path, mocker: MockerFixture
+) -> Generator[pathlib.Path, None, None]:
+    basedir = testtemp.resolve()
+    for name, content in FILES.items():
+        (basedir / name).parent.mkdir(parents=True, exist_ok=True)
+        (basedir / name).write_text(content, encoding="utf-8")
+
+    def ls_files(*_: object) -> set[pathlib.Path]:
+        return set(basedir.glob("**/*.java"))
+
+    mocker.patch("competitive_verifier.git.ls_files", side_effect=ls_files)
+    JavaLanguage().close()
+    yield basedir
+    JavaLanguage().close()
+
+
+def _build_dir(basedir: pathlib.Path, path: str) -> pathlib.Path:
+    return (
+        basedir
+        / ".competitive-verifier/cache/java"
+        / hashlib.md5(path.encode(), usedforsecurity=False).hexdigest()
+    )
+
+
+@pytest.mark.allow_mkdir
+@pytest.mark.skipif(os.name != "posix", reason="jar is built only on POSIX")
+def test_commands(basedir: pathlib.Path):
+    env = JavaLanguageEnvironment()
+    tempdir = basedir / "tmp"
+    compile_commands = {
+        path: env.get_compile_command(
+            pathlib.Path(path), basedir=basedir, tempdir=tempdir
+        )
+        for path in ["lib/Main.java", "lib/Sub.java", "lib/Add.java"]
+    }
+    _, batch_jar_prefix = _batch(basedir)
+    assert batch_jar_prefix.parent == basedir / ".competitive-verifier/cache/java/batch"
+
+    # Only the verification files are compiled together
+    assert compile_commands == {
+        path: _compile_script(
+            basedir=basedir,
+            path=basedir / path,
+            class_name=class_name,
+            build_dir=_build_dir(basedir, path),
+            batch=batch,
+            batch_jar_prefix=batch_jar_prefix,
+        )
+        for path, class_name, batch in [
+            (
+                "lib/Main.java",
+                "lib.Main",
+                [basedir / "lib/Main.java", basedir / "lib/Sub.java"],
+            ),
+            (
+                "lib/Sub.java",
+                "lib.Sub",
+                [basedir / "lib/Main.java", basedir / "lib/Sub.java"],
+            ),
+            ("lib/Add.java", "lib.Add", []),
+        ]
+    }
+    assert env.get_execute_command(
+        pathlib.Path("lib/Main.java"), basedir=basedir, tempdir=tempdir
+    ) == [str(_build_dir(basedir, "lib/Main.java") / "run")]
+
+    # Another content of the files is built into another jar
+    (basedir / "lib/Add.java").write_text(
+        FILES["lib/Add.java"].replace("a + b", "b + a"), encoding="utf-8"
+    )
+    JavaLanguage().close()
+    assert _batch(basedir)[1] != batch_jar_prefix
+
+
+@pytest.mark.allow_mkdir
+@pytest.mark.skipif(
+    os.name != "posix" or not all(shutil.which(c) for c in ("java", "javac", "jar")),
+    reason="JDK is required",
+)
+def test_run(basedir: pathlib.Path):
+    env = JavaLanguageEnvironment()
+    tempdir = basedir / "tmp"
+
+    def run(path: str, *, expected: str) -> None:
+        compile_command = env.get_compile_command(
+            pathlib.Path(path), basedir=basedir, tempdir=tempdir
+        )
+        assert isinstance(compile_command, str)
+        subprocess.run(compile_command, shell=True, check=True)  # noqa: S602
+        execute_command = env.get_execute_command(
+            pathlib.Path(path), basedir=basedir, tempdir=tempdir
+        )
+        for _ in range(3):
+            assert (
+                subprocess.run(
+                    execute_command,
+                    input="5 2\n",
+                    capture_output=True,
+                    text=True,
+                    check=True,
+                ).stdout
+                == expected
+            )
+
+        build_dir = _build_dir(basedir, path)
+        # The first run creates the archive if the JVM supports it and the others use it.
+        if "AutoCreateSharedArchive" in (build_dir / "run").read_text(encoding="utf-8"):
+            assert (build_dir / "app.jsa").exists()
+
+    for _ in range(2):
+        run("lib/Main.java", expected="7\n")
+        run("lib/Sub.java", expected="3\n")
+    # The jar built by one javac is shared
+    assert (_build_dir(basedir, "lib/Main.java") / "app.jar").samefile(
+        _build_dir(basedir, "lib/Sub.java") / "app.jar"
+    )
+
+    # A broken file doesn't fail the others
+    (basedir / "lib/Broken.java").write_text(
+        "// competitive-verifier: STANDALONE\npackage lib;\npublic class Broken {\n",
+        encoding="utf-8",
+    )
+    JavaLanguage().close()
+    run("lib/Main.java", expected="7\n")
+    with pytest.raises(subprocess.CalledProcessError):
+        run("lib/Broken.java", expected="")
+    run("lib/Sub.java", expected="3\n")
+    assert not (_build_dir(basedir, "lib/Main.java") / "app.jar").samefile(
+        _build_dir(basedir, "lib/Sub.java") / "app.jar"
+    )
@@ -1,6 +1,11 @@
 import logging
 import os
 import pathlib
+import shutil
+import subprocess
+import sys
+import time
+from collections.abc import Callable
 from dataclasses import replace
 from itertools import chain
 from subprocess import CompletedProcess, TimeoutExpired
@@ -23,11 +28,21 @@ from competitive_verifier.models import (
 from competitive_verifier.models import (
     TestCaseProvider as SystemTestCaseProvider,
 )
+from competitive_verifier.models import (
+    TestcaseResults as CaseResults,
+)
+from competitive_verifier.oj import gnu
 from competitive_verifier.oj.oj_test import (
+    MIN_OUTPUT_LIMIT,
+    OUTPUT_LIMIT_FACTOR,
+    CaseExecutionError,
     OjExecInfo,
     OjTestArguments,
     OjTestcaseResult,
     OjTestResult,
+    PreparedCommand,
+    default_output_limit,
+    determine_status,
     gnu_time_message,
     measure_command,
     single_case,
@@ -43,6 +58,14 @@ from tests import LogComparer
 
 OJ_TEST_MODULE = "competitive_verifier.oj.oj_test"
 
+EMPTY_TEST_RESULT = OjTestResult(
+    is_success=True,
+    elapsed=0,
+    slowest=-1.0,
+    heaviest=-1.0,
+    testcases=CaseResults(),
+)
+
 
 def make_result(
     name: str,
@@ -944,6 +967,195 @@ def test_single_case(
     assert caplog.records == expected_log
 
 
+@pytest.mark.parametrize(
+    ("script", "timeout", "expected"),
+    [
+        (
+            "print('a\\r\\nb')",
+            10,
+            OjExecInfo(answer="a\nb\n", elapsed=1.0, memory=None, returncode=0),
+        ),
+        (
+            "import sys; sys.stdout.write('x' * 4096); sys.exit(3)",
+            10,
+            OjExecInfo(answer="x" * 4096, elapsed=1.0, memory=None, returncode=3),
+        ),
+        (
+            "import time; time.sleep(30)",
+            0.5,
+            OjExecInfo(answer=None, elapsed=1.0, memory=None, returncode=None),
+        ),
+    ],
+)
+@pytest.mark.usefixtures("mock_perf_counter")
+def test_measure_command_output_limit(
+    script: str,
+    timeout: float,
+    expected: OjExecInfo,
+):
+    assert (
+        measure_command(
+            [sys.executable, "-c", script],
+            timeout=timeout,
+            output_limit=4096,
+        )
+        == expected
+    )
+
+
+def test_measure_command_output_exceeded():
+    info = measure_command(
+        [sys.executable, "-c", "while True: print('x' * 1000)"],
+        timeout=30,
+        output_limit=1 << 16,
+    )
+    assert info.output_exceeded
+    assert info.answer is not None
+    assert len(info.answer) <= 1 << 16
+    assert info.elapsed < 30
+    assert (
+        determine_status(
+            exitcode=info.returncode,
+            memory=None,
+            mle=None,
+            match_result=None,
+            output_exceeded=info.output_exceeded,
+        )
+        == JudgeStatus.OLE
+    )
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="select does not support pipes")
+def test_measure_command_output_limit_orphan():
+    # The orphan holds stdout after the command is killed.
+    script = (
+        "import subprocess, sys, time; "
+        "subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(10)']); "
+        "time.sleep(10)"
+    )
+    info = measure_command(
+        [sys.executable, "-c", script], timeout=1, output_limit=1 << 16
+    )
+    assert info.answer is None
+    assert info.returncode is None
+    assert info.elapsed < 5
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="No rlimit on Windows")
+@pytest.mark.parametrize("output_limit", [None, 1 << 20])
+def test_measure_command_enforce_limits(output_limit: int | None):
+    memory = measure_command(
+        [sys.executable, "-c", "x = bytearray(1 << 30); print('allocated')"],
+        timeout=30,
+        output_limit=output_limit,
+        memory_limit=256,
+    )
+    assert memory.returncode not in {None, 0}
+    assert memory.answer == ""
+
+    cpu = measure_command(
+        [sys.executable, "-c", "while True: pass"],
+        timeout=30,
+        output_limit=output_limit,
+        cpu_time_limit=0.5,
+    )
+    assert cpu.returncode is None
+    assert cpu.answer is None
+    assert cpu.elapsed < 10
+
+
+@pytest.mark.skipif(shutil.which("true") is None, reason="true is required")
+@pytest.mark.parametrize("gnu_time", [False, True])
+@pytest.mark.parametrize("output_limit", [None, 1 << 20])
+def test_measure_command_overhead(
+    gnu_time: bool,
+    output_limit: int | None,
+    mocker: MockerFixture,
+    record_property: Callable[[str, object], None],
+):
+    """Micro-benchmark of the time to run a test case which does nothing."""
+    # Look up GNU time before spying, because the lookup also runs processes.
+    new_session = gnu_time and gnu.time_command() is not None
+    popen = mocker.spy(subprocess.Popen, "__init__")
+    posix_spawn = mocker.spy(subprocess.Popen, "_posix_spawn")
+    count = 50
+    prepared = PreparedCommand.prepare(["true"])
+    for name, command in [("prepared", prepared), ("unprepared", ["true"])]:
+        begin = time.perf_counter()
+        for _ in range(count):
+            info = measure_command(
+                command, timeout=30, gnu_time=gnu_time, output_limit=output_limit
+            )
+            assert info.returncode == 0
+        overhead = (time.perf_counter() - begin) / count
+        record_property(f"{name}_overhead_per_case", overhead)
+        assert overhead < 1
+
+    # Without preexec_fn, the child is spawned with vfork(2) even in a new session.
+    assert popen.call_count == 2 * count
+    for call in popen.call_args_list:
+        assert call.kwargs.get("preexec_fn") is None
+        assert call.kwargs["start_new_session"] is new_session
+    if new_session or not getattr(subprocess, "_USE_POSIX_SPAWN", False):
+        posix_spawn.assert_not_called()
+    else:
+        assert posix_spawn.call_count == 2 * count
+
+
+def test_default_output_limit(testtemp: pathlib.Path):
+    (testtemp / "small.out").write_bytes(b"1\n")
+    with (testtemp / "large.out").open("wb") as fp:
+        fp.truncate(MIN_OUTPUT_LIMIT)
+    assert default_output_limit(testtemp / "small.out") == MIN_OUTPUT_LIMIT
+    assert (
+        default_output_limit(testtemp / "large.out")
+        == OUTPUT_LIMIT_FACTOR * MIN_OUTPUT_LIMIT
+    )
+    assert default_output_limit(testtemp / "missing.out") is None
+
+
+@pytest.mark.parametrize(
+    ("mock_judge", "output_limit", "expected"),
+    [
+        (None, None, MIN_OUTPUT_LIMIT),
+        (None, 100, 100),
+        (True, None, None),
+        (True, 100, 100),
+    ],
+    indirect=["mock_judge"],
+)
+def test_single_case_output_limit(
+    output_limit: int | None,
+    expected: int | None,
+    mocker: MockerFixture,
+    mock_judge: Problem,
+    testtemp: pathlib.Path,
+):
+    measure = mocker.patch(
+        "competitive_verifier.oj.oj_test.measure_command",
+        return_value=OjExecInfo(answer="2\n", elapsed=1.0, memory=None, returncode=0),
+    )
+    input_path = testtemp / "infile"
+    input_path.write_bytes(b"1 1\n")
+    output_path = testtemp / "outfile"
+    output_path.write_bytes(b"2\n")
+
+    single_case(
+        "case",
+        test_input_path=input_path,
+        test_output_path=output_path,
+        args=OjTestArguments(
+            command="dummy",
+            problem=mock_judge,
+            error=None,
+            mle=None,
+            tle=None,
+            output_limit=output_limit,
+        ),
+    )
+    assert measure.call_args.kwargs["output_limit"] == expected
+
+
 def test_single_case_error(
     mocker: MockerFixture,
     mock_judge: Problem,
@@ -992,7 +1204,8 @@ def test_single_case_error(
                 LogComparer(
                     "Failed to run: OjTestArguments(command='" + cmd + "', "
                     "problem=AOJProblem.from_url('http://judge.u-aizu.ac.jp/onlinejudge/description.jsp?id=1'), "
-                    "tle=None, mle=None, error=None, env=None, deadline=inf)",
+                    "tle=None, mle=None, error=None, env=None, deadline=inf, output_limit=None, enforce_limits=False, "
+                    "keep_answers=None)",
                     level=logging.ERROR,
                     github=GitHubMessageParams(),
                 ),
@@ -1019,7 +1232,8 @@ def test_single_case_error(
             assert caplog.records[2] == LogComparer(
                 "Failed to run: OjTestArguments(command='git', "
                 "problem=AOJProblem.from_url('http://judge.u-aizu.ac.jp/onlinejudge/description.jsp?id=1'), "
-                "tle=None, mle=None, error=None, env=None, deadline=inf)",
+                "tle=None, mle=None, error=None, env=None, deadline=inf, output_limit=None, enforce_limits=False, "
+                "keep_answers=None)",
                 level=logging.ERROR,
                 github=GitHubMessageParams(),
             )
@@ -1156,7 +1370,12 @@ def test_timeout(
 class TestMeasureCommand:
     @pytest.fixture
     def mock_run(self, mocker: MockerFixture, request: pytest.FixtureRequest):
-        mocker.patch("shutil.which", side_effect=lambda cmd: cmd == "dummy_command")  # pyright: ignore[reportUnknownLambdaType]
+        mocker.patch(
+            "shutil.which",
+            side_effect=lambda cmd, path=None: (  # pyright: ignore[reportUnknownLambdaType]
+                "/bin/dummy_command" if cmd == "dummy_command" else None
+            ),
+        )
         ret = getattr(request, "param", None)
         if ret is None:
             ret = CompletedProcess[str]("dummy_command 1", returncode=0)
@@ -1235,6 +1454,50 @@ class TestMeasureCommand:
             assert mock_run.call_args.kwargs["start_new_session"] is True
             mock_run.reset_mock()
 
+    @pytest.mark.skipif(sys.platform == "win32", reason="No rlimit on Windows")
+    def test_limits(
+        self,
+        mocker: MockerFixture,
+        mock_run: MockType,
+        subtests: pytest.Subtests,
+    ):
+        import resource  # noqa: PLC0415
+
+        mocker.patch(
+            "resource.getrlimit",
+            return_value=(resource.RLIM_INFINITY, resource.RLIM_INFINITY),
+        )
+        limited = [
+            "/bin/sh",
+            "-c",
+            "ulimit -S -v 262144 && ulimit -H -v 262144 && "
+            'ulimit -S -t 2 && ulimit -H -t 3 && exec "$@"',
+            "sh",
+            "dummy_command",
+        ]
+
+        with subtests.test(msg="gnu_time=False"):
+            measure_command(
+                "dummy_command", gnu_time=False, memory_limit=256, cpu_time_limit=1.5
+            )
+            assert mock_run.call_args.args == (limited,)
+            assert mock_run.call_args.kwargs["executable"] is None
+            assert "preexec_fn" not in mock_run.call_args.kwargs
+            mock_run.reset_mock()
+
+        with (
+            subtests.test(msg="gnu_time=True"),
+            mock.patch(
+                "competitive_verifier.oj.gnu.time_command", return_value="dummy_time"
+            ),
+        ):
+            measure_command(
+                "dummy_command", gnu_time=True, memory_limit=256, cpu_time_limit=1.5
+            )
+            assert mock_run.call_args.args[0][-len(limited) - 1 :] == ["--", *limited]
+            assert "preexec_fn" not in mock_run.call_args.kwargs
+            mock_run.reset_mock()
+
     @pytest.mark.parametrize(
         ("cmd", "expected"),
         [
@@ -1285,6 +1548,28 @@ class TestMeasureCommand:
         mock_run.assert_called_once()
         assert mock_run.call_args.kwargs["env"] == expected_env
 
+    def test_prepared(self, mocker: MockerFixture, mock_run: MockType):
+        mocker.patch.dict(os.environ, {"FOO": "1"}, clear=True)
+        prepared = PreparedCommand.prepare("dummy_command -- a", env={"BAR": "2"})
+        assert prepared == PreparedCommand(
+            command=["dummy_command", "--", "a"],
+            executable="/bin/dummy_command",
+            env={"FOO": "1", "BAR": "2"},
+        )
+
+        which = mocker.patch("shutil.which")
+        for _ in range(3):
+            measure_command(prepared, env={"BAZ": "3"}, gnu_time=False)
+            assert mock_run.call_args.args == (["dummy_command", "--", "a"],)
+            assert mock_run.call_args.kwargs["executable"] == "/bin/dummy_command"
+            assert mock_run.call_args.kwargs["env"] == {"FOO": "1", "BAR": "2"}
+        which.assert_not_called()
+
+    @pytest.mark.parametrize("cmd", ["", ":no_exists:"])
+    def test_prepare_error(self, cmd: str):
+        with pytest.raises(CaseExecutionError):
+            PreparedCommand.prepare(cmd)
+
 
 test_oj_test_params: dict[str, tuple[dict[str, Any], OjTestArguments]] = {
     "default": (
@@ -1339,7 +1624,10 @@ def test_oj_test(
         "competitive_verifier.oj.problem.LibraryCheckerProblem.checker_exe_name",
         "mockcheck",
     )
-    run = mocker.patch("competitive_verifier.oj.oj_test._run")
+    run = mocker.patch(
+        "competitive_verifier.oj.oj_test._run",
+        return_value=EMPTY_TEST_RESULT,
+    )
 
     oj.test(**args)
 
@@ -1372,7 +1660,9 @@ def test_oj_test_run(mocker: MockerFixture, subtests: pytest.Subtests):
         "competitive_verifier.oj.oj_test.single_case",
         side_effect=infinite_case,
     )
-    mock_summarize = mocker.patch("competitive_verifier.oj.oj_test.summarize")
+    mock_summarize = mocker.patch(
+        "competitive_verifier.oj.oj_test.summarize", return_value=EMPTY_TEST_RESULT
+    )
 
     with subtests.test(msg="empty"):
         oj.test(
@@ -1383,7 +1673,7 @@ def test_oj_test_run(mocker: MockerFixture, subtests: pytest.Subtests):
             mle=None,
             error=None,
         )
-        mock_summarize.assert_called_once_with([])
+        mock_summarize.assert_called_once_with(CaseResults())
 
     with subtests.test(msg="three"):
         mock_summarize.reset_mock()
@@ -1405,19 +1695,70 @@ def test_oj_test_run(mocker: MockerFixture, subtests: pytest.Subtests):
             error=None,
         )
         mock_summarize.assert_called_once_with(
+            CaseResults(
+                [
+                    make_result(name="case1", status=JudgeStatus.AC),
+                    make_result(name="case2", status=JudgeStatus.AC),
+                    make_result(name="case3", status=JudgeStatus.AC),
+                ]
+            )
+        )
+
+
+@pytest.mark.allow_mkdir
+def test_oj_test_keep_answers(mocker: MockerFixture, testtemp: pathlib.Path):
+    mocker.patch(
+        "competitive_verifier.oj.oj_test.measure_command",
+        side_effect=[
+            OjExecInfo(answer="2\n", elapsed=1.0, memory=None, returncode=0),
+            OjExecInfo(answer="3\n", elapsed=1.0, memory=None, returncode=0),
+        ],
+    )
+    (testtemp / "in").write_text("1 1\n")
+    (testtemp / "out").write_text("2\n")
+    answers = testtemp / "answers"
+
+    def run(problem: MockCasesProblem):
+        oj.test(
+            problem=problem,
+            command="dummy",
+            env=None,
+            tle=None,
+            mle=None,
+            error=None,
+            keep_answers=answers,
+        )
+        return {d for d in answers.iterdir() if d.is_dir()}
+
+    first = run(
+        MockCasesProblem(
             [
-                make_result(name="case1", status=JudgeStatus.AC),
-                make_result(name="case2", status=JudgeStatus.AC),
-                make_result(name="case3", status=JudgeStatus.AC),
+                SystemTestCaseFile(
+                    name=f"c{i}",
+                    input_path=testtemp / "in",
+                    output_path=testtemp / "out",
+                )
+                for i in range(2)
             ]
         )
+    )
+    assert len(first) == 1
+    (answer_dir,) = first
+    assert sorted(p.name for p in answer_dir.iterdir()) == ["c0.out", "c1.out"]
+    assert (answer_dir / "c0.out").read_text() == "2\n"
+    assert (answer_dir / "c1.out").read_text() == "3\n"
+
+    # Each run saves the answers to its own directory.
+    assert len(run(MockCasesProblem([])) - first) == 1
 
 
 def test_compare_answer_too_large_error(
     mocker: MockerFixture,
     caplog: pytest.LogCaptureFixture,
 ):
-    mocker.patch("competitive_verifier.oj.oj_test.summarize")
+    mocker.patch(
+        "competitive_verifier.oj.oj_test.summarize", return_value=EMPTY_TEST_RESULT
+    )
 
     oj.test(
         problem=MockCasesProblem([]),
@@ -1447,7 +1788,7 @@ def test_compare_answer_too_large_error(
     ]
 
 
-EXPECTED_CASES = cast("list[OjTestcaseResult]", ...)
+EXPECTED_CASES = cast("CaseResults", ...)
 test_summarize_params = [
     pytest.param(
         [],
@@ -1530,16 +1871,16 @@ test_summarize_params = [
         ],
         OjTestResult(
             is_success=False,
-            elapsed=(3 * len(JudgeStatus) - 1) * (3 * len(JudgeStatus)) / 2 / 2,
-            slowest=(3 * len(JudgeStatus) - 1) / 2,
-            heaviest=(3 * len(JudgeStatus) - 1) * 1.5,
+            elapsed=20 * 21 / 2 / 2,
+            slowest=20 / 2,
+            heaviest=20 * 1.5,
             testcases=EXPECTED_CASES,
         ),
         [
-            LogComparer("slowest: 7.000000 sec  (for case14)"),
-            LogComparer("max memory: 21.000000 MB  (for case14)"),
+            LogComparer("slowest: 10.000000 sec  (for case20)"),
+            LogComparer("max memory: 30.000000 MB  (for case20)"),
             LogComparer(
-                "\x1b[31mFAILURE\x1b[39m 1 AC, 2 WA, 3 RE, 4 TLE, 5 MLE / 15 cases",
+                "\x1b[31mFAILURE\x1b[39m 1 AC, 2 WA, 3 RE, 4 TLE, 5 MLE, 6 OLE / 21 cases",
             ),
         ],
         id="statuses",
@@ -1555,8 +1896,8 @@ def test_summarize(
     caplog: pytest.LogCaptureFixture,
 ):
     caplog.set_level(0)
-    expected.testcases = history
-    assert summarize(history) == expected
+    expected.testcases = CaseResults(history)
+    assert summarize(CaseResults(history)) == expected
     assert caplog.records == expected_log
 
 
@@ -0,0 +1,160 @@
+import pathlib
+
+import pytest
+from pytest_mock import MockerFixture
+
+from competitive_verifier.models import ShellCommand
+from competitive_verifier.oj.languages.python import (
+    PythonLanguage,
+    PythonLanguageEnvironment,
+    _PythonImportGraph,  # pyright: ignore[reportPrivateUsage]
+)
+
+FILES = {
+    "main.py": """
+import os
+import sys
+import lib
+import lib.a
+from lib import b
+from lib.c import func
+from lib.pkg import *
+import missing
+
+def f():
+    from lib import nested
+""",
+    "lib/__init__.py": "",
+    "lib/a.py": "from . import b\nfrom .b import symbol\n",
+    "lib/b.py": "from .a import *\nfrom .. import main\n",
+    "lib/c.py": "def func(): ...\n",
+    "lib/nested.py": "",
+    "lib/pkg/__init__.py": "from ..c import func\n",
+    "lib/broken.py": "import lib.a\ndef (",
+}
+
+
+@pytest.fixture
+def basedir(testtemp: pathlib.Path) -> pathlib.Path:
+    for name, content in FILES.items():
+        path = testtemp / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding="utf-8")
+    return testtemp.resolve()
+
+
+@pytest.mark.allow_mkdir
+@pytest.mark.parametrize(
+    ("path", "expected"),
+    [
+        (
+            "main.py",
+            [
+                "lib/__init__.py",
+                "lib/a.py",
+                "lib/b.py",
+                "lib/c.py",
+                "lib/nested.py",
+                "lib/pkg/__init__.py",
+                "main.py",
+            ],
+        ),
+        ("lib/a.py", ["lib/a.py", "lib/b.py"]),
+        ("lib/b.py", ["lib/a.py", "lib/b.py", "main.py"]),
+        ("lib/c.py", ["lib/c.py"]),
+        ("lib/pkg/__init__.py", ["lib/c.py", "lib/pkg/__init__.py"]),
+        ("lib/broken.py", ["lib/broken.py"]),
+    ],
+)
+def test_list_dependencies(path: str, expected: list[str], basedir: pathlib.Path):
+    assert PythonLanguage().list_dependencies(basedir / path, basedir=basedir) == [
+        basedir / e for e in expected
+    ]
+
+
+@pytest.mark.allow_mkdir
+def test_import_graph_parse_once(basedir: pathlib.Path, mocker: MockerFixture):
+    graph = _PythonImportGraph(basedir)
+    parse = mocker.spy(_PythonImportGraph, "_imports")
+
+    for _ in range(2):
+        assert graph.dependencies(basedir / "lib/a.py") == {basedir / "lib/b.py"}
+        assert graph.dependencies(basedir / "lib/b.py") == {
+            basedir / "lib/a.py",
+            basedir / "main.py",
+        }
+    assert parse.call_count == 2
+
+
+@pytest.mark.allow_mkdir
+def test_import_graph_outside_basedir(basedir: pathlib.Path):
+    graph = _PythonImportGraph(basedir / "lib")
+    assert graph.dependencies(basedir / "lib/b.py") == {basedir / "lib/a.py"}
+
+
+@pytest.mark.allow_mkdir
+def test_import_graph_transitive(basedir: pathlib.Path):
+    graph = _PythonImportGraph(basedir)
+    assert graph.transitive_dependencies(basedir / "lib/pkg/__init__.py") == {
+        basedir / "lib/c.py"
+    }
+    # Cycles: lib/a.py -> lib/b.py -> main.py -> lib/a.py
+    assert graph.transitive_dependencies(basedir / "lib/a.py") == {
+        basedir / "lib/__init__.py",
+        basedir / "lib/b.py",
+        basedir / "lib/c.py",
+        basedir / "lib/nested.py",
+        basedir / "lib/pkg/__init__.py",
+        basedir / "main.py",
+    }
+
+
+@pytest.mark.allow_mkdir
+def test_compile_command(
+    basedir: pathlib.Path, monkeypatch: pytest.MonkeyPatch, mocker: MockerFixture
+):
+    monkeypatch.delenv("PYTHONPATH", raising=False)
+    (basedir / "solve.py").write_text(
+        "# competitive-verifier: STANDALONE\nfrom lib.c import func\n",
+        encoding="utf-8",
+    )
+    (basedir / "ignored.py").write_text(
+        "# competitive-verifier: STANDALONE\n# competitive-verifier: IGNORE\n",
+        encoding="utf-8",
+    )
+    (basedir / "main.py").write_text(
+        "# competitive-verifier: PROBLEM https://judge.yosupo.jp/problem/aplusb\n"
+        + FILES["main.py"],
+        encoding="utf-8",
+    )
+    mocker.patch(
+        "competitive_verifier.git.ls_files",
+        return_value={basedir / name for name in [*FILES, "solve.py", "ignored.py"]},
+    )
+    env = PythonLanguageEnvironment()
+    pycache_prefix = str(basedir / ".competitive-verifier/cache/pycache")
+    env_vars = {"PYTHONPATH": str(basedir), "PYTHONPYCACHEPREFIX": pycache_prefix}
+    compile_all = (
+        "python -m compileall -q lib/__init__.py lib/a.py lib/b.py lib/c.py"
+        " lib/nested.py lib/pkg/__init__.py main.py solve.py"
+    )
+
+    PythonLanguage().close()
+    assert env.get_compile_command(
+        pathlib.Path("solve.py"), basedir=basedir, tempdir=basedir / "tmp"
+    ) == ShellCommand(
+        command=f"{compile_all} || python -m compileall -q solve.py lib/c.py",
+        env=env_vars,
+    )
+
+    # Not imported by any verification file
+    assert env.get_compile_command(
+        pathlib.Path("ignored.py"), basedir=basedir, tempdir=basedir / "tmp"
+    ) == ShellCommand(
+        command=["python", "-m", "compileall", "-q", "ignored.py"],
+        env=env_vars,
+    )
+    assert env.get_execute_command(
+        pathlib.Path("solve.py"), basedir=basedir, tempdir=basedir / "tmp"
+    ) == ShellCommand(command=["python", "solve.py"], env=env_vars)
+    PythonLanguage().close()
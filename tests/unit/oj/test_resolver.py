@@ -0,0 +1,89 @@
+import pathlib
+
+import pytest
+from pytest_mock import MockerFixture
+from pytest_mock.plugin import MockType
+
+from competitive_verifier.models import AddtionalSource
+from competitive_verifier.oj.languages import (
+    PythonLanguage,
+    UserDefinedLanguage,
+    VerificationConfig,
+)
+from competitive_verifier.oj.languages.user_defined import OjVerifyUserDefinedConfig
+from competitive_verifier.oj.resolver import (
+    OjResolver,
+    _bundle_digest,  # pyright: ignore[reportPrivateUsage]
+)
+
+FILES = [pathlib.Path("lib.py"), pathlib.Path("main.py"), pathlib.Path("never.py")]
+
+
+@pytest.fixture
+def mock_python(mocker: MockerFixture):
+    def _ls_files(*args: pathlib.Path | str) -> list[pathlib.Path]:
+        return [pathlib.Path(p) for p in args] or FILES
+
+    def _list_dependencies(
+        path: pathlib.Path, *, basedir: pathlib.Path
+    ) -> list[pathlib.Path]:
+        if path == pathlib.Path("main.py"):
+            return [path, pathlib.Path("lib.py")]
+        return [path]
+
+    def _bundle(path: pathlib.Path, *, basedir: pathlib.Path) -> bytes:
+        return path.read_bytes()
+
+    mocker.patch("competitive_verifier.git.ls_files", side_effect=_ls_files)
+    mocker.patch.object(
+        PythonLanguage, "list_dependencies", side_effect=_list_dependencies
+    )
+    return mocker.patch.object(PythonLanguage, "bundle", side_effect=_bundle)
+
+
+@pytest.mark.allow_mkdir
+def test_resolve_bundle(testtemp: pathlib.Path, mock_python: MockType):
+    (testtemp / "lib.py").write_text("a = 1\n", encoding="utf-8")
+    (testtemp / "main.py").write_text("import lib\n", encoding="utf-8")
+    (testtemp / "never.py").write_text(
+        "# competitive-verifier: DISPLAY never\n", encoding="utf-8"
+    )
+
+    def _resolve_bundled() -> list[pathlib.Path]:
+        mock_python.reset_mock()
+        resolved = OjResolver(
+            include=[], exclude=[], config=VerificationConfig()
+        ).resolve(bundle=True)
+        assert resolved.files[pathlib.Path("never.py")].additonal_sources == []
+        assert resolved.files[pathlib.Path("main.py")].additonal_sources == [
+            AddtionalSource(
+                name="bundled",
+                path=pathlib.Path(".competitive-verifier/bundled/main.py"),
+            )
+        ]
+        return sorted(c.args[0] for c in mock_python.call_args_list)
+
+    assert _resolve_bundled() == [pathlib.Path("lib.py"), pathlib.Path("main.py")]
+    assert _resolve_bundled() == []
+
+    # A dependency is updated
+    (testtemp / "lib.py").write_text("a = 2\n", encoding="utf-8")
+    assert _resolve_bundled() == [pathlib.Path("lib.py"), pathlib.Path("main.py")]
+
+
+@pytest.mark.allow_mkdir
+def test_bundle_digest(testtemp: pathlib.Path):
+    (testtemp / "main.awk").write_text("{ print }\n", encoding="utf-8")
+    paths = {pathlib.Path("main.awk")}
+
+    def _digest(bundle: str, basedir: pathlib.Path = testtemp) -> str:
+        language = UserDefinedLanguage(
+            extension="awk",
+            config=OjVerifyUserDefinedConfig(execute="awk -f {path}", bundle=bundle),
+        )
+        return _bundle_digest(paths, language=language, basedir=basedir)
+
+    digest = _digest("cat {path}")
+    assert _digest("cat {path}") == digest
+    assert _digest("cat -A {path}") != digest
+    assert _digest("cat {path}", basedir=testtemp / "other") != digest
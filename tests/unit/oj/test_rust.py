@@ -0,0 +1,132 @@
+import json
+import pathlib
+from typing import Any
+
+import pytest
+from pytest_mock import MockerFixture
+
+from competitive_verifier.models import ShellCommand
+from competitive_verifier.oj.languages.rust import (
+    RustLanguageEnvironment,
+    _run_cargo_metadata,  # pyright: ignore[reportPrivateUsage]
+)
+
+
+def _metadata(root: pathlib.Path) -> dict[str, Any]:
+    return {
+        "workspace_root": str(root),
+        "target_directory": str(root / "target"),
+        "workspace_members": ["app"],
+        "packages": [
+            {
+                "id": "app",
+                "source": None,
+                "manifest_path": str(root / "app/Cargo.toml"),
+                "targets": [
+                    {
+                        "name": "a",
+                        "kind": ["bin"],
+                        "src_path": str(root / "app/src/bin/a.rs"),
+                    },
+                    {
+                        "name": "b",
+                        "kind": ["example"],
+                        "src_path": str(root / "app/examples/b.rs"),
+                    },
+                    {
+                        "name": "c",
+                        "kind": ["bin"],
+                        "src_path": str(root / "app/src/bin/c.rs"),
+                    },
+                ],
+            },
+            {
+                "id": "proconio",
+                "source": "registry+https://github.com/rust-lang/crates.io-index",
+                "manifest_path": "/cargo/registry/proconio/Cargo.toml",
+                "targets": [],
+            },
+        ],
+    }
+
+
+@pytest.fixture
+def workspace(testtemp: pathlib.Path) -> pathlib.Path:
+    root = testtemp.resolve()
+    for name, content in {
+        "Cargo.toml": "",
+        "Cargo.lock": "",
+        "app/Cargo.toml": "",
+        "app/src/bin/a.rs": "// competitive-verifier: PROBLEM https://judge.yosupo.jp/problem/aplusb",
+        "app/examples/b.rs": "// competitive-verifier: STANDALONE",
+        "app/src/bin/c.rs": "fn main() {}",
+    }.items():
+        (root / name).parent.mkdir(parents=True, exist_ok=True)
+        (root / name).write_text(content, encoding="utf-8")
+    return root
+
+
+@pytest.mark.allow_mkdir
+def test_cargo_metadata_cache(workspace: pathlib.Path, mocker: MockerFixture):
+    command_stdout = mocker.patch(
+        "competitive_verifier.oj.languages.rust.command_stdout",
+        return_value=json.dumps(_metadata(workspace)),
+    )
+    cargo_version = mocker.patch(
+        "competitive_verifier.oj.languages.rust._cargo_version",
+        return_value="cargo 1.80.0",
+    )
+
+    for manifest_path in [workspace / "Cargo.toml", workspace / "app/Cargo.toml"]:
+        for _ in range(2):
+            assert _run_cargo_metadata(manifest_path) == _metadata(workspace)
+    assert command_stdout.call_count == 2
+
+    for name in ["Cargo.lock", "app/Cargo.toml"]:
+        (workspace / name).write_text("updated " + name, encoding="utf-8")
+        command_stdout.reset_mock()
+        _run_cargo_metadata(workspace / "Cargo.toml")
+        _run_cargo_metadata(workspace / "Cargo.toml")
+        command_stdout.assert_called_once()
+
+    # The cache is not used by another version of cargo
+    cargo_version.return_value = "cargo 1.81.0"
+    command_stdout.reset_mock()
+    _run_cargo_metadata(workspace / "Cargo.toml")
+    _run_cargo_metadata(workspace / "Cargo.toml")
+    command_stdout.assert_called_once()
+
+
+@pytest.mark.allow_mkdir
+def test_compile_command(workspace: pathlib.Path, mocker: MockerFixture):
+    mocker.patch(
+        "competitive_verifier.oj.languages.rust._cargo_metadata",
+        return_value=_metadata(workspace),
+    )
+    mocker.patch.dict(
+        "competitive_verifier.oj.languages.rust._verified_targets_by_workspace",
+        clear=True,
+    )
+    env = RustLanguageEnvironment()
+    commands = [
+        env.get_compile_command(
+            pathlib.Path(path), basedir=workspace, tempdir=workspace / "tmp"
+        )
+        for path in ["app/src/bin/a.rs", "app/examples/b.rs", "app/src/bin/c.rs"]
+    ]
+    build_all = "cargo build --release --workspace --bin a --example b"
+    assert commands == [
+        ShellCommand(
+            command=f"{build_all} || cargo build --release --bin a",
+            cwd=workspace / "app/src/bin",
+        ),
+        ShellCommand(
+            command=f"{build_all} || cargo build --release --example b",
+            cwd=workspace / "app/examples",
+        ),
+        # Not verified
+        ShellCommand(
+            command=["cargo", "build", "--release", "--bin", "c"],
+            cwd=workspace / "app/src/bin",
+        ),
+    ]
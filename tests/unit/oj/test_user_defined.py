@@ -0,0 +1,181 @@
+import pathlib
+import sys
+
+import pytest
+from pytest_mock import MockerFixture
+
+from competitive_verifier.oj.languages import (
+    OjVerifyUserDefinedConfig,
+    UserDefinedLanguage,
+)
+from competitive_verifier.oj.languages.user_defined import (
+    _tracked_files_by_suffix,  # pyright: ignore[reportPrivateUsage]
+)
+
+
+def test_list_dependencies_fallback(mocker: MockerFixture):
+    _tracked_files_by_suffix.cache_clear()
+    ls_files = mocker.patch(
+        "competitive_verifier.git.ls_files",
+        return_value={
+            pathlib.Path("lib/b.awk"),
+            pathlib.Path("lib/a.awk"),
+            pathlib.Path("lib/a.sed"),
+            pathlib.Path("README.md"),
+        },
+    )
+    awk = UserDefinedLanguage(
+        extension="awk",
+        config=OjVerifyUserDefinedConfig(execute="awk -f {path}"),
+    )
+    sed = UserDefinedLanguage(
+        extension="sed",
+        config=OjVerifyUserDefinedConfig(execute="sed -f {path}"),
+    )
+    basedir = pathlib.Path()
+
+    for path in ["lib/a.awk", "lib/b.awk"]:
+        assert awk.list_dependencies(pathlib.Path(path), basedir=basedir) == [
+            pathlib.Path("lib/a.awk"),
+            pathlib.Path("lib/b.awk"),
+        ]
+    assert sed.list_dependencies(pathlib.Path("lib/a.sed"), basedir=basedir) == [
+        pathlib.Path("lib/a.sed"),
+    ]
+    ls_files.assert_called_once_with(basedir.resolve())
+
+    # The next resolve lists the files again
+    awk.close()
+    sed.close()
+    awk.list_dependencies(pathlib.Path("lib/a.awk"), basedir=basedir)
+    assert ls_files.call_count == 2
+
+
+BATCH_SCRIPT = """
+import json, pathlib, sys
+
+with pathlib.Path("started.txt").open("a") as fp:
+    fp.write("started\\n")
+for line in sys.stdin:
+    req = json.loads(line)
+    path = req["path"]
+    if req["kind"] == "attributes":
+        res = {"attributes": {"TITLE": path}}
+    elif req["kind"] == "dependencies":
+        res = {"dependencies": ["lib.awk"]}
+    else:
+        res = {"bundle": None if path == "b.awk" else "bundled " + path}
+    print(json.dumps(res), flush=True)
+"""
+
+
+@pytest.mark.allow_mkdir
+def test_batch(testtemp: pathlib.Path):
+    (testtemp / "batch.py").write_text(BATCH_SCRIPT, encoding="utf-8")
+    language = UserDefinedLanguage(
+        extension="awk",
+        config=OjVerifyUserDefinedConfig(
+            execute="awk -f {path}",
+            list_attributes="echo 'TITLE command'",
+            batch=[sys.executable, "{basedir}/batch.py"],
+        ),
+    )
+    basedir = pathlib.Path()
+    try:
+        for name in ["a.awk", "b.awk"]:
+            path = pathlib.Path(name)
+            assert language.list_dependencies(path, basedir=basedir) == [
+                path,
+                pathlib.Path("lib.awk"),
+            ]
+            # The command of each hook takes precedence over the batch
+            assert language.list_attributes(path, basedir=basedir) == {
+                "TITLE": "command"
+            }
+        assert language.bundle(pathlib.Path("a.awk"), basedir=basedir) == (
+            b"bundled a.awk"
+        )
+        assert language.bundle(pathlib.Path("b.awk"), basedir=basedir) is None
+    finally:
+        language.close()
+
+    assert (testtemp / "started.txt").read_text(encoding="utf-8") == "started\n"
+
+
+@pytest.mark.parametrize(
+    "script",
+    [
+        "pass",
+        "import sys; sys.stdin.readline(); print('not json', flush=True)",
+        "import sys; sys.stdin.readline(); print('{{\"dependencies\": 1}}', flush=True)",
+    ],
+    ids=["exited", "malformed", "invalid"],
+)
+@pytest.mark.allow_mkdir
+def test_batch_failed(
+    script: str,
+    testtemp: pathlib.Path,
+    mocker: MockerFixture,
+    caplog: pytest.LogCaptureFixture,
+):
+    mocker.patch(
+        "competitive_verifier.git.ls_files", return_value={pathlib.Path("a.awk")}
+    )
+    language = UserDefinedLanguage(
+        extension="awk",
+        config=OjVerifyUserDefinedConfig(
+            execute="awk -f {path}",
+            batch=[sys.executable, "-c", script],
+        ),
+    )
+    path = pathlib.Path("a.awk")
+    try:
+        for _ in range(2):
+            assert language.list_dependencies(path, basedir=testtemp) == [path]
+        assert language._batch_process is None  # noqa: SLF001  # pyright: ignore[reportPrivateUsage]
+    finally:
+        language.close()
+
+    messages = [r.getMessage() for r in caplog.records]
+    assert messages == [
+        "The batch process of .awk files failed. Fall back to the commands for each file.",
+        "The functionality to list dependencies of .awk file is not implemented yet.",
+    ]
+
+
+HANGING_BATCH_SCRIPT = """
+import json, sys, time
+
+for line in sys.stdin:
+    if json.loads(line)["kind"] == "dependencies":
+        time.sleep(60)
+    print(json.dumps({"attributes": {"TITLE": "batch"}}), flush=True)
+"""
+
+
+@pytest.mark.allow_mkdir
+def test_batch_timeout(testtemp: pathlib.Path, mocker: MockerFixture):
+    mocker.patch("competitive_verifier.oj.languages.user_defined.BATCH_TIMEOUT", 0.5)
+    (testtemp / "batch.py").write_text(HANGING_BATCH_SCRIPT, encoding="utf-8")
+    (testtemp / "a.awk").write_text(
+        "# competitive-verifier: TITLE comment\n", encoding="utf-8"
+    )
+    mocker.patch(
+        "competitive_verifier.git.ls_files", return_value={pathlib.Path("a.awk")}
+    )
+    language = UserDefinedLanguage(
+        extension="awk",
+        config=OjVerifyUserDefinedConfig(
+            execute="awk -f {path}",
+            batch=[sys.executable, "{basedir}/batch.py"],
+        ),
+    )
+    basedir = pathlib.Path()
+    path = pathlib.Path("a.awk")
+    try:
+        assert language.list_attributes(path, basedir=basedir) == {"TITLE": "batch"}
+        # The hanging process is killed and the fallback for each file is used
+        assert language.list_dependencies(path, basedir=basedir) == [path]
+        assert language.list_attributes(path, basedir=basedir) == {"TITLE": "comment"}
+    finally:
+        language.close()
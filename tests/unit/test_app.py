@@ -1,12 +1,18 @@
+import json
 import math
 import pathlib
 import re
+import subprocess
+import sys
 from typing import Any
 
 import pytest
 from pytest_mock import MockerFixture
 
 from competitive_verifier import app
+from competitive_verifier.app import (
+    _SUBCOMMANDS,  # pyright: ignore[reportPrivateUsage]
+)
 from competitive_verifier.arg import COMPETITIVE_VERIFY_FILES_PATH
 
 
@@ -29,6 +35,52 @@ def test_result(return_value: bool, expected: int, mocker: MockerFixture):
     assert app.main(["download"]) == expected
 
 
+@pytest.mark.parametrize("name", _SUBCOMMANDS)
+def test_subcommand_help(name: str):
+    s = _SUBCOMMANDS[name]
+    assert s.load().get_subcommand_info() == {"name": name, "help": s.help}
+
+
+HEAVY_MODULES = [
+    "charset_normalizer",
+    "requests",
+    "yaml",
+    "competitive_verifier.oj.languages",
+]
+
+test_import_modules_params: list[tuple[list[str], list[str]]] = [
+    ([], []),
+    (["check", "result.json"], []),
+    (["merge-result", "result.json"], []),
+    (["merge-input", "verify_files.json"], []),
+    (["verify", "--verify-json", "verify_files.json"], []),
+    (["download"], []),
+    (["docs", "--verify-json", "verify_files.json", "result.json"], ["yaml"]),
+]
+
+
+@pytest.mark.parametrize(
+    ("args", "expected"),
+    test_import_modules_params,
+    ids=[" ".join(t[0]) for t in test_import_modules_params],
+)
+def test_import_modules(args: list[str], expected: list[str]):
+    # Run in a new interpreter because this process has imported everything.
+    code = f"""
+import json, sys
+from competitive_verifier import app
+app.ArgumentParser().parse({args!r})
+print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))
+"""
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    assert json.loads(out) == expected
+
+
 test_parse_args_params: list[
     tuple[dict[str, str] | None, list[str], dict[str, Any]]
 ] = [
@@ -40,12 +92,20 @@ test_parse_args_params: list[
             "subcommand": "verify",
             "default_mle": None,
             "default_tle": None,
+            "enforce_limits": False,
+            "keep_answers": None,
             "download": True,
             "ignore_error": True,
+            "journal": None,
             "output": None,
             "prev_result": None,
+            "resume": False,
             "split": None,
             "split_index": None,
+            "queue": None,
+            "worker": False,
+            "lookahead": 0,
+            "prefetch": 0,
             "timeout": math.inf,
             "verbose": False,
             "verify_files_json": pathlib.Path(
@@ -67,12 +127,20 @@ test_parse_args_params: list[
             "subcommand": "verify",
             "default_mle": None,
             "default_tle": None,
+            "enforce_limits": False,
+            "keep_answers": None,
             "download": True,
             "ignore_error": True,
+            "journal": None,
             "output": None,
             "prev_result": None,
+            "resume": False,
             "split": None,
             "split_index": None,
+            "queue": None,
+            "worker": False,
+            "lookahead": 0,
+            "prefetch": 0,
             "timeout": math.inf,
             "verbose": False,
             "verify_files_json": pathlib.Path(
@@ -88,12 +156,20 @@ test_parse_args_params: list[
             "subcommand": "verify",
             "default_mle": None,
             "default_tle": None,
+            "enforce_limits": False,
+            "keep_answers": None,
             "download": True,
             "ignore_error": True,
+            "journal": None,
             "output": None,
             "prev_result": None,
+            "resume": False,
             "split": None,
             "split_index": None,
+            "queue": None,
+            "worker": False,
+            "lookahead": 0,
+            "prefetch": 0,
             "timeout": math.inf,
             "verbose": False,
             "verify_files_json": pathlib.Path(
@@ -124,17 +200,31 @@ test_parse_args_params: list[
             ".competitive-verifier/prev.json",
             "--output",
             ".competitive-verifier/out.json",
+            "--journal",
+            ".competitive-verifier/journal.jsonl",
+            "--resume",
+            "--enforce-limits",
+            "--keep-answers",
+            ".competitive-verifier/answers",
         ],
         {
             "subcommand": "verify",
             "default_mle": 1024.5,
             "default_tle": 2.5,
+            "enforce_limits": True,
+            "keep_answers": pathlib.Path(".competitive-verifier/answers"),
             "download": False,
             "ignore_error": False,
+            "journal": pathlib.Path(".competitive-verifier/journal.jsonl"),
             "output": pathlib.Path(".competitive-verifier/out.json"),
             "prev_result": pathlib.Path(".competitive-verifier/prev.json"),
+            "resume": True,
             "split": 6,
             "split_index": 6,
+            "queue": None,
+            "worker": False,
+            "lookahead": 0,
+            "prefetch": 0,
             "timeout": 20.5,
             "verbose": True,
             "verify_files_json": pathlib.Path(
@@ -154,12 +244,20 @@ test_parse_args_params: list[
             "subcommand": "verify",
             "default_mle": None,
             "default_tle": None,
+            "enforce_limits": False,
+            "keep_answers": None,
             "download": True,
             "ignore_error": True,
+            "journal": None,
             "output": pathlib.Path(".competitive-verifier/out.json"),
             "prev_result": None,
+            "resume": False,
             "split": None,
             "split_index": None,
+            "queue": None,
+            "worker": False,
+            "lookahead": 0,
+            "prefetch": 0,
             "timeout": math.inf,
             "verbose": False,
             "verify_files_json": pathlib.Path(
@@ -1,3 +1,4 @@
+import gc
 import pathlib
 from typing import NamedTuple
 
@@ -5,9 +6,12 @@ import pytest
 from pytest_mock import MockerFixture
 
 from competitive_verifier.util import (
+    gc_paused,
     normalize_bytes_text,
     read_text_normalized,
     resolve_referenced_path,
+    to_relative,
+    to_relative_all,
 )
 
 
@@ -134,3 +138,72 @@ def test_normalize_bytes_text(mocker: MockerFixture):
 
     assert normalize_bytes_text(cp932_text) == text
     assert read_text_normalized(pathlib.Path()) == text
+
+
+def test_normalize_bytes_text_utf8(mocker: MockerFixture):
+    from_bytes = mocker.patch("charset_normalizer.from_bytes")
+
+    assert normalize_bytes_text(b"") == ""
+    assert normalize_bytes_text(b"abc\n") == "abc\n"
+    assert normalize_bytes_text("雨ニモマケズ\n".encode()) == "雨ニモマケズ\n"
+    assert normalize_bytes_text(b"\xef\xbb\xbfabc\n") == "abc\n"
+    from_bytes.assert_not_called()
+
+
+def test_read_text_normalized_cache(testtemp: pathlib.Path, mocker: MockerFixture):
+    path = testtemp / "a.txt"
+    path.write_bytes(b"abc\n")
+    read_bytes = mocker.spy(pathlib.Path, "read_bytes")
+
+    assert read_text_normalized(path) == "abc\n"
+    assert read_text_normalized(path) == "abc\n"
+    assert read_bytes.call_count == 1
+
+    path.write_bytes(b"abcd\n")
+    assert read_text_normalized(path) == "abcd\n"
+    assert read_bytes.call_count == 2
+
+
+@pytest.mark.allow_mkdir
+def test_to_relative_all(testtemp: pathlib.Path):
+    (testtemp / "lib").mkdir()
+    (testtemp / "lib/a.py").touch()
+    (testtemp / "lib/link.py").symlink_to(testtemp / "lib/a.py")
+    (testtemp / "outside.py").symlink_to("/foo/outside.py")
+    paths = [
+        pathlib.Path("lib/a.py"),
+        testtemp / "lib/a.py",
+        pathlib.Path("lib/link.py"),
+        pathlib.Path("lib/../lib/a.py"),
+        pathlib.Path("lib/.."),
+        pathlib.Path("outside.py"),
+        pathlib.Path("../other.py"),
+        pathlib.Path("/foo/other.py"),
+    ]
+
+    assert to_relative_all(paths) == {
+        pathlib.Path("lib/a.py"): pathlib.Path("lib/a.py"),
+        testtemp / "lib/a.py": pathlib.Path("lib/a.py"),
+        pathlib.Path("lib/link.py"): pathlib.Path("lib/a.py"),
+        pathlib.Path("lib/../lib/a.py"): pathlib.Path("lib/a.py"),
+        pathlib.Path("lib/.."): pathlib.Path(),
+        pathlib.Path("outside.py"): None,
+        pathlib.Path("../other.py"): None,
+        pathlib.Path("/foo/other.py"): None,
+    }
+    assert to_relative_all(paths) == {p: to_relative(p) for p in paths}
+
+
+def test_gc_paused():
+    assert gc.isenabled()
+    with gc_paused():
+        assert not gc.isenabled()
+    assert gc.isenabled()
+
+    gc.disable()
+    try:
+        with gc_paused():
+            pass
+        assert not gc.isenabled()
+    finally:
+        gc.enable()
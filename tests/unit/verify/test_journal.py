@@ -0,0 +1,167 @@
+import datetime
+import math
+import pathlib
+from typing import Any
+
+import pytest
+
+from competitive_verifier.models import (
+    ConstVerification,
+    FileResult,
+    ResultStatus,
+    VerificationInput,
+    VerificationResult,
+    VerifyCommandResult,
+)
+from competitive_verifier.verify.journal import ResultJournal, journal_key
+from competitive_verifier.verify.verifier import BaseVerifier
+
+SUCCESS = ResultStatus.SUCCESS
+FAILURE = ResultStatus.FAILURE
+
+
+class NotSkippableConstVerification(ConstVerification):
+    @property
+    def is_lightweight(self) -> bool:
+        return False
+
+
+class MockVerifier(BaseVerifier):
+    def __init__(self, varifications: Any) -> None:
+        super().__init__(
+            verifications=VerificationInput.model_validate(varifications),
+            verification_time=datetime.datetime(2007, 1, 2, 15, 4, 5),
+            prev_result=None,
+            split_state=None,
+            default_tle=10,
+            default_mle=256,
+            timeout=math.inf,
+        )
+        self.verified: list[pathlib.Path] = []
+
+    def get_file_timestamp(self, path: pathlib.Path) -> datetime.datetime:
+        return datetime.datetime(2005, 1, 2, 15, 4, 5)
+
+    def _enumerate_verifications(
+        self,
+        p: pathlib.Path,
+        *args: Any,
+        **kwargs: Any,
+    ) -> list[VerificationResult]:
+        self.verified.append(p)
+        return super()._enumerate_verifications(p, *args, **kwargs)
+
+
+VERIFICATIONS = {
+    "files": {
+        "lib/hoge1.py": {},
+        "test/foo.py": {
+            "dependencies": ["lib/hoge1.py"],
+            "verification": [NotSkippableConstVerification(status=SUCCESS)],
+        },
+        "test/bar.py": {
+            "dependencies": ["lib/hoge1.py"],
+            "verification": [NotSkippableConstVerification(status=FAILURE)],
+        },
+        "test/baz.py": {
+            "verification": [NotSkippableConstVerification(status=SUCCESS)],
+        },
+    }
+}
+
+
+def _file_result(status: ResultStatus, elapsed: float = 1.0) -> FileResult:
+    return FileResult(
+        verifications=[
+            VerificationResult(
+                status=status,
+                elapsed=elapsed,
+                last_execution_time=datetime.datetime(
+                    2007, 1, 2, 15, 4, 5, tzinfo=datetime.timezone.utc
+                ),
+            )
+        ]
+    )
+
+
+def test_journal_key():
+    assert journal_key("a", "b") == journal_key("a", "b")
+    assert journal_key("a", "b") != journal_key("ab")
+    assert journal_key("a", "b") != journal_key("b", "a")
+
+
+@pytest.mark.allow_mkdir
+def test_journal_roundtrip(testtemp: pathlib.Path):
+    path = testtemp / "out" / "result.json.journal.jsonl"
+    journal = ResultJournal(path, resume=False)
+    assert journal.start("key") == {}
+    journal.append(pathlib.Path("test/foo.py"), _file_result(SUCCESS), elapsed=2.5)
+    journal.append(pathlib.Path("test/bar.py"), _file_result(FAILURE), elapsed=1.5)
+
+    resumed = ResultJournal(path, resume=True)
+    assert resumed.start("key") == {
+        pathlib.Path("test/foo.py"): _file_result(SUCCESS),
+        pathlib.Path("test/bar.py"): _file_result(FAILURE),
+    }
+    assert resumed.resumed_seconds == 4.0
+
+    resumed.remove()
+    assert not path.exists()
+
+
+@pytest.mark.allow_mkdir
+def test_journal_broken_line(testtemp: pathlib.Path):
+    path = testtemp / "journal.jsonl"
+    journal = ResultJournal(path, resume=False)
+    journal.start("key")
+    journal.append(pathlib.Path("test/foo.py"), _file_result(SUCCESS), elapsed=2.5)
+    with path.open("a", encoding="utf-8") as fp:
+        fp.write('{"path":"test/bar.py","elapsed":1.0,"res')
+
+    resumed = ResultJournal(path, resume=True)
+    assert resumed.start("key") == {
+        pathlib.Path("test/foo.py"): _file_result(SUCCESS),
+    }
+    assert resumed.resumed_seconds == 2.5
+
+
+@pytest.mark.allow_mkdir
+@pytest.mark.parametrize("resume", [True, False])
+def test_journal_not_resumed(resume: bool, testtemp: pathlib.Path):
+    path = testtemp / "journal.jsonl"
+    journal = ResultJournal(path, resume=False)
+    journal.start("key")
+    journal.append(pathlib.Path("test/foo.py"), _file_result(SUCCESS), elapsed=2.5)
+
+    other = ResultJournal(path, resume=resume)
+    assert other.start("other key" if resume else "key") == {}
+    assert other.resumed_seconds == 0
+    assert len(path.read_text("utf-8").splitlines()) == 1
+
+
+@pytest.mark.allow_mkdir
+@pytest.mark.usefixtures("mock_perf_counter")
+def test_verify_resume(testtemp: pathlib.Path):
+    path = testtemp / "journal.jsonl"
+
+    expected = MockVerifier(VERIFICATIONS).verify(download=False)
+
+    interrupted = MockVerifier(VERIFICATIONS)
+    interrupted.verify(download=False, journal=ResultJournal(path, resume=False))
+    lines = path.read_text("utf-8").splitlines()
+    # The process was killed while verifying "test/baz.py"
+    path.write_text("\n".join(lines[:3]) + "\n", encoding="utf-8")
+
+    resumed = MockVerifier(VERIFICATIONS)
+    journal = ResultJournal(path, resume=True)
+    result = resumed.verify(download=False, journal=journal)
+
+    assert resumed.verified == [pathlib.Path("test/baz.py")]
+    assert journal.resumed_seconds == 10.0
+    assert (
+        result.model_dump_json()
+        == VerifyCommandResult(
+            total_seconds=result.total_seconds,
+            files=expected.files,
+        ).model_dump_json()
+    )
@@ -12,6 +12,7 @@ from competitive_verifier.log import GitHubMessageParams
 from competitive_verifier.models import (
     FileResult,
     ResultStatus,
+    VerificationInput,
     VerificationResult,
     VerifyCommandResult,
 )
@@ -86,6 +87,94 @@ def test_get_split_state_error(args: list[str], message: str):
         _ = parsed.split_state
 
 
+test_result_journal_params: list[tuple[list[str], pathlib.Path | None, bool]] = [
+    ([], None, False),
+    (
+        ["--output", "out/result.json"],
+        pathlib.Path("out/result.json.journal.jsonl"),
+        False,
+    ),
+    (
+        ["--output", "out/result.json", "--resume"],
+        pathlib.Path("out/result.json.journal.jsonl"),
+        True,
+    ),
+    (["--journal", "journal.jsonl", "--resume"], pathlib.Path("journal.jsonl"), True),
+    (
+        ["--output", "out/result.json", "--journal", "journal.jsonl"],
+        pathlib.Path("journal.jsonl"),
+        False,
+    ),
+]
+
+
+@pytest.mark.parametrize(
+    ("args", "expected_path", "expected_resume"),
+    test_result_journal_params,
+)
+def test_result_journal(
+    args: list[str],
+    expected_path: pathlib.Path | None,
+    expected_resume: bool,
+):
+    parsed = app.ArgumentParser().parse(
+        ["verify", "--verify-json", "verify.json", *args]
+    )
+    assert isinstance(parsed, app.Verify)
+
+    journal = parsed.result_journal
+    if expected_path is None:
+        assert journal is None
+    else:
+        assert journal is not None
+        assert journal.path == expected_path
+        assert journal.resume == expected_resume
+
+
+def test_result_journal_error():
+    parsed = app.ArgumentParser().parse(
+        ["verify", "--verify-json", "verify.json", "--resume"]
+    )
+    assert isinstance(parsed, app.Verify)
+
+    with pytest.raises(
+        ValueError,
+        match=r"^--resume argument requires --journal or --output\.$",
+    ):
+        _ = parsed.result_journal
+
+
+def test_work_queue():
+    parsed = app.ArgumentParser().parse(
+        ["verify", "--verify-json", "verify.json", "--queue", "queue", "--worker"]
+    )
+    assert isinstance(parsed, app.Verify)
+
+    queue = parsed.work_queue
+    assert queue is not None
+    assert queue.root == pathlib.Path("queue")
+
+
+@pytest.mark.parametrize(
+    ("args", "message"),
+    [
+        (["--worker"], r"^--worker argument requires --queue argument\.$"),
+        (
+            ["--queue", "queue", "--split", "2", "--split-index", "0"],
+            r"^--queue argument cannot be used with --split\.$",
+        ),
+    ],
+)
+def test_work_queue_error(args: list[str], message: str):
+    parsed = app.ArgumentParser().parse(
+        ["verify", "--verify-json", "verify.json", *args]
+    )
+    assert isinstance(parsed, app.Verify)
+
+    with pytest.raises(ValueError, match=message):
+        _ = parsed.work_queue
+
+
 def test_invalid_prev_result(
     testtemp: pathlib.Path,
     caplog: pytest.LogCaptureFixture,
@@ -250,3 +339,42 @@ def test_write_result_output(
 |⚠&nbsp;&nbsp;lib.c|-|-|1|1|0ms|-|-|
 """
     )
+
+
+@pytest.mark.parametrize(
+    ("work_result", "check_error", "expected"),
+    [
+        (True, False, True),
+        (False, False, True),
+        (True, True, True),
+        (False, True, False),
+    ],
+)
+def test_run_worker(
+    work_result: bool,
+    check_error: bool,
+    expected: bool,
+    mocker: MockerFixture,
+):
+    mocker.patch(
+        "competitive_verifier.verify.main.VerificationInput.parse_file_relative",
+        return_value=VerificationInput(),
+    )
+    work = mocker.patch(
+        "competitive_verifier.verify.main.Verifier.work", return_value=work_result
+    )
+    parsed = app.ArgumentParser().parse(
+        [
+            "verify",
+            "--verify-json",
+            "verify.json",
+            "--queue",
+            "queue",
+            "--worker",
+            *(["--check-error"] if check_error else []),
+        ]
+    )
+    assert isinstance(parsed, app.Verify)
+
+    assert parsed._run() == expected  # noqa: SLF001  # pyright: ignore[reportPrivateUsage]
+    work.assert_called_once()
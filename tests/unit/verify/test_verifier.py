@@ -1,7 +1,7 @@
 import datetime
 import pathlib
 from pathlib import Path
-from typing import Any, NamedTuple, cast
+from typing import Any, NamedTuple
 
 import pytest
 from pytest_mock import MockerFixture
@@ -32,7 +32,15 @@ def test_now():
 
 def test_get_file_timestamp_git_timestamp(mocker: MockerFixture):
     verifier = Verifier(
-        VerificationInput(),
+        VerificationInput.model_validate(
+            {
+                "files": {
+                    "foo": {"dependencies": ["bar"]},
+                    "bar": {"dependencies": ["foo"]},
+                    "baz": {},
+                }
+            }
+        ),
         timeout=1,
         default_tle=None,
         default_mle=None,
@@ -40,10 +48,6 @@ def test_get_file_timestamp_git_timestamp(mocker: MockerFixture):
         split_state=None,
         use_git_timestamp=True,
     )
-    mocker.patch.dict(
-        verifier.verifications.transitive_depends_on,
-        {pathlib.Path("foo"): {pathlib.Path("foo"), pathlib.Path("bar")}},
-    )
 
     get_commit_time = mocker.patch(
         "competitive_verifier.git.get_commit_time",
@@ -51,7 +55,8 @@ def test_get_file_timestamp_git_timestamp(mocker: MockerFixture):
     )
 
     assert verifier.get_file_timestamp(pathlib.Path("foo")) == datetime.datetime.max
-    get_commit_time.assert_called_once_with({pathlib.Path("foo"), pathlib.Path("bar")})
+    assert verifier.get_file_timestamp(pathlib.Path("bar")) == datetime.datetime.max
+    get_commit_time.assert_called_once_with([pathlib.Path("foo"), pathlib.Path("bar")])
 
 
 def test_get_file_timestamp_local(mocker: MockerFixture):
@@ -68,7 +73,15 @@ def test_get_file_timestamp_local(mocker: MockerFixture):
             return self
 
     verifier = Verifier(
-        VerificationInput(),
+        VerificationInput.model_validate(
+            {
+                "files": {
+                    "foo": {"dependencies": ["bar"]},
+                    "bar": {},
+                    "baz": {"dependencies": ["bar"]},
+                }
+            }
+        ),
         timeout=1,
         default_tle=None,
         default_mle=None,
@@ -85,6 +98,10 @@ def test_get_file_timestamp_local(mocker: MockerFixture):
         "bar",
         datetime.datetime.fromisoformat("2001-02-03T04:05:06.789789+00:00"),
     )
+    baz_path = MockPath(
+        "baz",
+        datetime.datetime.fromisoformat("2001-02-03T04:05:04.789789+00:00"),
+    )
 
     mocker.patch(
         "competitive_verifier.verify.verifier._now",
@@ -92,16 +109,21 @@ def test_get_file_timestamp_local(mocker: MockerFixture):
             "2010-08-31T15:26:56.456797+06:30"
         ),
     )
-    mocker.patch.dict(
-        verifier.verifications.transitive_depends_on,
-        {foo_path: {foo_path, bar_path}},
+    path_of_index = mocker.patch.object(
+        VerificationInput,
+        "path_of_index",
+        side_effect=[foo_path, bar_path, baz_path].__getitem__,
     )
 
     get_commit_time = mocker.patch("competitive_verifier.git.get_commit_time")
 
     assert verifier.get_file_timestamp(
-        cast("pathlib.Path", foo_path)
+        pathlib.Path("foo")
+    ) == datetime.datetime.fromisoformat("2001-02-03T10:35:06+06:30")
+    assert verifier.get_file_timestamp(
+        pathlib.Path("baz")
     ) == datetime.datetime.fromisoformat("2001-02-03T10:35:06+06:30")
+    assert sorted(c.args[0] for c in path_of_index.call_args_list) == [0, 1, 2]
     get_commit_time.assert_not_called()
 
 
@@ -2,6 +2,7 @@ import datetime
 import logging
 import os
 import pathlib
+import threading
 from typing import Any
 
 import pytest
@@ -9,15 +10,21 @@ from pytest_mock import MockerFixture
 
 from competitive_verifier.log import GitHubMessageParams
 from competitive_verifier.models import (
+    CommandVerification,
     ConstVerification,
     FileResult,
     ProblemVerification,
     ResultStatus,
+    ShellCommand,
     VerificationInput,
     VerificationResult,
     VerifyCommandResult,
 )
-from competitive_verifier.verify.verifier import BaseVerifier, SplitState
+from competitive_verifier.verify.verifier import (
+    BaseVerifier,
+    SplitState,
+    _working_keys,  # pyright: ignore[reportPrivateUsage]
+)
 from tests import LogComparer
 
 SUCCESS = ResultStatus.SUCCESS
@@ -967,3 +974,254 @@ def test_failure_result():
             }
         },
     }
+
+
+def test_verify_lookahead():
+    compiled = {name: threading.Event() for name in ("foo", "bar", "baz")}
+    events = list[str]()
+
+    class PipelineVerification(ConstVerification):
+        next_name: str | None = None
+
+        @property
+        def is_lightweight(self) -> bool:
+            return False
+
+        def run_compile_command(self, *args: Any, **kwargs: Any) -> bool:  # pyright: ignore[reportIncompatibleMethodOverride]
+            assert self.name
+            compiled[self.name].set()
+            return self.name != "bar"
+
+        def run(self, *args: Any, **kwargs: Any) -> ResultStatus:  # pyright: ignore[reportIncompatibleMethodOverride]
+            # The next file is compiled while the current file is tested.
+            if self.next_name:
+                assert compiled[self.next_name].wait(timeout=10)
+            events.append(f"run {self.name}")
+            return self.status
+
+    verifier = MockVerifier(
+        {
+            "files": {
+                "test/foo.py": {
+                    "verification": [
+                        PipelineVerification(
+                            name="foo", status=SUCCESS, next_name="bar"
+                        )
+                    ],
+                },
+                "test/bar.py": {
+                    "verification": [
+                        PipelineVerification(
+                            name="bar", status=SUCCESS, next_name="baz"
+                        )
+                    ],
+                },
+                "test/baz.py": {
+                    "verification": [PipelineVerification(name="baz", status=FAILURE)],
+                },
+            }
+        },
+        verification_time=datetime.datetime(2007, 1, 2, 15, 4, 5),
+    )
+    result = verifier.verify(download=False, lookahead=1)
+
+    assert events == ["run foo", "run baz"]
+    assert {
+        p: [v.status for v in r.verifications] for p, r in result.files.items()
+    } == {
+        pathlib.Path("test/foo.py"): [SUCCESS],
+        pathlib.Path("test/bar.py"): [FAILURE],
+        pathlib.Path("test/baz.py"): [FAILURE],
+    }
+    assert list(result.files) == [
+        pathlib.Path("test/foo.py"),
+        pathlib.Path("test/bar.py"),
+        pathlib.Path("test/baz.py"),
+    ]
+
+
+def test_working_keys():
+    problem = "https://judge.yosupo.jp/problem/aplusb"
+    files = VerificationInput.model_validate(
+        {
+            "files": {
+                "test/foo.py": {
+                    "verification": [
+                        ProblemVerification(command="true", problem=problem),
+                        CommandVerification(
+                            command="true", tempdir=pathlib.Path("tmp/foo")
+                        ),
+                        ConstVerification(status=SUCCESS),
+                    ],
+                },
+            }
+        }
+    ).files
+    assert _working_keys(files[pathlib.Path("test/foo.py")]) == {problem, "tmp/foo"}
+
+
+def test_working_keys_shared_output():
+    files = VerificationInput.model_validate(
+        {
+            "files": {
+                "test/Foo.java": {
+                    "verification": [
+                        CommandVerification(
+                            command="java -classpath /cache/java/classes Foo",
+                            compile=["javac", "-d", "/cache/java/classes", "Foo.java"],
+                        ),
+                    ],
+                },
+                "test/Bar.java": {
+                    "verification": [
+                        CommandVerification(
+                            command="/cache/java/bar/run",
+                            compile="rm -rf /cache/java/bar/classes"
+                            " && javac -sourcepath . -d /cache/java/bar/classes Bar.java"
+                            " && jar cf /cache/java/bar/app.jar -C /cache/java/bar/classes .",
+                        ),
+                    ],
+                },
+                "test/foo.py": {
+                    "verification": [
+                        CommandVerification(
+                            command=ShellCommand(
+                                command=["python", "test/foo.py"],
+                                env={"PYTHONPYCACHEPREFIX": "/cache/pycache"},
+                            ),
+                        ),
+                    ],
+                },
+            }
+        }
+    ).files
+    assert _working_keys(files[pathlib.Path("test/Foo.java")]) == {
+        "/cache/java/classes"
+    }
+    assert _working_keys(files[pathlib.Path("test/Bar.java")]) == {
+        "/cache/java/bar/classes"
+    }
+    assert _working_keys(files[pathlib.Path("test/foo.py")]) == {"/cache/pycache"}
+
+
+def test_verify_lookahead_shared_tempdir():
+    problem = "https://judge.yosupo.jp/problem/aplusb"
+    events = list[str]()
+
+    class CompilerVerification(ProblemVerification):
+        def run_compile_command(self, *args: Any, **kwargs: Any) -> bool:  # pyright: ignore[reportIncompatibleMethodOverride]
+            events.append(f"compile {self.name}")
+            return True
+
+        def run(self, *args: Any, **kwargs: Any) -> ResultStatus:  # pyright: ignore[reportIncompatibleMethodOverride]
+            events.append(f"run {self.name}")
+            return SUCCESS
+
+    verifier = MockVerifier(
+        {
+            "files": {
+                "test/foo.cpp": {
+                    "verification": [
+                        CompilerVerification(name=name, command="true", problem=problem)
+                        for name in ("g++", "clang++")
+                    ],
+                },
+            }
+        },
+        verification_time=datetime.datetime(2007, 1, 2, 15, 4, 5),
+    )
+    verifier.verify(download=False, lookahead=1)
+
+    # clang++ overwrites a.out of g++ in the same problem directory.
+    assert events == ["compile g++", "run g++", "compile clang++", "run clang++"]
+
+
+def test_verify_prefetch(mocker: MockerFixture):
+    def _download(url: str, *, group_log: bool = False) -> bool:
+        return not url.endswith("/bar")
+
+    mock_download = mocker.patch(
+        "competitive_verifier.oj.download", side_effect=_download
+    )
+    mocker.patch(
+        "competitive_verifier.models.ProblemVerification.run_compile_command",
+        return_value=True,
+    )
+    mocker.patch(
+        "competitive_verifier.models.ProblemVerification.run",
+        return_value=SUCCESS,
+    )
+
+    verifier = MockVerifier(
+        {
+            "files": {
+                f"test/{name}.py": {
+                    "verification": [
+                        ProblemVerification(
+                            command="true",
+                            problem=f"https://judge.yosupo.jp/problem/{name}",
+                        )
+                    ],
+                }
+                for name in ("foo", "bar", "baz")
+            }
+        },
+        verification_time=datetime.datetime(2007, 1, 2, 15, 4, 5),
+    )
+    result = verifier.verify(prefetch=2)
+
+    assert {
+        p: [v.status for v in r.verifications] for p, r in result.files.items()
+    } == {
+        pathlib.Path("test/foo.py"): [SUCCESS],
+        pathlib.Path("test/bar.py"): [FAILURE],
+        pathlib.Path("test/baz.py"): [SUCCESS],
+    }
+    assert mock_download.call_count == 3
+
+
+def test_verify_prefetch_bound(mocker: MockerFixture):
+    events = list[str]()
+    mocker.patch("competitive_verifier.oj.download", return_value=True)
+    mocker.patch(
+        "competitive_verifier.download.DownloadPrefetcher.prefetch",
+        side_effect=lambda f: events.append(f"prefetch {f.verification[0].problem}"),  # pyright: ignore[reportUnknownLambdaType, reportUnknownMemberType]
+    )
+    mocker.patch(
+        "competitive_verifier.download.DownloadPrefetcher.download",
+        return_value=True,
+    )
+    mocker.patch(
+        "competitive_verifier.models.ProblemVerification.run_compile_command",
+        return_value=True,
+    )
+    mocker.patch(
+        "competitive_verifier.models.ProblemVerification.run",
+        side_effect=lambda *args, **kwargs: events.append("run") or SUCCESS,  # pyright: ignore[reportUnknownLambdaType]
+    )
+
+    verifier = MockVerifier(
+        {
+            "files": {
+                f"test/{i}.py": {
+                    "verification": [
+                        ProblemVerification(command="true", problem=str(i))
+                    ],
+                }
+                for i in range(4)
+            }
+        },
+        verification_time=datetime.datetime(2007, 1, 2, 15, 4, 5),
+    )
+    verifier.verify(prefetch=1)
+
+    assert events == [
+        "prefetch 0",
+        "prefetch 1",
+        "run",
+        "prefetch 2",
+        "run",
+        "prefetch 3",
+        "run",
+        "run",
+    ]
@@ -0,0 +1,246 @@
+import datetime
+import math
+import multiprocessing
+import os
+import pathlib
+import time
+from typing import Any
+
+import pytest
+
+from competitive_verifier.models import (
+    ConstVerification,
+    FileResult,
+    ResultStatus,
+    VerificationInput,
+    VerificationResult,
+)
+from competitive_verifier.verify.verifier import BaseVerifier
+from competitive_verifier.verify.work_queue import DirectoryWorkQueue
+
+SUCCESS = ResultStatus.SUCCESS
+FAILURE = ResultStatus.FAILURE
+
+
+class SlowConstVerification(ConstVerification):
+    @property
+    def is_lightweight(self) -> bool:
+        return False
+
+    def run(self, *args: Any, **kwargs: Any) -> ResultStatus:  # pyright: ignore[reportIncompatibleMethodOverride]
+        time.sleep(0.1)
+        return self.status
+
+
+def _verifications() -> dict[str, Any]:
+    files: dict[str, Any] = {"lib/hoge.py": {}}
+    for i in range(12):
+        files[f"test/foo{i:02}.py"] = {
+            "dependencies": ["lib/hoge.py"],
+            "verification": [
+                SlowConstVerification(status=FAILURE if i % 5 == 0 else SUCCESS)
+            ],
+        }
+    return {"files": files}
+
+
+class MockVerifier(BaseVerifier):
+    def __init__(self, timeout: float = math.inf) -> None:
+        super().__init__(
+            verifications=VerificationInput.model_validate(_verifications()),
+            verification_time=datetime.datetime(2007, 1, 2, 15, 4, 5),
+            prev_result=None,
+            split_state=None,
+            default_tle=10,
+            default_mle=256,
+            timeout=timeout,
+        )
+
+    def get_file_timestamp(self, path: pathlib.Path) -> datetime.datetime:
+        return datetime.datetime(2005, 1, 2, 15, 4, 5)
+
+
+def _run_worker(root: str, ready: Any) -> None:
+    verifier = MockVerifier(timeout=30)
+    ready.set()
+    verifier.work(
+        DirectoryWorkQueue(pathlib.Path(root), poll_interval=0.01),
+        download=False,
+    )
+
+
+def _file_result(status: ResultStatus) -> FileResult:
+    return FileResult(
+        verifications=[
+            VerificationResult(
+                status=status,
+                elapsed=1.0,
+                last_execution_time=datetime.datetime(
+                    2007, 1, 2, 15, 4, 5, tzinfo=datetime.timezone.utc
+                ),
+            )
+        ]
+    )
+
+
+@pytest.mark.allow_mkdir
+def test_work_queue(testtemp: pathlib.Path):
+    items = [pathlib.Path("test/a.py"), pathlib.Path("test/b.py")]
+    coordinator = DirectoryWorkQueue(testtemp / "queue", poll_interval=0.01)
+    coordinator.publish("key", items)
+
+    worker = DirectoryWorkQueue(testtemp / "queue", poll_interval=0.01)
+    assert worker.wait_published("key")
+    assert worker.claim() == (0, items[0])
+    assert coordinator.claim() == (1, items[1])
+    assert worker.claim() is None
+    assert coordinator.claim() is None
+
+    coordinator.complete(1, items[1], _file_result(FAILURE), elapsed=2.0)
+    worker.complete(0, items[0], _file_result(SUCCESS), elapsed=3.0)
+
+    results = {e.path: (e.result, e.elapsed) for e in coordinator.iter_results()}
+    assert results == {
+        items[0]: (_file_result(SUCCESS), 3.0),
+        items[1]: (_file_result(FAILURE), 2.0),
+    }
+
+    coordinator.finish()
+    late_worker = DirectoryWorkQueue(testtemp / "queue", poll_interval=0.01)
+    assert not late_worker.wait_published("key", deadline=time.perf_counter() + 0.05)
+
+
+@pytest.mark.allow_mkdir
+def test_work_queue_publish_keeps_others(testtemp: pathlib.Path):
+    root = testtemp / "queue"
+    (root / "unrelated").mkdir(parents=True)
+    (root / "unrelated/data.txt").write_text("data", encoding="utf-8")
+
+    queue = DirectoryWorkQueue(root)
+    queue.publish("key", [])
+    run_dirs = {p for p in root.iterdir() if p.is_dir()} - {root / "unrelated"}
+    queue.publish("key", [])
+
+    assert (root / "unrelated/data.txt").read_text(encoding="utf-8") == "data"
+    assert not any(p.exists() for p in run_dirs)
+    assert len([p for p in root.iterdir() if p.is_dir()]) == 2
+
+
+@pytest.mark.allow_mkdir
+def test_work_queue_reclaim(testtemp: pathlib.Path):
+    items = [pathlib.Path("test/a.py"), pathlib.Path("test/b.py")]
+    coordinator = DirectoryWorkQueue(testtemp / "queue", poll_interval=0.01, lease=60)
+    coordinator.publish("key", items)
+
+    dead_worker = DirectoryWorkQueue(testtemp / "queue", lease=60)
+    assert dead_worker.wait_published("key")
+    assert dead_worker.claim() == (0, items[0])
+    assert coordinator.claim() == (1, items[1])
+    assert coordinator.claim() is None
+    coordinator.complete(1, items[1], _file_result(SUCCESS), elapsed=1.0)
+
+    # The claim is alive
+    results = list(coordinator.iter_results(deadline=time.perf_counter() + 0.05))
+    assert [e.path for e in results] == [items[1]]
+    assert not coordinator.collected_all
+
+    # The worker died without completing the item
+    claim_file = next((testtemp / "queue").glob("*/claims/0"))
+    expired = time.time() - 120
+    os.utime(claim_file, (expired, expired))
+    assert list(coordinator.iter_results()) == []
+    assert coordinator.claim() == (0, items[0])
+    assert coordinator.claim() is None
+    coordinator.complete(0, items[0], _file_result(FAILURE), elapsed=1.0)
+
+    results = list(coordinator.iter_results())
+    assert [e.path for e in results] == [items[0]]
+    assert coordinator.collected_all
+
+
+@pytest.mark.allow_mkdir
+def test_work_queue_other_key(testtemp: pathlib.Path):
+    DirectoryWorkQueue(testtemp / "queue").publish("key", [])
+
+    with pytest.raises(
+        RuntimeError,
+        match=r"^The work queue was published for the other verify_files\.json\.$",
+    ):
+        DirectoryWorkQueue(testtemp / "queue").wait_published("other")
+
+
+@pytest.mark.allow_mkdir
+def test_work_queue_deadline(testtemp: pathlib.Path):
+    queue = DirectoryWorkQueue(testtemp / "queue", poll_interval=0.01)
+    queue.publish("key", [pathlib.Path("test/a.py"), pathlib.Path("test/b.py")])
+    queue.complete(1, pathlib.Path("test/b.py"), _file_result(SUCCESS), elapsed=1.0)
+
+    results = list(queue.iter_results(deadline=time.perf_counter() + 0.05))
+    assert [e.path for e in results] == [pathlib.Path("test/b.py")]
+
+
+@pytest.mark.allow_mkdir
+def test_verify_with_workers(testtemp: pathlib.Path):
+    expected = MockVerifier().verify(download=False)
+
+    ctx = multiprocessing.get_context("spawn")
+    ready = [ctx.Event() for _ in range(3)]
+    workers = [
+        ctx.Process(target=_run_worker, args=(str(testtemp / "queue"), r))
+        for r in ready
+    ]
+    for w in workers:
+        w.start()
+    for r in ready:
+        assert r.wait(timeout=30)
+    try:
+        result = MockVerifier().verify(
+            download=False,
+            queue=DirectoryWorkQueue(testtemp / "queue", poll_interval=0.01),
+        )
+    finally:
+        for w in workers:
+            w.join(timeout=30)
+
+    assert [w.exitcode for w in workers] == [0, 0, 0]
+    assert list(result.files) == list(expected.files)
+    assert {
+        p: [v.status for v in r.verifications] for p, r in result.files.items()
+    } == {p: [v.status for v in r.verifications] for p, r in expected.files.items()}
+
+    run_dirs = [p for p in (testtemp / "queue").iterdir() if p.is_dir()]
+    assert len(run_dirs) == 1
+    assert (run_dirs[0] / "finished").exists()
+    assert len(list((run_dirs[0] / "claims").iterdir())) == 12
+
+
+@pytest.mark.allow_mkdir
+def test_work_queue_complete_removed(testtemp: pathlib.Path):
+    items = [pathlib.Path("test/a.py")]
+    worker = DirectoryWorkQueue(testtemp / "queue", poll_interval=0.01)
+    worker.publish("key", items)
+    assert worker.claim() == (0, items[0])
+
+    # A new coordinator removes the run.
+    DirectoryWorkQueue(testtemp / "queue").publish("key", items)
+
+    assert not worker.complete(0, items[0], _file_result(SUCCESS), elapsed=1.0)
+    assert not worker._held  # noqa: SLF001  # pyright: ignore[reportPrivateUsage]
+
+
+@pytest.mark.allow_mkdir
+@pytest.mark.parametrize(
+    ("indexes", "expected"),
+    [
+        ([1, 2], True),
+        ([0, 1], False),
+    ],
+)
+def test_work_result(indexes: list[int], expected: bool, testtemp: pathlib.Path):
+    verifier = MockVerifier()
+    queue = DirectoryWorkQueue(testtemp / "queue", poll_interval=0.01)
+    queue.publish(
+        verifier._input_key(),  # noqa: SLF001  # pyright: ignore[reportPrivateUsage]
+        [pathlib.Path(f"test/foo{i:02}.py") for i in indexes],
+    )
+    assert verifier.work(queue, download=False) == expected